@@ -5,13 +5,13 @@ This module contains the ReportController class, which is responsible for
 generating reports based on the user's time entries.
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import Optional
 
 from rich.console import Console
 from rich.panel import Panel
 
-from src.models.time_tracker import TimeTracker
+from src.models.tracker_frame import TrackerFrame
 from src.services.report_service import ReportService
 from src.services.task_service import TaskService
 from src.utils.helpers import clear_console
@@ -67,47 +67,77 @@ class ReportController:
         )
         input()
 
+    def export_report(
+        self,
+        report_type: str,
+        path: str,
+        file_format: str,
+        duration: Optional[int] = None,
+    ) -> None:
+        """Export a report to a CSV or JSON Lines file.
+
+        Args:
+            report_type (str): One of overall, daily, weekly, monthly or
+            custom.
+            path (str): The path of the export file.
+            file_format (str): Either "csv" or "jsonl".
+            duration (Optional[int], optional): The number of days of a
+            custom report. Defaults to None.
+        """
+        clear_console()
+        try:
+            start_date, end_date = self.report_service.get_report_range(
+                report_type, duration
+            )
+            count = self.report_service.export_report(
+                self.user_id, path, file_format, start_date, end_date
+            )
+            self.console.print(
+                f"[green]Exported {count} time entries to {path}.[/green]"
+            )
+        except (OSError, ValueError) as err:
+            self.console.print(f"[red]{err}[/red]")
+
+        self.console.print(
+            "\n[bold magenta]Press Enter to return to the dashboard..."
+            "[/bold magenta]"
+        )
+        input()
+
     def _generate_overall_report(self) -> None:
         """Generate an overall report."""
-        time_trackers = self.report_service.get_time_trackers_by_user(
-            self.user_id
-        )
+        time_trackers = self.report_service.load_frame(self.user_id)
         self._display_insights(time_trackers)
 
     def _generate_daily_report(self) -> None:
         """Generate a daily report."""
         today = datetime.now().date()
-        time_trackers = self.report_service.get_time_trackers_by_user_and_date(
-            self.user_id, today
+        time_trackers = self.report_service.load_frame(
+            self.user_id, today, today
         )
-        self._display_insights(time_trackers)
+        self._display_insights(time_trackers, today, today)
 
     def _generate_weekly_report(self) -> None:
         """Generate a weekly report."""
-        start_date = datetime.now().date() - timedelta(days=7)
-        time_trackers = (
-            self.report_service.get_time_trackers_by_user_and_date_range(
-                self.user_id, start_date, datetime.now().date()
-            )
+        today = datetime.now().date()
+        start_date = today - timedelta(days=7)
+        time_trackers = self.report_service.load_frame(
+            self.user_id, start_date, today
         )
-        self._display_insights(time_trackers)
+        self._display_insights(time_trackers, start_date, today)
 
     def _generate_monthly_report(self) -> None:
         """Generate a monthly report."""
-        start_date = datetime.now().date() - timedelta(days=30)
-        time_trackers = (
-            self.report_service.get_time_trackers_by_user_and_date_range(
-                self.user_id, start_date, datetime.now().date()
-            )
+        today = datetime.now().date()
+        start_date = today - timedelta(days=30)
+        time_trackers = self.report_service.load_frame(
+            self.user_id, start_date, today
         )
-        self._display_insights(time_trackers)
+        self._display_insights(time_trackers, start_date, today)
 
     def _generate_category_report(self) -> None:
         """Generate a category-wise report."""
-        time_trackers = self.report_service.get_time_trackers_by_user(
-            self.user_id
-        )
-        categories = self.report_service.get_category_insights(time_trackers)
+        categories = self.report_service.get_category_totals(self.user_id)
         self.console.print(
             Panel.fit("[bold magenta]Category-wise Report[/bold magenta]")
         )
@@ -121,24 +151,40 @@ class ReportController:
         if duration <= 0 or not str(duration).isdigit():
             self.console.print("[red]Invalid duration specified.[/red]")
         else:
-            start_date = datetime.now().date() - timedelta(days=duration)
-            time_trackers = (
-                self.report_service.get_time_trackers_by_user_and_date_range(
-                    self.user_id, start_date, datetime.now().date()
-                )
+            today = datetime.now().date()
+            start_date = today - timedelta(days=duration)
+            time_trackers = self.report_service.load_frame(
+                self.user_id, start_date, today
             )
-            self._display_insights(time_trackers)
+            self._display_insights(time_trackers, start_date, today)
+
+    def _display_insights(
+        self,
+        time_trackers: TrackerFrame,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> None:
+        """Display insights based on time trackers.
 
-    def _display_insights(self, time_trackers: List[TimeTracker]) -> None:
-        """Display insights based on time trackers."""
+        Args:
+            time_trackers (TrackerFrame): The time trackers of the report.
+            start_date (Optional[date], optional): The first date of the
+            report range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the report
+            range. Defaults to None.
+        """
         if not time_trackers:
             self.console.print(
                 "[yellow]No data available for the selected report.[/yellow]"
             )
             return
 
-        total_time = self.report_service.get_total_time(time_trackers)
-        categories = self.report_service.get_category_insights(time_trackers)
+        total_time = self.report_service.get_total_time_by_user(
+            self.user_id, start_date, end_date
+        )
+        categories = self.report_service.get_category_totals(
+            self.user_id, start_date, end_date
+        )
         task_insights = self.report_service.get_task_insights(
             time_trackers, self.user_id
         )
@@ -190,7 +236,6 @@ class ReportController:
                 "seconds"
             )
             self.console.print(f"  - Status: {insight['status']}")
-            duration_insight = self.report_service.get_task_duration_insights(
-                insight["task_id"], self.user_id
+            self.console.print(
+                f"  - Duration Insight: {insight['duration_insight']}"
             )
-            self.console.print(f"  - Duration Insight: {duration_insight}")
@@ -6,7 +6,7 @@ task management operations like creating, updating, and deleting tasks.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
 
 import inquirer  # type: ignore
 from rich.console import Console
@@ -14,10 +14,19 @@ from rich.panel import Panel
 
 from src.controllers.report_controller import ReportController
 from src.controllers.time_tracker_controller import TimeTrackerController
+from src.models.task import OPEN_TASK_STATUSES, Task
 from src.services.category_service import CategoryService
+from src.services.import_service import (
+    ImportProgress,
+    TimesheetImportService,
+)
 from src.services.task_service import TaskService
+from src.services.time_tracker_service import TimeTrackerService
 from src.utils.helpers import clear_console
 
+TASK_MENU_PAGE_SIZE = 20
+DASHBOARD_TASK_LIMIT = 10
+
 
 class TaskController:
     """Controller for handling task management operations."""
@@ -27,6 +36,7 @@ class TaskController:
         user_id: int,
         task_service: TaskService,
         category_service: CategoryService,
+        time_tracker_service: Optional[TimeTrackerService] = None,
     ) -> None:
         """Initialize the TaskController with user ID, task service, and \
 category service.
@@ -35,27 +45,70 @@ category service.
             user_id (int): The ID of the user.
             task_service (TaskService): The task service instance.
             category_service (CategoryService): The category service instance.
+            time_tracker_service (Optional[TimeTrackerService], optional):
+            The time tracker service instance. Defaults to None.
         """
         self.user_id = user_id
         self.task_service = task_service
         self.category_service = category_service
+        self.time_tracker_service = (
+            time_tracker_service
+            if time_tracker_service is not None
+            else TimeTrackerService(task_service=task_service)
+        )
         self.console = Console()
 
+    def _dashboard_tasks(
+        self, statuses: Sequence[str], pending: Dict[int, str]
+    ) -> List[Task]:
+        """Return the newest tasks of the user with the given statuses.
+
+        The task statuses written since the last flush of the time tracker
+        service replace the ones of the task rows, so the dashboard is
+        current without committing the deferred writes.
+
+        Args:
+            statuses (Sequence[str]): The task statuses to include.
+            pending (Dict[int, str]): The pending task statuses, keyed by
+            task ID.
+
+        Returns:
+            List[Task]: The tasks, newest first.
+        """
+        tasks: Dict[int, Task] = {
+            task.id: task
+            for task in self.task_service.get_tasks_page(
+                self.user_id,
+                limit=DASHBOARD_TASK_LIMIT + len(pending),
+                statuses=statuses,
+            )
+            if task.id is not None
+        }
+        for task_id, status in pending.items():
+            if status in statuses and task_id not in tasks:
+                task = self.task_service.get_task_by_id(self.user_id, task_id)
+                if task:
+                    tasks[task_id] = task
+        shown = []
+        for task_id in sorted(tasks, reverse=True):
+            status = pending.get(task_id, tasks[task_id].task_status)
+            if status in statuses:
+                shown.append(
+                    tasks[task_id].model_copy(update={"task_status": status})
+                )
+        return shown[:DASHBOARD_TASK_LIMIT]
+
     def show_dashboard(self) -> Optional[str]:
         """Display the updated dashboard with current and recent tasks.
 
         Returns:
             Optional[str]: The action to take after displaying the dashboard.
         """
-        tasks = self.task_service.get_tasks(self.user_id)
-        current_tasks = [
-            task
-            for task in tasks
-            if task.task_status in ["In Progress", "Paused"]
-        ]
-        recent_tasks = [
-            task for task in tasks if task.task_status == "Completed"
-        ]
+        pending = self.time_tracker_service.pending_task_statuses()
+        current_tasks = self._dashboard_tasks(
+            ["In Progress", "Paused"], pending
+        )
+        recent_tasks = self._dashboard_tasks(["Completed"], pending)
 
         self.console.print(
             Panel.fit("[bold magenta]Current Tasks[/bold magenta]")
@@ -88,40 +141,85 @@ category service.
     def show_task_menu(self) -> Optional[str]:
         """Display the task management menu with dynamic options.
 
+        Open tasks are listed newest first, one page at a time, with next
+        and previous page entries to move between pages. Completed tasks
+        are listed instead once the user asks for them.
+
         Returns:
             Optional[str]: The action to take after displaying the task menu.
         """
-        tasks = self.task_service.get_tasks(self.user_id)
-        task_choices = [
-            ("Create New Task", "create"),
-            *[
-                (
-                    f"Status: {task.task_status} | "
-                    f"Task: {task.task_name} | "
-                    f"Category: {task.category_name} | "
-                    f"Estimated duration: {task.duration}s",
-                    task.id,
-                )
-                for task in tasks
-            ],
-            ("Generate Report", "report"),
-            ("Logout", "logout"),
-        ]
-        questions = [
-            inquirer.List(
-                "task",
-                message="Select a task or create a new one:",
-                choices=task_choices,
+        # The after_id of every page before the current one.
+        previous_pages: List[Optional[int]] = []
+        after_id: Optional[int] = None
+        show_completed = False
+        pending = self.time_tracker_service.pending_task_statuses()
+        while True:
+            tasks = self.task_service.get_tasks_page(
+                self.user_id,
+                after_id,
+                TASK_MENU_PAGE_SIZE + 1,
+                ["Completed"] if show_completed else OPEN_TASK_STATUSES,
             )
-        ]
-        answers = inquirer.prompt(questions)
-        if not answers:
-            return None
-        selected_task_id = answers["task"]
+            has_next_page = len(tasks) > TASK_MENU_PAGE_SIZE
+            tasks = tasks[:TASK_MENU_PAGE_SIZE]
+            task_choices = [
+                ("Create New Task", "create"),
+                *[
+                    (
+                        "Status: "
+                        f"{pending.get(task.id or 0, task.task_status)} | "
+                        f"Task: {task.task_name} | "
+                        f"Category: {task.category_name} | "
+                        f"Estimated duration: {task.duration}s",
+                        task.id,
+                    )
+                    for task in tasks
+                ],
+            ]
+            if has_next_page:
+                task_choices.append(("Next Page", "next"))
+            if previous_pages:
+                task_choices.append(("Previous Page", "previous"))
+            task_choices.append(
+                ("Show Open Tasks", "open")
+                if show_completed
+                else ("Show Completed Tasks", "completed")
+            )
+            task_choices.extend(
+                [
+                    ("Generate Report", "report"),
+                    ("Import Timesheets", "import"),
+                    ("Logout", "logout"),
+                ]
+            )
+            questions = [
+                inquirer.List(
+                    "task",
+                    message="Select a task or create a new one:",
+                    choices=task_choices,
+                )
+            ]
+            answers = inquirer.prompt(questions)
+            if not answers:
+                return None
+            selected_task_id = answers["task"]
+            if selected_task_id == "next":
+                previous_pages.append(after_id)
+                after_id = tasks[-1].id
+            elif selected_task_id == "previous":
+                after_id = previous_pages.pop()
+            elif selected_task_id in ("open", "completed"):
+                show_completed = selected_task_id == "completed"
+                previous_pages = []
+                after_id = None
+            else:
+                break
         if selected_task_id == "create":
             self.create_task()
         elif selected_task_id == "report":
             self.generate_report()
+        elif selected_task_id == "import":
+            self.import_timesheets()
         elif selected_task_id == "logout":
             return "logout"
         else:
@@ -162,10 +260,87 @@ category service.
                 return
             duration = int(duration_answer["duration"])
 
+        output = "console"
+        if report_type != "category":
+            output_question = [
+                inquirer.List(
+                    "output",
+                    message="Select where to send the report:",
+                    choices=[
+                        ("Console", "console"),
+                        ("CSV file", "csv"),
+                        ("JSON Lines file", "jsonl"),
+                    ],
+                )
+            ]
+            output_answer = inquirer.prompt(output_question)
+            if not output_answer:
+                return
+            output = output_answer["output"]
+
+        # Reports read the time trackers from the database.
+        self.time_tracker_service.flush()
         report_controller = ReportController(
             user_id=self.user_id, task_service=self.task_service
         )
-        report_controller.generate_report(report_type, duration)
+        if output == "console":
+            report_controller.generate_report(report_type, duration)
+            return
+
+        path_question = [
+            inquirer.Text(
+                "path",
+                message="Enter the path of the export file",
+                default=f"{report_type}_report.{output}",
+            )
+        ]
+        path_answer = inquirer.prompt(path_question)
+        if not path_answer:
+            return
+        report_controller.export_report(
+            report_type, path_answer["path"].strip(), output, duration
+        )
+
+    def import_timesheets(self) -> None:
+        """Import historical timesheets from a CSV or JSON Lines file."""
+        questions = [
+            inquirer.Text(
+                "path", message="Enter the path of the timesheet file"
+            ),
+        ]
+        answers = inquirer.prompt(questions)
+        if not answers:
+            return
+
+        import_service = TimesheetImportService(
+            task_db=self.task_service.task_db,
+            category_db=self.task_service.category_db,
+        )
+
+        def show_progress(progress: ImportProgress) -> None:
+            self.console.print(
+                f"[cyan]Read {progress.rows_read} rows | "
+                f"Imported {progress.rows_imported} | "
+                f"Skipped {progress.rows_skipped} | "
+                f"{progress.rows_per_second:.0f} rows/s[/cyan]"
+            )
+
+        try:
+            result = import_service.import_timesheets(
+                self.user_id, answers["path"].strip(), progress=show_progress
+            )
+            self.console.print(
+                f"[green]Imported {result.rows_imported} time entries, "
+                f"skipped {result.rows_skipped} invalid rows.[/green]"
+            )
+        except (OSError, ValueError) as err:
+            self.console.print(f"[red]{err}[/red]")
+
+        self.console.print(
+            "\n[bold magenta]Press Enter to return to the dashboard..."
+            "[/bold magenta]"
+        )
+        input()
 
     def create_task(self) -> None:
         """Handle the creation of a new task."""
@@ -261,12 +436,29 @@ category service.
             return None
 
         time_tracker = TimeTrackerController(
-            user_id=self.user_id, task_id=task_id
+            user_id=self.user_id,
+            task_id=task_id,
+            time_tracker_service=self.time_tracker_service,
         )
 
-        if task.task_status == "Not Started":
+        # The timer registry and the pending statuses are current even while
+        # status writes are deferred, so they decide the actions offered.
+        active_tracker = self.time_tracker_service.get_active_time_tracker(
+            task_id
+        )
+        task_status = self.time_tracker_service.pending_task_statuses().get(
+            task_id, task.task_status
+        )
+        if active_tracker is not None:
+            timer_status = active_tracker.status
+        elif task_status == "Completed":
+            timer_status = "Completed"
+        else:
+            timer_status = "Not Started"
+
+        if timer_status == "Not Started":
             options = ["Start Task", "Update Task", "Delete Task", "Back"]
-        elif task.task_status == "In Progress":
+        elif timer_status == "In Progress":
             options = [
                 "Pause Task",
                 "Stop Task",
@@ -274,7 +466,7 @@ category service.
                 "Delete Task",
                 "Back",
             ]
-        elif task.task_status == "Paused":
+        elif timer_status == "Paused":
             options = [
                 "Resume Task",
                 "Stop Task",
@@ -282,7 +474,7 @@ category service.
                 "Delete Task",
                 "Back",
             ]
-        elif task.task_status == "Completed":
+        elif timer_status == "Completed":
             options = ["Edit Timing", "Update Task", "Delete Task", "Back"]
         else:
             options = []
@@ -303,11 +495,9 @@ category service.
                 task.category_name
             )  # Assuming the task has a `category_name` attribute
             time_tracker.start_timer(category)
-            self.task_service.update_task_status(task_id, "In Progress")
             self.show_dashboard()
         elif action == "Pause Task":
             time_tracker.pause_timer()
-            self.task_service.update_task_status(task_id, "Paused")
             self.show_dashboard()
         elif action == "Resume Task":
             # Get the category for the task
@@ -315,11 +505,9 @@ category service.
                 task.category_name
             )  # Assuming the task has a `category_name` attribute
             time_tracker.resume_timer(category)
-            self.task_service.update_task_status(task_id, "In Progress")
             self.show_dashboard()
         elif action == "Stop Task":
             time_tracker.stop_timer()
-            self.task_service.update_task_status(task_id, "Completed")
             self.show_dashboard()
         elif action == "Update Task":
             self.update_task(task_id)
@@ -371,7 +559,9 @@ category service.
             return
 
         time_tracker = TimeTrackerController(
-            user_id=self.user_id, task_id=task_id
+            user_id=self.user_id,
+            task_id=task_id,
+            time_tracker_service=self.time_tracker_service,
         )
         time_tracker.update_time_tracker(
             start_time=start_time, stop_time=stop_time
@@ -430,7 +620,10 @@ category service.
         Args:
             task_id (int): The ID of the task to delete.
         """
+        # Deferred timer writes of the task must not outlive it.
+        self.time_tracker_service.flush()
         self.task_service.delete_task(self.user_id, task_id)
+        self.time_tracker_service.check_timer(task_id)
         clear_console()
         self.console.print("[green]Task deleted successfully.[/green]")
         self.console.print(
@@ -16,32 +16,45 @@ from src.services.time_tracker_service import TimeTrackerService
 class TimeTrackerController:
     """Controller for handling time tracking operations."""
 
-    def __init__(self, user_id: int, task_id: int) -> None:
+    def __init__(
+        self,
+        user_id: int,
+        task_id: int,
+        time_tracker_service: Optional[TimeTrackerService] = None,
+    ) -> None:
         """Initialize the time tracker controller.
 
         Args:
             user_id (int): The ID of the user.
             task_id (int): The ID of the task.
+            time_tracker_service (Optional[TimeTrackerService], optional):
+            The time tracker service instance. Defaults to None.
         """
         self.user_id = user_id
         self.task_id = task_id
         self.console = Console()
-        self.time_tracker_service = TimeTrackerService()
+        self.time_tracker_service = (
+            time_tracker_service
+            if time_tracker_service is not None
+            else TimeTrackerService()
+        )
 
     def start_timer(self, category: str) -> None:
-        """Start the timer for a task.
+        """Start the timer for a task and mark the task in progress.
 
         Args:
             category (str): The category of the task.
         """
-        self.time_tracker_service.start_timer(self.task_id, category)
+        self.time_tracker_service.start_task(
+            self.task_id, category, self.user_id
+        )
         self.console.print(
             f"[green]Timer started for task ID: {self.task_id}[/green]"
         )
 
     def pause_timer(self) -> None:
-        """Pause the timer for a task."""
-        time_tracker = self.time_tracker_service.pause_timer(self.task_id)
+        """Pause the timer for a task and mark the task paused."""
+        time_tracker = self.time_tracker_service.pause_task(self.task_id)
         if time_tracker:
             self.console.print(
                 f"[yellow]Timer paused for task ID: {self.task_id}[/yellow]"
@@ -50,13 +63,13 @@ class TimeTrackerController:
             self.console.print("[red]No active timer to pause.[/red]")
 
     def resume_timer(self, category: str) -> None:
-        """Resume the timer for a task.
+        """Resume the timer for a task and mark the task in progress.
 
         Args:
             category (str): The category of the task.
         """
-        time_tracker = self.time_tracker_service.resume_timer(
-            self.task_id, category
+        time_tracker = self.time_tracker_service.resume_task(
+            self.task_id, category, self.user_id
         )
         if time_tracker:
             self.console.print(
@@ -66,8 +79,8 @@ class TimeTrackerController:
             self.console.print("[red]No paused timer to resume.[/red]")
 
     def stop_timer(self) -> None:
-        """Stop the timer for a task and calculate the total time."""
-        time_tracker = self.time_tracker_service.stop_timer(self.task_id)
+        """Stop the timer for a task and mark the task completed."""
+        time_tracker = self.time_tracker_service.stop_task(self.task_id)
         if time_tracker:
             elapsed_time = time_tracker.total_time
             hours, remainder = divmod(elapsed_time, 3600)
@@ -77,6 +90,13 @@ class TimeTrackerController:
                 f"Total time: {int(hours)}h {int(minutes)}m {int(seconds)}s"
                 "[/green]"
             )
+            if time_tracker.clock_jumps:
+                self.console.print(
+                    f"[yellow]The system clock was adjusted "
+                    f"{time_tracker.clock_jumps} time(s) during this session"
+                    f" ({time_tracker.clock_skew:.0f}s). The total time "
+                    "ignores these adjustments.[/yellow]"
+                )
         else:
             self.console.print("[red]No active timer to stop.[/red]")
 
@@ -5,50 +5,30 @@ This module handles database operations for the Category model that includes
 methods for creating, retrieving, and updating categories.
 """
 
-import sqlite3
 from sqlite3 import Connection, Error
 from typing import List, Optional
 
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
 from src.models.category import Category
 
 
 class CategoryDatabase:
     """Database class for managing categories."""
 
-    def __init__(self, db_path: str = "src/database/categories.db") -> None:
-        """Initialize the database with the path to the database file.
+    def __init__(self, engine: Optional[StorageEngine] = None) -> None:
+        """Initialize the database with the storage engine to use.
 
         Args:
-            db_path (str, optional): The path to the database file.
-            Defaults to "src/database/categories.db".
+            engine (Optional[StorageEngine], optional): The storage engine
+            owning the database. Defaults to the shared storage engine.
         """
-        self.db_path = db_path
+        self.engine = engine if engine is not None else get_storage_engine()
         self.conn: Optional[Connection] = None
         self.connect()
-        self.create_categories_table()
 
     def connect(self) -> None:
-        """Establish a connection to the database."""
-        try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-        except Error as e:
-            raise Exception(f"Error connecting to database: {e}")
-
-    def create_categories_table(self) -> None:
-        """Create the categories table if it doesn't exist."""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS categories (
-            name TEXT NOT NULL PRIMARY KEY
-        );
-        """
-        try:
-            if self.conn:
-                cursor = self.conn.cursor()
-                cursor.execute(create_table_sql)
-                self.conn.commit()
-        except Error as e:
-            raise Exception(f"Error creating categories table: {e}")
+        """Acquire the shared connection from the storage engine."""
+        self.conn = self.engine.connection()
 
     def get_or_create_category(self, name: str) -> Category:
         """Retrieve a category by name, or creates it if it doesn't exist.
@@ -76,7 +56,7 @@ class CategoryDatabase:
                         name=row["name"]
                     )  # Return existing category
                 cursor.execute(insert_sql, (name,))
-                self.conn.commit()
+                self.engine.commit()
                 return Category(name=name)  # Return newly created category
         except Error as e:
             raise Exception(f"Error retrieving or creating category: {e}")
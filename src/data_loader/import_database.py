@@ -0,0 +1,116 @@
+"""
+import_database.py module.
+
+This module contains the ImportDatabase class, which records how far each
+timesheet import got, so that an interrupted import resumes where it
+stopped.
+The progress is written in the same transaction as the imported rows.
+"""
+
+from datetime import datetime, timezone
+from sqlite3 import Connection, Error
+from typing import Optional
+
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
+
+
+class ImportDatabase:
+    """Database class for managing the progress of timesheet imports."""
+
+    def __init__(self, engine: Optional[StorageEngine] = None) -> None:
+        """Initialize the database with the storage engine to use.
+
+        Args:
+            engine (Optional[StorageEngine], optional): The storage engine
+            owning the database. Defaults to the shared storage engine.
+        """
+        self.engine = engine if engine is not None else get_storage_engine()
+        self.conn: Optional[Connection] = None
+        self.connect()
+
+    def connect(self) -> None:
+        """Acquire the shared connection from the storage engine."""
+        self.conn = self.engine.connection()
+
+    def get_import_progress(self, user_id: int, source: str) -> int:
+        """Return the number of rows of a source already imported.
+
+        Args:
+            user_id (int): The user ID.
+            source (str): The absolute path of the timesheet file.
+
+        Raises:
+            Exception: When an error occurs while reading the progress.
+
+        Returns:
+            int: The number of rows imported, 0 for a new import.
+        """
+        select_sql = """
+        SELECT rows_done FROM import_progress
+        WHERE user_id = ? AND source = ?
+        """
+        try:
+            if self.conn:
+                row = self.conn.execute(
+                    select_sql, (user_id, source)
+                ).fetchone()
+                if row:
+                    return int(row["rows_done"])
+        except Error as e:
+            raise Exception(f"Error reading import progress: {e}")
+        return 0
+
+    def save_import_progress(
+        self, user_id: int, source: str, rows_done: int
+    ) -> None:
+        """Record the number of rows of a source imported so far.
+
+        Args:
+            user_id (int): The user ID.
+            source (str): The absolute path of the timesheet file.
+            rows_done (int): The number of rows imported so far.
+
+        Raises:
+            Exception: When an error occurs while saving the progress.
+        """
+        upsert_sql = """
+        INSERT INTO import_progress (user_id, source, rows_done, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, source) DO UPDATE SET
+        rows_done = excluded.rows_done, updated_at = excluded.updated_at
+        """
+        try:
+            if self.conn:
+                self.conn.execute(
+                    upsert_sql,
+                    (
+                        user_id,
+                        source,
+                        rows_done,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+                self.engine.commit()
+        except Error as e:
+            raise Exception(f"Error saving import progress: {e}")
+
+    def delete_import_progress(self, user_id: int, source: str) -> None:
+        """Forget the progress of a finished import.
+
+        Args:
+            user_id (int): The user ID.
+            source (str): The absolute path of the timesheet file.
+
+        Raises:
+            Exception: When an error occurs while deleting the progress.
+        """
+        delete_sql = """
+        DELETE FROM import_progress
+        WHERE user_id = ? AND source = ?
+        """
+        try:
+            if self.conn:
+                self.conn.execute(delete_sql, (user_id, source))
+                self.engine.commit()
+        except Error as e:
+            raise Exception(f"Error deleting import progress: {e}")
@@ -0,0 +1,563 @@
+"""
+migrations.py module.
+
+This module contains the versioned schema migrations of the application
+database and the function that applies them.
+Each migration is recorded in the schema_version table, so a database whose
+schema is current is recognised with a single query and no DDL is run.
+A migration step is either an SQL statement or a function receiving the
+connection, for data conversions that SQL cannot express.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+from sqlite3 import Connection, Error, OperationalError, Row
+from typing import Callable, List, NamedTuple, Tuple, Union
+from urllib.request import pathname2url
+
+from src.data_loader.rollups import daily_rollup_rows
+from src.utils.timestamps import to_epoch_us
+
+MigrationStep = Union[str, Callable[[Connection], None]]
+
+
+# The per-table database files used before the tables were consolidated
+# into one database, with the table and columns each one holds.
+LEGACY_DATABASES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("users.db", "users", ("id", "email", "hashed_password", "created_at")),
+    ("categories.db", "categories", ("name",)),
+    (
+        "tasks.db",
+        "tasks",
+        (
+            "id",
+            "user_id",
+            "category_name",
+            "task_name",
+            "duration",
+            "task_status",
+        ),
+    ),
+    (
+        "timings.db",
+        "time_trackers",
+        (
+            "id",
+            "task_id",
+            "category",
+            "start_time",
+            "stop_time",
+            "status",
+            "total_time",
+        ),
+    ),
+)
+
+
+class Migration(NamedTuple):
+    """Represent a single schema migration."""
+
+    version: int
+    description: str
+    statements: Tuple[MigrationStep, ...]
+
+
+def import_legacy_databases(conn: Connection) -> None:
+    """Copy the rows of the legacy per-table database files.
+
+    The legacy files are looked up next to the database file, and left in
+    place. Each one is opened read-only with its own connection, since a
+    database attached inside the migration transaction could not be
+    detached before it commits. Rows whose key already exists are skipped.
+
+    Args:
+        conn (Connection): The connection to the database.
+    """
+    main_path = next(
+        (
+            row[2]
+            for row in conn.execute("PRAGMA database_list")
+            if row[1] == "main"
+        ),
+        "",
+    )
+    if not main_path:
+        return
+    directory = os.path.dirname(main_path)
+    for file_name, table, columns in LEGACY_DATABASES:
+        path = os.path.join(directory, file_name)
+        if not os.path.isfile(path):
+            continue
+        legacy = sqlite3.connect(
+            f"file:{pathname2url(path)}?mode=ro", uri=True
+        )
+        try:
+            rows = legacy.execute(
+                f"SELECT {', '.join(columns)} FROM {table}"
+            ).fetchall()
+        except OperationalError:
+            # The file does not hold the table, so there is nothing to copy.
+            continue
+        finally:
+            legacy.close()
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            rows,
+        )
+
+
+def convert_timestamps_to_epoch(conn: Connection) -> None:
+    """Rebuild time_trackers with integer epoch microsecond timestamps.
+
+    Existing ISO text timestamps are naive local times and are converted
+    to epoch microseconds in UTC.
+
+    Args:
+        conn (Connection): The connection to the database.
+    """
+    conn.execute(
+        """
+        CREATE TABLE time_trackers_epoch (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            start_time INTEGER,
+            stop_time INTEGER,
+            status TEXT NOT NULL,
+            total_time REAL DEFAULT 0
+        )
+        """
+    )
+    rows = conn.execute("SELECT * FROM time_trackers")
+    conn.executemany(
+        "INSERT INTO time_trackers_epoch (id, task_id, category, start_time, "
+        "stop_time, status, total_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                row["id"],
+                row["task_id"],
+                row["category"],
+                to_epoch_us(datetime.fromisoformat(row["start_time"]))
+                if row["start_time"]
+                else None,
+                to_epoch_us(datetime.fromisoformat(row["stop_time"]))
+                if row["stop_time"]
+                else None,
+                row["status"],
+                row["total_time"],
+            )
+            for row in rows
+        ),
+    )
+    conn.execute("DROP TABLE time_trackers")
+    conn.execute("ALTER TABLE time_trackers_epoch RENAME TO time_trackers")
+
+
+def build_sessions(conn: Connection) -> None:
+    """Merge the rows written per pause and resume into timer sessions.
+
+    Before sessions, pausing and stopping inserted an updated copy of the
+    open row, and resuming inserted a new one. Only the latest copy of rows
+    sharing a start time is kept, and the rows of a task are then grouped
+    into one session per run, ending with its Completed row. Each remaining
+    row becomes a segment of its session.
+
+    Args:
+        conn (Connection): The connection to the database.
+    """
+    rows = conn.execute(
+        "SELECT id, task_id, start_time, stop_time, status, total_time "
+        "FROM time_trackers ORDER BY task_id, id"
+    ).fetchall()
+    latest = {(row["task_id"], row["start_time"]): row["id"] for row in rows}
+    sessions: List[List[Row]] = []
+    current: List[Row] = []
+    superseded: List[Tuple[int]] = []
+    for row in rows:
+        if latest[(row["task_id"], row["start_time"])] != row["id"]:
+            superseded.append((row["id"],))
+            continue
+        if current and current[0]["task_id"] != row["task_id"]:
+            sessions.append(current)
+            current = []
+        current.append(row)
+        if row["status"] == "Completed":
+            sessions.append(current)
+            current = []
+    if current:
+        sessions.append(current)
+    conn.executemany("DELETE FROM time_trackers WHERE id = ?", superseded)
+
+    for session in sessions:
+        first, last = session[0], session[-1]
+        starts = [row["start_time"] for row in session if row["start_time"]]
+        running = last["stop_time"] is None
+        conn.execute(
+            "UPDATE time_trackers SET start_time = ?, stop_time = ?, "
+            "status = ?, total_time = ?, segment_start = ? WHERE id = ?",
+            (
+                min(starts) if starts else None,
+                last["stop_time"],
+                last["status"],
+                sum(
+                    row["total_time"] or 0.0
+                    for row in session
+                    if row["stop_time"] is not None
+                ),
+                last["start_time"] if running else None,
+                first["id"],
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO time_tracker_segments (tracker_id, start_time, "
+            "stop_time) VALUES (?, ?, ?)",
+            (
+                (first["id"], row["start_time"], row["stop_time"])
+                for row in session
+                if row["start_time"] is not None
+            ),
+        )
+        conn.executemany(
+            "DELETE FROM time_trackers WHERE id = ?",
+            ((row["id"],) for row in session[1:]),
+        )
+
+
+def build_daily_rollups(conn: Connection) -> None:
+    """Fill the daily_rollups table from the closed segments.
+
+    Args:
+        conn (Connection): The connection to the database.
+    """
+    segments = conn.execute(
+        "SELECT t.user_id, t.category, t.task_id, s.start_time, s.stop_time "
+        "FROM time_tracker_segments AS s "
+        "JOIN time_trackers AS t ON t.id = s.tracker_id "
+        "WHERE s.stop_time IS NOT NULL"
+    )
+    conn.executemany(
+        "INSERT INTO daily_rollups (user_id, day, category, task_id, "
+        "seconds, segments) VALUES (?, ?, ?, ?, ?, ?)",
+        daily_rollup_rows(tuple(row) for row in segments),
+    )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Create users, categories, tasks and time_trackers",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email TEXT UNIQUE NOT NULL,
+                hashed_password TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS categories (
+                name TEXT NOT NULL PRIMARY KEY
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                category_name TEXT NOT NULL,
+                task_name TEXT NOT NULL,
+                duration REAL DEFAULT 0,
+                task_status TEXT NOT NULL,
+                FOREIGN KEY (category_name) REFERENCES categories(name)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS time_trackers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                start_time TEXT,
+                stop_time TEXT,
+                status TEXT NOT NULL,
+                total_time REAL DEFAULT 0
+            )
+            """,
+            import_legacy_databases,
+        ),
+    ),
+    Migration(
+        version=2,
+        description="Add covering indexes for task and time tracker lookups",
+        statements=(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_status
+            ON tasks (user_id, task_status)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_trackers_task_status
+            ON time_trackers (task_id, status, id DESC)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_trackers_start_time
+            ON time_trackers (start_time)
+            """,
+        ),
+    ),
+    Migration(
+        version=3,
+        description="Add tasks index for keyset pagination by user",
+        statements=(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_id
+            ON tasks (user_id, id)
+            """,
+        ),
+    ),
+    Migration(
+        version=4,
+        description="Store time tracker timestamps as epoch microseconds",
+        statements=(
+            convert_timestamps_to_epoch,
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_trackers_task_status
+            ON time_trackers (task_id, status, id DESC)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_trackers_start_time
+            ON time_trackers (start_time)
+            """,
+        ),
+    ),
+    Migration(
+        version=5,
+        description="Store the owning user_id on every time tracker",
+        statements=(
+            "ALTER TABLE time_trackers ADD COLUMN user_id INTEGER",
+            """
+            UPDATE time_trackers
+            SET user_id = (
+                SELECT tasks.user_id FROM tasks
+                WHERE tasks.id = time_trackers.task_id
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_trackers_user_start_time
+            ON time_trackers (user_id, start_time)
+            """,
+        ),
+    ),
+    Migration(
+        version=6,
+        description="Add tasks index for lookups by task name",
+        statements=(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_name
+            ON tasks (user_id, task_name)
+            """,
+        ),
+    ),
+    Migration(
+        version=7,
+        description="Add timer_events audit trail of journaled timer events",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS timer_events (
+                sequence INTEGER PRIMARY KEY,
+                task_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                status TEXT,
+                recorded_at INTEGER NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=8,
+        description="Add time_trackers index for open trackers by user",
+        statements=(
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_trackers_user_status
+            ON time_trackers (user_id, status)
+            """,
+        ),
+    ),
+    Migration(
+        version=9,
+        description="Track timer sessions with child segments",
+        statements=(
+            "ALTER TABLE time_trackers ADD COLUMN segment_start INTEGER",
+            """
+            CREATE TABLE IF NOT EXISTS time_tracker_segments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tracker_id INTEGER NOT NULL,
+                start_time INTEGER NOT NULL,
+                stop_time INTEGER,
+                FOREIGN KEY (tracker_id) REFERENCES time_trackers(id)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_time_tracker_segments_tracker
+            ON time_tracker_segments (tracker_id, stop_time)
+            """,
+            build_sessions,
+        ),
+    ),
+    Migration(
+        version=10,
+        description="Record monotonic clock anchors and clock jumps",
+        statements=(
+            "ALTER TABLE time_trackers ADD COLUMN segment_start_ns INTEGER",
+            "ALTER TABLE time_trackers ADD COLUMN clock_id TEXT",
+            "ALTER TABLE time_trackers ADD COLUMN clock_jumps INTEGER "
+            "NOT NULL DEFAULT 0",
+            "ALTER TABLE time_trackers ADD COLUMN clock_skew REAL "
+            "NOT NULL DEFAULT 0",
+        ),
+    ),
+    Migration(
+        version=11,
+        description="Add daily_rollups table of tracked time per day",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                user_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                category TEXT NOT NULL,
+                task_id INTEGER NOT NULL,
+                seconds REAL NOT NULL DEFAULT 0,
+                segments INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, day, category, task_id)
+            ) WITHOUT ROWID
+            """,
+            build_daily_rollups,
+        ),
+    ),
+    Migration(
+        version=12,
+        description="Add cumulative-by-day index of the daily rollups",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS cumulative_rollups (
+                user_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                category TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                PRIMARY KEY (user_id, day, category)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS cumulative_rollup_marks (
+                user_id INTEGER PRIMARY KEY,
+                closed_through TEXT NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=13,
+        description="Add import_progress table of resumable imports",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS import_progress (
+                user_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                rows_done INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (user_id, source)
+            ) WITHOUT ROWID
+            """,
+        ),
+    ),
+    Migration(
+        version=14,
+        description="Index daily_rollups by user and task",
+        statements=(
+            """
+            CREATE INDEX IF NOT EXISTS idx_daily_rollups_user_task
+            ON daily_rollups (user_id, task_id, seconds)
+            """,
+        ),
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Return the schema version recorded in the database.
+
+    Args:
+        conn (Connection): The connection to the database.
+
+    Returns:
+        int: The latest applied migration version, or 0 for a new database.
+    """
+    try:
+        row = conn.execute(
+            "SELECT MAX(version) FROM schema_version"
+        ).fetchone()
+    except OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(conn: Connection) -> int:
+    """Apply every pending migration to the database.
+
+    The migrations are applied in version order inside a single write
+    transaction, which also guards against two processes migrating the same
+    database at once.
+
+    Args:
+        conn (Connection): The connection to the database.
+
+    Raises:
+        Exception: When an error occurs while applying a migration. The
+        transaction is rolled back on any error, which is re-raised.
+
+    Returns:
+        int: The schema version of the database after migrating.
+    """
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return LATEST_VERSION
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+            """
+        )
+        current_version = get_schema_version(conn)
+        for migration in MIGRATIONS:
+            if migration.version <= current_version:
+                continue
+            for statement in migration.statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, "
+                "applied_at) VALUES (?, ?, ?)",
+                (
+                    migration.version,
+                    migration.description,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+        conn.commit()
+    except Error as e:
+        conn.rollback()
+        raise Exception(f"Error migrating database schema: {e}")
+    except BaseException:
+        # A data conversion step failed outside SQLite, or the migration was
+        # interrupted: leave the schema untouched rather than half migrated.
+        conn.rollback()
+        raise
+    return LATEST_VERSION
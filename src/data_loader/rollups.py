@@ -0,0 +1,75 @@
+"""
+rollups.py module.
+
+This module turns closed time tracker segments into daily_rollups rows.
+A daily rollup holds the seconds a user spent on a task on a local date,
+and the number of segments contributing to them. Segments crossing midnight
+are split across the dates they cover.
+It also reopens the cumulative index of a user once the rollups of a day it
+already closed change.
+"""
+
+from datetime import date, timedelta
+from sqlite3 import Connection
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.timestamps import split_by_day
+
+# The user ID, category, task ID, start and stop epoch microseconds of a
+# closed segment.
+SegmentSpan = Tuple[Optional[int], str, int, int, int]
+# The user ID, ISO date, category, task ID, seconds and segment count of a
+# daily rollup.
+DailyRollup = Tuple[int, str, str, int, float, int]
+
+
+def daily_rollup_rows(segments: Iterable[SegmentSpan]) -> List[DailyRollup]:
+    """Aggregate closed segments into daily rollup rows.
+
+    Segments without a user are left out, since reports are per user.
+
+    Args:
+        segments (Iterable[SegmentSpan]): The closed segments.
+
+    Returns:
+        List[DailyRollup]: The rollup rows, one per user, date, category
+        and task.
+    """
+    totals: Dict[Tuple[int, str, str, int], List[float]] = {}
+    for user_id, category, task_id, start_us, stop_us in segments:
+        if user_id is None:
+            continue
+        for day, microseconds in split_by_day(start_us, stop_us):
+            key = (user_id, day.isoformat(), category, task_id)
+            total = totals.setdefault(key, [0.0, 0])
+            total[0] += microseconds / 1_000_000
+            total[1] += 1
+    return [
+        (*key, seconds, int(segment_count))
+        for key, (seconds, segment_count) in totals.items()
+    ]
+
+
+def reopen_cumulative_rollups(
+    conn: Connection, user_id: int, day: str
+) -> None:
+    """Drop the cumulative index of a user from a changed day on.
+
+    The index is rebuilt from that day by the next close_rollup_days call.
+    Nothing is committed, so the caller's transaction covers the change.
+
+    Args:
+        conn (Connection): The connection writing the rollups.
+        user_id (int): The user ID.
+        day (str): The ISO date of the first changed day.
+    """
+    reopen_sql = """
+    UPDATE cumulative_rollup_marks SET closed_through = ?
+    WHERE user_id = ? AND closed_through >= ?
+    """
+    delete_sql = """
+    DELETE FROM cumulative_rollups WHERE user_id = ? AND day >= ?
+    """
+    previous_day = date.fromisoformat(day) - timedelta(days=1)
+    conn.execute(reopen_sql, (previous_day.isoformat(), user_id, day))
+    conn.execute(delete_sql, (user_id, day))
@@ -0,0 +1,151 @@
+"""
+row_mappers.py module.
+
+This module maps database rows to the application models.
+Rows are written by the application itself, so by default the models are
+built without running pydantic validation. Strict mode validates every row
+and is meant for debugging.
+"""
+
+from datetime import datetime
+from sqlite3 import Row
+from typing import Optional
+
+from src.models.task import Task
+from src.models.time_tracker import (
+    TimeTracker,
+    TimeTrackerRecord,
+    TimeTrackerSegment,
+)
+from src.models.user import User
+from src.utils.config import STRICT_ROW_MAPPING
+from src.utils.timestamps import from_epoch_us
+
+
+def parse_timestamp(value: Optional[int]) -> Optional[datetime]:
+    """Parse a stored epoch microsecond timestamp.
+
+    Args:
+        value (Optional[int]): The stored timestamp.
+
+    Returns:
+        Optional[datetime]: The naive local datetime, or None when not set.
+    """
+    return from_epoch_us(value) if value is not None else None
+
+
+def task_from_row(row: Row, strict: bool = STRICT_ROW_MAPPING) -> Task:
+    """Build a Task from a tasks row.
+
+    Args:
+        row (Row): The tasks row.
+        strict (bool, optional): Whether to validate the row. Defaults to
+        STRICT_ROW_MAPPING.
+
+    Returns:
+        Task: The task model.
+    """
+    fields = {
+        "id": row["id"],
+        "user_id": row["user_id"],
+        "category_name": row["category_name"],
+        "task_name": row["task_name"],
+        "duration": row["duration"],
+        "task_status": row["task_status"],
+    }
+    if strict:
+        return Task(**fields)
+    return Task.model_construct(**fields)
+
+
+def time_tracker_from_row(
+    row: Row, strict: bool = STRICT_ROW_MAPPING
+) -> TimeTracker:
+    """Build a TimeTracker from a time_trackers row.
+
+    Args:
+        row (Row): The time_trackers row.
+        strict (bool, optional): Whether to validate the row. Defaults to
+        STRICT_ROW_MAPPING.
+
+    Returns:
+        TimeTracker: The time tracker model.
+    """
+    fields = {
+        "id": row["id"],
+        "task_id": row["task_id"],
+        "user_id": row["user_id"],
+        "category": row["category"],
+        "start_time": parse_timestamp(row["start_time"]),
+        "stop_time": parse_timestamp(row["stop_time"]),
+        "status": row["status"],
+        "total_time": row["total_time"],
+        "segment_start": parse_timestamp(row["segment_start"]),
+        "segment_start_ns": row["segment_start_ns"],
+        "clock_id": row["clock_id"],
+        "clock_jumps": row["clock_jumps"],
+        "clock_skew": row["clock_skew"],
+    }
+    if strict:
+        return TimeTracker(**fields)
+    return TimeTracker.model_construct(**fields)
+
+
+def time_tracker_record_from_row(row: Row) -> TimeTrackerRecord:
+    """Build a lightweight TimeTrackerRecord from a time_trackers row.
+
+    Args:
+        row (Row): The time_trackers row.
+
+    Returns:
+        TimeTrackerRecord: The time tracker record.
+    """
+    return TimeTrackerRecord(
+        id=row["id"],
+        task_id=row["task_id"],
+        user_id=row["user_id"],
+        category=row["category"],
+        start_us=row["start_time"],
+        stop_us=row["stop_time"],
+        status=row["status"],
+        total_time=row["total_time"],
+    )
+
+
+def segment_from_row(row: Row) -> TimeTrackerSegment:
+    """Build a TimeTrackerSegment from a time_tracker_segments row.
+
+    Args:
+        row (Row): The time_tracker_segments row.
+
+    Returns:
+        TimeTrackerSegment: The segment.
+    """
+    return TimeTrackerSegment(
+        id=row["id"],
+        tracker_id=row["tracker_id"],
+        start_time=from_epoch_us(row["start_time"]),
+        stop_time=parse_timestamp(row["stop_time"]),
+    )
+
+
+def user_from_row(row: Row, strict: bool = STRICT_ROW_MAPPING) -> User:
+    """Build a User from a users row.
+
+    Args:
+        row (Row): The users row.
+        strict (bool, optional): Whether to validate the row. Defaults to
+        STRICT_ROW_MAPPING.
+
+    Returns:
+        User: The user model.
+    """
+    fields = {
+        "id": row["id"],
+        "email": row["email"],
+        "hashed_password": row["hashed_password"],
+        "created_at": datetime.fromisoformat(row["created_at"]),
+    }
+    if strict:
+        return User(**fields)
+    return User.model_construct(**fields)
@@ -0,0 +1,157 @@
+"""
+storage_engine.py module.
+
+This module contains the StorageEngine class, which owns the single SQLite
+database of the application and hands out connections to every repository
+class in the data_loader package.
+The database runs in WAL journal mode so that report reads do not block timer
+writes.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from sqlite3 import Connection, Error
+from typing import Dict, Iterator, Optional
+
+from src.data_loader.migrations import migrate
+
+DEFAULT_DB_PATH = "src/database/time_tracker.db"
+BUSY_TIMEOUT_SECONDS = 5.0
+
+
+class StorageEngine:
+    """Storage engine managing the shared SQLite database."""
+
+    def __init__(
+        self, db_path: str = DEFAULT_DB_PATH, check_same_thread: bool = True
+    ) -> None:
+        """Initialize the storage engine with the path to the database file.
+
+        Args:
+            db_path (str, optional): The path to the SQLite database file.
+            Defaults to "src/database/time_tracker.db".
+            check_same_thread (bool, optional): Whether connections may only
+            be used by the thread that opened them. Callers sharing the
+            engine between threads must serialize access. Defaults to True.
+        """
+        self.db_path = db_path
+        self.check_same_thread = check_same_thread
+        self.conn: Optional[Connection] = None
+        self._transaction_depth = 0
+
+    def connect(self) -> Connection:
+        """Open a new connection to the database in WAL journal mode.
+
+        The connection runs with synchronous=NORMAL rather than SQLite's
+        default FULL: commits append to the WAL without waiting for an
+        fsync, and the WAL is only synced at checkpoints. The database can
+        never be corrupted this way, and a commit survives an application
+        crash, but the last commits before a power loss or an operating
+        system crash may be rolled back. Timer writes trade that window for
+        commits that do not block on the disk.
+
+        Raises:
+            Exception: When an error occurs while connecting to the database.
+
+        Returns:
+            Connection: A new connection to the database.
+        """
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=BUSY_TIMEOUT_SECONDS,
+                check_same_thread=self.check_same_thread,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            return conn
+        except Error as e:
+            raise Exception(f"Error connecting to database: {e}")
+
+    def connection(self) -> Connection:
+        """Return the connection shared by the repository classes.
+
+        The schema migrations are applied when the shared connection is
+        opened, so repositories never run DDL themselves.
+
+        Returns:
+            Connection: The shared connection, opened on first use.
+        """
+        if self.conn is None:
+            conn = self.connect()
+            migrate(conn)
+            self.conn = conn
+        return self.conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """Group every write made on the shared connection into one commit.
+
+        Repository commits are deferred while the transaction is open. A
+        nested transaction runs under a savepoint of the outermost one: its
+        writes are rolled back alone when it raises, even if an outer block
+        catches the error, and are committed with the outermost block
+        otherwise.
+
+        Yields:
+            Iterator[Connection]: The shared connection.
+        """
+        conn = self.connection()
+        savepoint = None
+        if self._transaction_depth > 0:
+            savepoint = f"nested_{self._transaction_depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+        elif not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        self._transaction_depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._transaction_depth -= 1
+            if savepoint is not None:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
+            raise
+        self._transaction_depth -= 1
+        if savepoint is not None:
+            conn.execute(f"RELEASE {savepoint}")
+        else:
+            conn.commit()
+
+    def commit(self) -> None:
+        """Commit the shared connection unless a transaction is open."""
+        if self.conn is not None and self._transaction_depth == 0:
+            self.conn.commit()
+
+    def close(self) -> None:
+        """Close the shared connection if it is open."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+_engines: Dict[str, StorageEngine] = {}
+
+
+def get_storage_engine(db_path: str = DEFAULT_DB_PATH) -> StorageEngine:
+    """Return the storage engine for a database file, creating it once.
+
+    Args:
+        db_path (str, optional): The path to the SQLite database file.
+        Defaults to "src/database/time_tracker.db".
+
+    Returns:
+        StorageEngine: The storage engine shared for the database file.
+    """
+    engine = _engines.get(db_path)
+    if engine is None:
+        engine = StorageEngine(db_path)
+        _engines[db_path] = engine
+    return engine
@@ -7,56 +7,38 @@ The class provides methods for saving, retrieving, updating, and deleting tasks
 from the database.
 """
 
-import sqlite3
 from sqlite3 import Connection, Error
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 
-from src.models.task import Task
+from src.data_loader.rollups import reopen_cumulative_rollups
+from src.data_loader.row_mappers import task_from_row
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
+from src.models.task import TASK_STATUSES, Task
+
+# Keep IN (...) lists below SQLite's default host parameter limit.
+MAX_IN_PARAMETERS = 500
+DEFAULT_PAGE_SIZE = 20
+# Larger than any task ID, used as the start of a newest-first page.
+MAX_TASK_ID = 2**63 - 1
 
 
 class TaskDatabase:
     """Database class for managing tasks."""
 
-    def __init__(self, db_path: str = "src/database/tasks.db") -> None:
+    def __init__(self, engine: Optional[StorageEngine] = None) -> None:
         """Initialize the TaskDatabase class.
 
         Args:
-            db_path (str, optional): The path to the SQLite database file.
-            Defaults to "src/database/tasks.db".
+            engine (Optional[StorageEngine], optional): The storage engine
+            owning the database. Defaults to the shared storage engine.
         """
-        self.db_path = db_path
+        self.engine = engine if engine is not None else get_storage_engine()
         self.conn: Optional[Connection] = None
         self.connect()
-        self.create_tasks_table()
 
     def connect(self) -> None:
-        """Establish a connection to the database."""
-        try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-        except Error as e:
-            raise Exception(f"Error connecting to database: {e}")
-
-    def create_tasks_table(self) -> None:
-        """Create the tasks table if it doesn't exist."""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            category_name TEXT NOT NULL,
-            task_name TEXT NOT NULL,
-            duration REAL DEFAULT 0,
-            task_status TEXT NOT NULL,
-            FOREIGN KEY (category_name) REFERENCES categories(name)
-        );
-        """
-        try:
-            if self.conn:
-                cursor = self.conn.cursor()
-                cursor.execute(create_table_sql)
-                self.conn.commit()
-        except Error as e:
-            raise Exception(f"Error creating tasks table: {e}")
+        """Acquire the shared connection from the storage engine."""
+        self.conn = self.engine.connection()
 
     def save_task(self, task: Task) -> Optional[Task]:
         """Save a new task into the database.
@@ -87,13 +69,64 @@ class TaskDatabase:
                         task.task_status,
                     ),
                 )
-                self.conn.commit()
+                self.engine.commit()
                 task.id = cursor.lastrowid  # Set the generated ID for the task
                 return task
             return None
         except Error as e:
             raise Exception(f"Error saving task: {e}")
 
+    def save_tasks(self, tasks: Iterable[Task]) -> List[int]:
+        """Save many new tasks in a single transaction.
+
+        The tasks join the transaction of the storage engine when one is
+        open, and are committed on their own otherwise.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to be saved.
+
+        Raises:
+            Exception: When an error occurs while saving the tasks.
+
+        Returns:
+            List[int]: The generated IDs, in the order of the tasks. Each
+            task is also updated with its ID.
+        """
+        insert_sql = """
+        INSERT INTO tasks (user_id, category_name, task_name, duration,
+        task_status) VALUES (?, ?, ?, ?, ?)
+        """
+        new_tasks = list(tasks)
+        if not new_tasks or not self.conn:
+            return []
+        try:
+            # BEGIN IMMEDIATE takes the write lock before the first insert
+            # and holds it until the commit, so no other connection can
+            # insert in between and the generated IDs are consecutive.
+            with self.engine.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    insert_sql,
+                    (
+                        (
+                            task.user_id,
+                            task.category_name,
+                            task.task_name,
+                            task.duration,
+                            task.task_status,
+                        )
+                        for task in new_tasks
+                    ),
+                )
+                cursor.execute("SELECT last_insert_rowid()")
+                last_id = cursor.fetchone()[0]
+        except Error as e:
+            raise Exception(f"Error saving tasks: {e}")
+        first_id = last_id - len(new_tasks) + 1
+        for offset, task in enumerate(new_tasks):
+            task.id = first_id + offset
+        return list(range(first_id, last_id + 1))
+
     def get_tasks_by_user(self, user_id: int) -> List[Task]:
         """Retrieve all tasks for a given user.
 
@@ -112,21 +145,160 @@ class TaskDatabase:
                 cursor = self.conn.cursor()
                 cursor.execute(select_sql, (user_id,))
                 rows = cursor.fetchall()
-                return [
-                    Task(
-                        id=row["id"],
-                        user_id=row["user_id"],
-                        category_name=row["category_name"],
-                        task_name=row["task_name"],
-                        duration=row["duration"],
-                        task_status=row["task_status"],
-                    )
-                    for row in rows
-                ]
+                return [task_from_row(row) for row in rows]
         except Error as e:
             raise Exception(f"Error retrieving tasks: {e}")
         return []
 
+    def get_task(self, user_id: int, task_id: int) -> Optional[Task]:
+        """Retrieve a single task by task ID for the given user.
+
+        Args:
+            user_id (int): The ID of the user.
+            task_id (int): The ID of the task.
+
+        Raises:
+            Exception: When an error occurs while retrieving the task.
+
+        Returns:
+            Optional[Task]: The task if found, otherwise None.
+        """
+        select_sql = "SELECT * FROM tasks WHERE id = ? AND user_id = ?"
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(select_sql, (task_id, user_id))
+                row = cursor.fetchone()
+                if row:
+                    return task_from_row(row)
+        except Error as e:
+            raise Exception(f"Error retrieving task: {e}")
+        return None
+
+    def get_task_by_name(
+        self, user_id: int, category_name: str, task_name: str
+    ) -> Optional[Task]:
+        """Retrieve the oldest task with the given category and name.
+
+        Args:
+            user_id (int): The ID of the user.
+            category_name (str): The name of the category.
+            task_name (str): The name of the task.
+
+        Raises:
+            Exception: When an error occurs while retrieving the task.
+
+        Returns:
+            Optional[Task]: The task if found, otherwise None.
+        """
+        select_sql = """
+        SELECT * FROM tasks
+        WHERE user_id = ? AND task_name = ? AND category_name = ?
+        ORDER BY id
+        LIMIT 1
+        """
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(select_sql, (user_id, task_name, category_name))
+                row = cursor.fetchone()
+                if row:
+                    return task_from_row(row)
+        except Error as e:
+            raise Exception(f"Error retrieving task by name: {e}")
+        return None
+
+    def get_tasks_page(
+        self,
+        user_id: int,
+        after_id: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        statuses: Sequence[str] = TASK_STATUSES,
+        newest_first: bool = True,
+    ) -> List[Task]:
+        """Retrieve one page of a user's tasks using keyset pagination.
+
+        Args:
+            user_id (int): The ID of the user.
+            after_id (Optional[int], optional): The ID of the last task of the
+            previous page, or None for the first page. Defaults to None.
+            limit (int, optional): The maximum number of tasks returned.
+            Defaults to DEFAULT_PAGE_SIZE.
+            statuses (Sequence[str], optional): The task statuses to include.
+            Defaults to every task status.
+            newest_first (bool, optional): Whether to page from the newest
+            task backwards. Defaults to True.
+
+        Raises:
+            Exception: When an error occurs while retrieving tasks.
+
+        Returns:
+            List[Task]: The tasks of the page, in page order.
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        if newest_first:
+            select_sql = f"""
+            SELECT * FROM tasks
+            WHERE user_id = ? AND id < ? AND task_status IN ({placeholders})
+            ORDER BY id DESC
+            LIMIT ?
+            """
+            start_id = MAX_TASK_ID if after_id is None else after_id
+        else:
+            select_sql = f"""
+            SELECT * FROM tasks
+            WHERE user_id = ? AND id > ? AND task_status IN ({placeholders})
+            ORDER BY id
+            LIMIT ?
+            """
+            start_id = 0 if after_id is None else after_id
+        try:
+            if self.conn and statuses:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    select_sql, (user_id, start_id, *statuses, limit)
+                )
+                return [task_from_row(row) for row in cursor.fetchall()]
+        except Error as e:
+            raise Exception(f"Error retrieving tasks page: {e}")
+        return []
+
+    def get_tasks_by_ids(
+        self, user_id: int, task_ids: Iterable[int]
+    ) -> List[Task]:
+        """Retrieve the tasks with the given IDs for the given user.
+
+        Args:
+            user_id (int): The ID of the user.
+            task_ids (Iterable[int]): The IDs of the tasks to retrieve.
+
+        Raises:
+            Exception: When an error occurs while retrieving tasks.
+
+        Returns:
+            List[Task]: The tasks found for the given user. Unknown IDs and
+            tasks of other users are left out.
+        """
+        ids = list(dict.fromkeys(task_ids))
+        tasks: List[Task] = []
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                for offset in range(0, len(ids), MAX_IN_PARAMETERS):
+                    chunk = ids[offset:offset + MAX_IN_PARAMETERS]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor.execute(
+                        f"SELECT * FROM tasks WHERE user_id = ? "
+                        f"AND id IN ({placeholders})",
+                        (user_id, *chunk),
+                    )
+                    tasks.extend(
+                        task_from_row(row) for row in cursor.fetchall()
+                    )
+        except Error as e:
+            raise Exception(f"Error retrieving tasks by ids: {e}")
+        return tasks
+
     def update_task(
         self,
         user_id: int,
@@ -169,7 +341,7 @@ class TaskDatabase:
                     update_sql,
                     (category_name, task_name, duration, task_id, user_id),
                 )
-                self.conn.commit()
+                self.engine.commit()
         except Error as e:
             raise Exception(f"Error updating task: {e}")
 
@@ -188,13 +360,17 @@ class TaskDatabase:
             if self.conn:
                 cursor = self.conn.cursor()
                 cursor.execute(update_sql, (status, task_id))
-                self.conn.commit()
+                self.engine.commit()
         except Error as e:
             raise Exception(f"Error updating task status: {e}")
 
     def delete_task(self, user_id: int, task_id: int) -> None:
         """Delete a task by task ID for the given user.
 
+        The time trackers, segments and daily rollups of the task are
+        deleted with it, and the cumulative index is reopened from the first
+        day the task was tracked, all in one transaction.
+
         Args:
             user_id (int): The ID of the user.
             task_id (int): The ID of the task to delete.
@@ -204,19 +380,40 @@ class TaskDatabase:
             Exception: When the task ID is invalid or non-existing.
         """
         check_sql = "SELECT COUNT() FROM tasks WHERE id = ? AND user_id = ?"
+        first_day_sql = """
+        SELECT MIN(day) FROM daily_rollups WHERE user_id = ? AND task_id = ?
+        """
+        delete_rollups_sql = """
+        DELETE FROM daily_rollups WHERE user_id = ? AND task_id = ?
+        """
+        delete_segments_sql = """
+        DELETE FROM time_tracker_segments WHERE tracker_id IN (
+            SELECT id FROM time_trackers WHERE task_id = ?
+        )
+        """
+        delete_trackers_sql = "DELETE FROM time_trackers WHERE task_id = ?"
         delete_sql = "DELETE FROM tasks WHERE id = ? AND user_id = ?"
         try:
             if self.conn:
-                cursor = self.conn.cursor()
-                # Check if task exists
-                cursor.execute(check_sql, (task_id, user_id))
-                count = cursor.fetchone()[0]
-                if count == 0:
-                    raise Exception(
-                        f"No task found with ID {task_id} for user {user_id}."
-                    )
-                # Proceed with deletion
-                cursor.execute(delete_sql, (task_id, user_id))
-                self.conn.commit()
+                with self.engine.transaction() as conn:
+                    # Check if task exists
+                    count = conn.execute(
+                        check_sql, (task_id, user_id)
+                    ).fetchone()[0]
+                    if count == 0:
+                        raise Exception(
+                            f"No task found with ID {task_id} "
+                            f"for user {user_id}."
+                        )
+                    first_day = conn.execute(
+                        first_day_sql, (user_id, task_id)
+                    ).fetchone()[0]
+                    conn.execute(delete_rollups_sql, (user_id, task_id))
+                    if first_day:
+                        reopen_cumulative_rollups(conn, user_id, first_day)
+                    conn.execute(delete_segments_sql, (task_id,))
+                    conn.execute(delete_trackers_sql, (task_id,))
+                    # Proceed with deletion
+                    conn.execute(delete_sql, (task_id, user_id))
         except Error as e:
             raise Exception(f"Error deleting task: {e}")
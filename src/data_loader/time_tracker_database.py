@@ -4,104 +4,284 @@ time_tracker_database.py module.
 This module handles database operations for the TimeTracker model.
 """
 
-import sqlite3
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from sqlite3 import Connection, Error
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from src.models.time_tracker import TimeTracker
+from src.data_loader.rollups import (
+    SegmentSpan,
+    daily_rollup_rows,
+    reopen_cumulative_rollups,
+)
+from src.data_loader.row_mappers import (
+    segment_from_row,
+    time_tracker_from_row,
+    time_tracker_record_from_row,
+)
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
+from src.models.time_tracker import (
+    TimeTracker,
+    TimeTrackerRecord,
+    TimeTrackerSegment,
+)
+from src.models.tracker_frame import FrameRow
+from src.utils.timestamps import day_start_epoch_us, to_epoch_us
+
+# Every epoch microsecond start_time lies between these bounds.
+MIN_START_TIME = -(2**63)
+MAX_START_TIME = 2**63 - 1
+DEFAULT_CHUNK_SIZE = 1000
+# Every ISO date of the daily rollups lies between these bounds.
+MIN_DAY = "0001-01-01"
+MAX_DAY = "9999-12-31"
 
 
 class TimeTrackerDatabase:
     """Database class for managing time tracking data."""
 
-    def __init__(
-        self,
-        db_path: str = "src/database/timings.db",
-        tasks_db_path: str = "src/database/tasks.db",
-    ) -> None:
-        """Initialize the database connection and ensure the time trackers \
-table exists.
+    def __init__(self, engine: Optional[StorageEngine] = None) -> None:
+        """Initialize the database connection from the storage engine.
 
         Args:
-            db_path (str, optional): Path to the SQLite database file. Defaults
-            to "src/database/timings.db".
-            tasks_db_path (str, optional): Path to the tasks database file.
-            Defaults to "src/database/tasks.db".
+            engine (Optional[StorageEngine], optional): The storage engine
+            owning the database. Defaults to the shared storage engine.
         """
-        self.db_path = db_path
-        self.tasks_db_path = tasks_db_path
+        self.engine = engine if engine is not None else get_storage_engine()
         self.conn: Optional[Connection] = None
         self.connect()
-        self.create_time_trackers_table()
 
     def connect(self) -> None:
-        """Establish a connection to the database."""
-        try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-            # Attach the tasks database
-            self.conn.execute(
-                f"ATTACH DATABASE '{self.tasks_db_path}' AS tasks_db"
-            )
-        except Error as e:
-            raise Exception(f"Error connecting to database: {e}")
-
-    def create_time_trackers_table(self) -> None:
-        """Create the time trackers table if it doesn't exist."""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS time_trackers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_id INTEGER NOT NULL,
-            category TEXT NOT NULL,
-            start_time TEXT,
-            stop_time TEXT,
-            status TEXT NOT NULL,
-            total_time REAL DEFAULT 0
-        );
+        """Acquire the shared connection from the storage engine."""
+        self.conn = self.engine.connection()
+
+    @staticmethod
+    def _session_values(time_tracker: TimeTracker) -> Tuple[Any, ...]:
+        """Return the stored values of the session columns of a tracker.
+
+        Args:
+            time_tracker (TimeTracker): The time tracker instance.
+
+        Returns:
+            Tuple[Any, ...]: The start_time, stop_time, status, total_time,
+            segment_start, segment_start_ns, clock_id, clock_jumps and
+            clock_skew values.
         """
-        try:
-            if self.conn:
-                cursor = self.conn.cursor()
-                cursor.execute(create_table_sql)
-                self.conn.commit()
-        except Error as e:
-            raise Exception(f"Error creating time trackers table: {e}")
+        return (
+            to_epoch_us(time_tracker.start_time)
+            if time_tracker.start_time
+            else None,
+            to_epoch_us(time_tracker.stop_time)
+            if time_tracker.stop_time
+            else None,
+            time_tracker.status,
+            time_tracker.total_time,
+            to_epoch_us(time_tracker.segment_start)
+            if time_tracker.segment_start
+            else None,
+            time_tracker.segment_start_ns,
+            time_tracker.clock_id,
+            time_tracker.clock_jumps,
+            time_tracker.clock_skew,
+        )
 
     def save_time_tracker(self, time_tracker: TimeTracker) -> None:
         """
         Save a new time tracker to the database.
 
+        The span from its start time to its stop time, open while the
+        tracker is running, is recorded as its first segment, and added to
+        the daily rollups once closed. The writes join the transaction of
+        the storage engine when one is open, and are committed on their own
+        otherwise.
+
         Args:
-            time_tracker (TimeTracker): The time tracker instance to save.
+            time_tracker (TimeTracker): The time tracker instance to save. It
+            is updated with its generated ID.
+
+        Raises:
+            Exception: When an error occurs while saving the time tracker.
         """
         insert_sql = """
-        INSERT INTO time_trackers (task_id, category, start_time, stop_time,
-        status, total_time)
-        VALUES (?, ?, ?, ?, ?, ?)
+        INSERT INTO time_trackers (task_id, user_id, category, start_time,
+        stop_time, status, total_time, segment_start, segment_start_ns,
+        clock_id, clock_jumps, clock_skew)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        segment_sql = """
+        INSERT INTO time_tracker_segments (tracker_id, start_time, stop_time)
+        VALUES (?, ?, ?)
         """
+        if not self.conn:
+            return
         try:
-            if self.conn:
-                cursor = self.conn.cursor()
+            with self.engine.transaction() as conn:
+                cursor = conn.cursor()
                 cursor.execute(
                     insert_sql,
                     (
                         time_tracker.task_id,
+                        time_tracker.user_id,
                         time_tracker.category,  # Added category
-                        time_tracker.start_time.isoformat()
-                        if time_tracker.start_time
-                        else None,
-                        time_tracker.stop_time.isoformat()
-                        if time_tracker.stop_time
-                        else None,
-                        time_tracker.status,
-                        time_tracker.total_time,
+                        *self._session_values(time_tracker),
                     ),
                 )
-                self.conn.commit()
+                time_tracker.id = cursor.lastrowid
+                if time_tracker.start_time:
+                    cursor.execute(
+                        segment_sql,
+                        (
+                            time_tracker.id,
+                            to_epoch_us(time_tracker.start_time),
+                            to_epoch_us(time_tracker.stop_time)
+                            if time_tracker.stop_time
+                            else None,
+                        ),
+                    )
+                    if time_tracker.stop_time:
+                        self._add_to_daily_rollups(
+                            [
+                                (
+                                    time_tracker.user_id,
+                                    time_tracker.category,
+                                    time_tracker.task_id,
+                                    to_epoch_us(time_tracker.start_time),
+                                    to_epoch_us(time_tracker.stop_time),
+                                )
+                            ]
+                        )
         except Error as e:
+            time_tracker.id = None
             raise Exception(f"Error saving time tracker: {e}")
 
+    def save_time_trackers(
+        self, time_trackers: Iterable[TimeTracker]
+    ) -> List[int]:
+        """Save many new time trackers in a single transaction.
+
+        The time trackers join the transaction of the storage engine when
+        one is open, and are committed on their own otherwise.
+
+        Args:
+            time_trackers (Iterable[TimeTracker]): The time trackers to save.
+
+        Raises:
+            Exception: When an error occurs while saving the time trackers.
+
+        Returns:
+            List[int]: The generated IDs, in the order of the time trackers.
+            Each time tracker is also updated with its ID, and gets its first
+            segment as with save_time_tracker.
+        """
+        insert_sql = """
+        INSERT INTO time_trackers (task_id, user_id, category, start_time,
+        stop_time, status, total_time, segment_start, segment_start_ns,
+        clock_id, clock_jumps, clock_skew)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        segment_sql = """
+        INSERT INTO time_tracker_segments (tracker_id, start_time, stop_time)
+        VALUES (?, ?, ?)
+        """
+        new_trackers = list(time_trackers)
+        if not new_trackers or not self.conn:
+            return []
+        try:
+            # BEGIN IMMEDIATE takes the write lock before the first insert
+            # and holds it until the commit, so no other connection can
+            # insert in between and the generated IDs are consecutive.
+            with self.engine.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    insert_sql,
+                    (
+                        (
+                            tracker.task_id,
+                            tracker.user_id,
+                            tracker.category,
+                            *self._session_values(tracker),
+                        )
+                        for tracker in new_trackers
+                    ),
+                )
+                cursor.execute("SELECT last_insert_rowid()")
+                last_id = cursor.fetchone()[0]
+                first_id = last_id - len(new_trackers) + 1
+                for offset, tracker in enumerate(new_trackers):
+                    tracker.id = first_id + offset
+                cursor.executemany(
+                    segment_sql,
+                    (
+                        (
+                            tracker.id,
+                            to_epoch_us(tracker.start_time),
+                            to_epoch_us(tracker.stop_time)
+                            if tracker.stop_time
+                            else None,
+                        )
+                        for tracker in new_trackers
+                        if tracker.start_time
+                    ),
+                )
+                self._add_to_daily_rollups(
+                    (
+                        tracker.user_id,
+                        tracker.category,
+                        tracker.task_id,
+                        to_epoch_us(tracker.start_time),
+                        to_epoch_us(tracker.stop_time),
+                    )
+                    for tracker in new_trackers
+                    if tracker.start_time and tracker.stop_time
+                )
+        except Error as e:
+            for tracker in new_trackers:
+                tracker.id = None
+            raise Exception(f"Error saving time trackers: {e}")
+        return list(range(first_id, last_id + 1))
+
+    def save_timer_events(
+        self, events: Iterable[Tuple[int, int, str, Optional[str], int]]
+    ) -> None:
+        """Record journaled timer events in the timer_events audit trail.
+
+        Args:
+            events (Iterable[Tuple[int, int, str, Optional[str], int]]): The
+            sequence, task ID, kind, status and epoch microsecond timestamp
+            of each event.
+
+        Raises:
+            Exception: When an error occurs while saving the events.
+        """
+        insert_sql = """
+        INSERT INTO timer_events (sequence, task_id, kind, status,
+        recorded_at)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        try:
+            if self.conn:
+                with self.engine.transaction() as conn:
+                    conn.executemany(insert_sql, events)
+        except Error as e:
+            raise Exception(f"Error saving timer events: {e}")
+
+    def get_last_timer_event_sequence(self) -> int:
+        """Return the sequence of the last recorded timer event.
+
+        Raises:
+            Exception: When an error occurs while reading the sequence.
+
+        Returns:
+            int: The last sequence, or 0 when no event was recorded.
+        """
+        select_sql = "SELECT MAX(sequence) FROM timer_events"
+        try:
+            if self.conn:
+                row = self.conn.execute(select_sql).fetchone()
+                return row[0] or 0
+        except Error as e:
+            raise Exception(f"Error reading timer event sequence: {e}")
+        return 0
+
     def update_time_tracker(self, time_tracker: TimeTracker) -> None:
         """
         Update an existing time tracker in the database.
@@ -111,30 +291,154 @@ table exists.
         """
         update_sql = """
         UPDATE time_trackers
-        SET start_time = ?, stop_time = ?, status = ?, total_time = ?
+        SET start_time = ?, stop_time = ?, status = ?, total_time = ?,
+        segment_start = ?, segment_start_ns = ?, clock_id = ?,
+        clock_jumps = ?, clock_skew = ?
         WHERE id = ?
         """
         try:
             if self.conn:
-                cursor = self.conn.cursor()
-                cursor.execute(
-                    update_sql,
-                    (
-                        time_tracker.start_time.isoformat()
-                        if time_tracker.start_time
-                        else None,
-                        time_tracker.stop_time.isoformat()
-                        if time_tracker.stop_time
-                        else None,
-                        time_tracker.status,
-                        time_tracker.total_time,
-                        time_tracker.id,
-                    ),
-                )
-                self.conn.commit()
+                with self.engine.transaction() as conn:
+                    conn.execute(
+                        update_sql,
+                        (
+                            *self._session_values(time_tracker),
+                            time_tracker.id,
+                        ),
+                    )
         except Error as e:
             raise Exception(f"Error updating time tracker: {e}")
 
+    def open_segment(self, tracker_id: int, start_time: datetime) -> None:
+        """Open a new segment of a time tracker.
+
+        Args:
+            tracker_id (int): The time tracker ID.
+            start_time (datetime): The start of the segment.
+
+        Raises:
+            Exception: When an error occurs while saving the segment.
+        """
+        insert_sql = """
+        INSERT INTO time_tracker_segments (tracker_id, start_time)
+        VALUES (?, ?)
+        """
+        try:
+            if self.conn:
+                with self.engine.transaction() as conn:
+                    conn.execute(
+                        insert_sql, (tracker_id, to_epoch_us(start_time))
+                    )
+        except Error as e:
+            raise Exception(f"Error opening time tracker segment: {e}")
+
+    def close_segment(self, tracker_id: int, stop_time: datetime) -> None:
+        """Close the running segment of a time tracker.
+
+        The time of the segment is added to the daily rollups of the dates
+        it covers, in the same transaction.
+
+        Args:
+            tracker_id (int): The time tracker ID.
+            stop_time (datetime): The end of the segment.
+
+        Raises:
+            Exception: When an error occurs while updating the segment.
+        """
+        select_sql = """
+        SELECT t.user_id, t.category, t.task_id, s.start_time
+        FROM time_tracker_segments AS s
+        JOIN time_trackers AS t ON t.id = s.tracker_id
+        WHERE s.tracker_id = ? AND s.stop_time IS NULL
+        """
+        update_sql = """
+        UPDATE time_tracker_segments SET stop_time = ?
+        WHERE tracker_id = ? AND stop_time IS NULL
+        """
+        try:
+            if self.conn:
+                stop_us = to_epoch_us(stop_time)
+                with self.engine.transaction() as conn:
+                    segments = conn.execute(
+                        select_sql, (tracker_id,)
+                    ).fetchall()
+                    conn.execute(update_sql, (stop_us, tracker_id))
+                    self._add_to_daily_rollups(
+                        (
+                            row["user_id"],
+                            row["category"],
+                            row["task_id"],
+                            row["start_time"],
+                            stop_us,
+                        )
+                        for row in segments
+                    )
+        except Error as e:
+            raise Exception(f"Error closing time tracker segment: {e}")
+
+    def _add_to_daily_rollups(self, segments: Iterable[SegmentSpan]) -> None:
+        """Add closed segments to the daily rollups, without committing.
+
+        Time added to a day the cumulative index already closed, such as an
+        imported timesheet or a segment crossing midnight, reopens the index
+        from that day on. The index is then closed again through its previous
+        mark, or the day before the last day the segments reach if that is
+        later, so days are closed on the write path and report reads never
+        write.
+
+        Args:
+            segments (Iterable[SegmentSpan]): The closed segments.
+        """
+        upsert_sql = """
+        INSERT INTO daily_rollups (user_id, day, category, task_id, seconds,
+        segments)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, day, category, task_id) DO UPDATE
+        SET seconds = seconds + excluded.seconds,
+        segments = segments + excluded.segments
+        """
+        if not self.conn:
+            return
+        rows = daily_rollup_rows(segments)
+        self.conn.executemany(upsert_sql, rows)
+        first_days: Dict[int, str] = {}
+        last_days: Dict[int, str] = {}
+        for user_id, day, *_ in rows:
+            first_days[user_id] = min(day, first_days.get(user_id, day))
+            last_days[user_id] = max(day, last_days.get(user_id, day))
+        for user_id, day in first_days.items():
+            through = date.fromisoformat(last_days[user_id]) - timedelta(
+                days=1
+            )
+            closed = self.get_closed_through(user_id)
+            reopen_cumulative_rollups(self.conn, user_id, day)
+            self.close_rollup_days(user_id, max(through, closed or through))
+
+    def get_segments(self, tracker_id: int) -> List[TimeTrackerSegment]:
+        """Retrieve the segments of a time tracker.
+
+        Args:
+            tracker_id (int): The time tracker ID.
+
+        Raises:
+            Exception: When an error occurs while retrieving the segments.
+
+        Returns:
+            List[TimeTrackerSegment]: The segments, oldest first.
+        """
+        select_sql = """
+        SELECT * FROM time_tracker_segments
+        WHERE tracker_id = ?
+        ORDER BY start_time
+        """
+        try:
+            if self.conn:
+                cursor = self.conn.execute(select_sql, (tracker_id,))
+                return [segment_from_row(row) for row in cursor]
+        except Error as e:
+            raise Exception(f"Error retrieving time tracker segments: {e}")
+        return []
+
     def get_active_time_tracker(self, task_id: int) -> Optional[TimeTracker]:
         """
         Retrieve the active time tracker for a task.
@@ -154,19 +458,7 @@ table exists.
                 cursor.execute(select_sql, (task_id,))
                 row = cursor.fetchone()
                 if row:
-                    return TimeTracker(
-                        id=row["id"],
-                        task_id=row["task_id"],
-                        category=row["category"],  # Added category
-                        start_time=datetime.fromisoformat(row["start_time"])
-                        if row["start_time"]
-                        else None,
-                        stop_time=datetime.fromisoformat(row["stop_time"])
-                        if row["stop_time"]
-                        else None,
-                        status=row["status"],
-                        total_time=row["total_time"],
-                    )
+                    return time_tracker_from_row(row)
         except Error as e:
             raise Exception(f"Error retrieving active time tracker: {e}")
         return None
@@ -187,50 +479,51 @@ table exists.
                 cursor.execute(select_sql, (task_id,))
                 row = cursor.fetchone()
                 if row:
-                    return TimeTracker(
-                        id=row["id"],
-                        task_id=row["task_id"],
-                        category=row["category"],  # Added category
-                        start_time=datetime.fromisoformat(row["start_time"])
-                        if row["start_time"]
-                        else None,
-                        stop_time=datetime.fromisoformat(row["stop_time"])
-                        if row["stop_time"]
-                        else None,
-                        status=row["status"],
-                        total_time=row["total_time"],
-                    )
+                    return time_tracker_from_row(row)
         except Error as e:
             raise Exception(f"Error retrieving last paused time tracker: {e}")
         return None
 
+    def get_open_time_trackers_by_user(
+        self, user_id: int
+    ) -> List[TimeTracker]:
+        """Retrieve the active and paused time trackers of a user.
+
+        Args:
+            user_id (int): The user ID.
+
+        Raises:
+            Exception: When an error occurs while retrieving the trackers.
+
+        Returns:
+            List[TimeTracker]: The open time trackers, oldest first.
+        """
+        select_sql = """
+        SELECT * FROM time_trackers
+        WHERE user_id = ? AND status IN ('In Progress', 'Paused')
+        ORDER BY id
+        """
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(select_sql, (user_id,))
+                return [time_tracker_from_row(row) for row in cursor]
+        except Error as e:
+            raise Exception(f"Error retrieving open time trackers: {e}")
+        return []
+
     def get_time_trackers_by_user(self, user_id: int) -> List[TimeTracker]:
         """Retrieve all time trackers for a given user."""
         select_sql = """
         SELECT * FROM time_trackers
-        WHERE task_id IN (SELECT id FROM tasks_db.tasks WHERE user_id = ?)
+        WHERE user_id = ?
         """
         try:
             if self.conn:
                 cursor = self.conn.cursor()
                 cursor.execute(select_sql, (user_id,))
                 rows = cursor.fetchall()
-                return [
-                    TimeTracker(
-                        id=row["id"],
-                        task_id=row["task_id"],
-                        category=row["category"],
-                        start_time=datetime.fromisoformat(row["start_time"])
-                        if row["start_time"]
-                        else None,
-                        stop_time=datetime.fromisoformat(row["stop_time"])
-                        if row["stop_time"]
-                        else None,
-                        status=row["status"],
-                        total_time=row["total_time"],
-                    )
-                    for row in rows
-                ]
+                return [time_tracker_from_row(row) for row in rows]
         except Error as e:
             raise Exception(f"Error retrieving time trackers by user: {e}")
         return []
@@ -241,30 +534,17 @@ table exists.
         """Retrieve time trackers for a given user and date."""
         select_sql = """
         SELECT * FROM time_trackers
-        WHERE task_id IN (SELECT id FROM tasks WHERE user_id = ?)
-        AND DATE(start_time) = ?
+        WHERE user_id = ? AND start_time >= ? AND start_time < ?
         """
         try:
             if self.conn:
                 cursor = self.conn.cursor()
-                cursor.execute(select_sql, (user_id, date.isoformat()))
+                cursor.execute(
+                    select_sql,
+                    (user_id, *self._date_bounds(date, date)),
+                )
                 rows = cursor.fetchall()
-                return [
-                    TimeTracker(
-                        id=row["id"],
-                        task_id=row["task_id"],
-                        category=row["category"],  # Added category
-                        start_time=datetime.fromisoformat(row["start_time"])
-                        if row["start_time"]
-                        else None,
-                        stop_time=datetime.fromisoformat(row["stop_time"])
-                        if row["stop_time"]
-                        else None,
-                        status=row["status"],
-                        total_time=row["total_time"],
-                    )
-                    for row in rows
-                ]
+                return [time_tracker_from_row(row) for row in rows]
         except Error as e:
             raise Exception(
                 f"Error retrieving time trackers by user and date: {e}"
@@ -277,35 +557,622 @@ table exists.
         """Retrieve time trackers for a given user and date range."""
         select_sql = """
         SELECT * FROM time_trackers
-        WHERE task_id IN (SELECT id FROM tasks WHERE user_id = ?)
-        AND DATE(start_time) BETWEEN ? AND ?
+        WHERE user_id = ? AND start_time >= ? AND start_time < ?
         """
         try:
             if self.conn:
                 cursor = self.conn.cursor()
                 cursor.execute(
                     select_sql,
-                    (user_id, start_date.isoformat(), end_date.isoformat()),
+                    (user_id, *self._date_bounds(start_date, end_date)),
                 )
                 rows = cursor.fetchall()
-                return [
-                    TimeTracker(
-                        id=row["id"],
-                        task_id=row["task_id"],
-                        category=row["category"],  # Added category
-                        start_time=datetime.fromisoformat(row["start_time"])
-                        if row["start_time"]
-                        else None,
-                        stop_time=datetime.fromisoformat(row["stop_time"])
-                        if row["stop_time"]
-                        else None,
-                        status=row["status"],
-                        total_time=row["total_time"],
-                    )
-                    for row in rows
-                ]
+                return [time_tracker_from_row(row) for row in rows]
         except Error as e:
             raise Exception(
                 f"Error retrieving time trackers by user and date range: {e}"
             )
         return []
+
+    @staticmethod
+    def _date_bounds(
+        start_date: Optional[date], end_date: Optional[date]
+    ) -> Tuple[int, int]:
+        """Build the half-open start_time range covering the given dates.
+
+        Args:
+            start_date (Optional[date]): The first date of the range, or None
+            for no lower bound.
+            end_date (Optional[date]): The last date of the range, or None
+            for no upper bound.
+
+        Returns:
+            Tuple[int, int]: The inclusive lower and exclusive upper bound,
+            in epoch microseconds.
+        """
+        lower = (
+            day_start_epoch_us(start_date) if start_date else MIN_START_TIME
+        )
+        upper = (
+            day_start_epoch_us(end_date + timedelta(days=1))
+            if end_date
+            else MAX_START_TIME
+        )
+        return lower, upper
+
+    @staticmethod
+    def _day_bounds(
+        start_date: Optional[date], end_date: Optional[date]
+    ) -> Tuple[str, str]:
+        """Build the inclusive daily rollup day range covering the dates.
+
+        Args:
+            start_date (Optional[date]): The first date of the range, or None
+            for no lower bound.
+            end_date (Optional[date]): The last date of the range, or None
+            for no upper bound.
+
+        Returns:
+            Tuple[str, str]: The first and last ISO dates.
+        """
+        return (
+            start_date.isoformat() if start_date else MIN_DAY,
+            end_date.isoformat() if end_date else MAX_DAY,
+        )
+
+    def get_total_time_by_user(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> float:
+        """Sum the tracked time of a user, optionally within a date range.
+
+        The sum is read from the daily rollups, so time is counted on the
+        dates it was tracked and a running segment is not counted yet.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+
+        Returns:
+            float: The total tracked time in seconds.
+        """
+        select_sql = """
+        SELECT COALESCE(SUM(seconds), 0) FROM daily_rollups
+        WHERE user_id = ? AND day >= ? AND day <= ?
+        """
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    select_sql,
+                    (user_id, *self._day_bounds(start_date, end_date)),
+                )
+                return float(cursor.fetchone()[0])
+        except Error as e:
+            raise Exception(f"Error summing time trackers by user: {e}")
+        return 0.0
+
+    def get_total_time_by_category(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[str, float]:
+        """Sum the tracked time of a user per category.
+
+        Categories without any tracked time are left out. The sums are read
+        from the daily rollups.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+
+        Returns:
+            Dict[str, float]: The total tracked time keyed by category.
+        """
+        select_sql = """
+        SELECT category, SUM(seconds) AS total_time FROM daily_rollups
+        WHERE user_id = ? AND day >= ? AND day <= ?
+        GROUP BY category
+        HAVING SUM(seconds) > 0
+        """
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    select_sql,
+                    (user_id, *self._day_bounds(start_date, end_date)),
+                )
+                return {
+                    row["category"]: row["total_time"]
+                    for row in cursor.fetchall()
+                }
+        except Error as e:
+            raise Exception(f"Error summing time trackers by category: {e}")
+        return {}
+
+    def get_total_time_by_task(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[int, float]:
+        """Sum the tracked time of a user per task.
+
+        The sums are read from the daily rollups.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+
+        Returns:
+            Dict[int, float]: The total tracked time keyed by task ID.
+        """
+        select_sql = """
+        SELECT task_id, SUM(seconds) AS total_time FROM daily_rollups
+        WHERE user_id = ? AND day >= ? AND day <= ?
+        GROUP BY task_id
+        """
+        try:
+            if self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    select_sql,
+                    (user_id, *self._day_bounds(start_date, end_date)),
+                )
+                return {
+                    row["task_id"]: row["total_time"]
+                    for row in cursor.fetchall()
+                }
+        except Error as e:
+            raise Exception(f"Error summing time trackers by task: {e}")
+        return {}
+
+    def get_total_time_of_task(self, user_id: int, task_id: int) -> float:
+        """Sum the tracked time of a single task of a user.
+
+        The sum is read from the daily rollups of that task only.
+
+        Args:
+            user_id (int): The user ID.
+            task_id (int): The task ID.
+
+        Raises:
+            Exception: When an error occurs while summing the time.
+
+        Returns:
+            float: The total tracked time in seconds.
+        """
+        select_sql = """
+        SELECT SUM(seconds) FROM daily_rollups
+        WHERE user_id = ? AND task_id = ?
+        """
+        try:
+            if self.conn:
+                row = self.conn.execute(
+                    select_sql, (user_id, task_id)
+                ).fetchone()
+                return row[0] or 0.0
+        except Error as e:
+            raise Exception(f"Error summing the time of a task: {e}")
+        return 0.0
+
+    def close_rollup_days(self, user_id: int, through: date) -> None:
+        """Extend the cumulative index of a user up to a closed day.
+
+        The cumulative index holds, for every closed day and category, the
+        time tracked up to and including that day. Only the days closed
+        since the last call are added.
+
+        Args:
+            user_id (int): The user ID.
+            through (date): The last day to close, usually yesterday.
+
+        Raises:
+            Exception: When an error occurs while updating the index.
+        """
+        mark_sql = """
+        SELECT closed_through FROM cumulative_rollup_marks WHERE user_id = ?
+        """
+        base_sql = """
+        SELECT category, seconds FROM cumulative_rollups
+        WHERE user_id = ? AND day = ?
+        """
+        rollups_sql = """
+        SELECT day, category, SUM(seconds) AS seconds FROM daily_rollups
+        WHERE user_id = ? AND day > ? AND day <= ?
+        GROUP BY day, category
+        ORDER BY day
+        """
+        first_day_sql = """
+        SELECT MIN(day) FROM daily_rollups WHERE user_id = ?
+        """
+        insert_sql = """
+        INSERT INTO cumulative_rollups (user_id, day, category, seconds)
+        VALUES (?, ?, ?, ?)
+        """
+        mark_upsert_sql = """
+        INSERT INTO cumulative_rollup_marks (user_id, closed_through)
+        VALUES (?, ?)
+        ON CONFLICT (user_id) DO UPDATE
+        SET closed_through = excluded.closed_through
+        """
+        if not self.conn:
+            return
+        try:
+            with self.engine.transaction() as conn:
+                mark = conn.execute(mark_sql, (user_id,)).fetchone()
+                if mark and mark[0] >= through.isoformat():
+                    return
+                if mark:
+                    day = date.fromisoformat(mark[0])
+                    totals: Dict[str, float] = {
+                        row["category"]: row["seconds"]
+                        for row in conn.execute(
+                            base_sql, (user_id, mark[0])
+                        )
+                    }
+                else:
+                    first_day = conn.execute(
+                        first_day_sql, (user_id,)
+                    ).fetchone()[0]
+                    day = (
+                        date.fromisoformat(first_day)
+                        if first_day
+                        else through
+                    ) - timedelta(days=1)
+                    totals = {}
+                daily: Dict[str, Dict[str, float]] = {}
+                for row in conn.execute(
+                    rollups_sql,
+                    (user_id, day.isoformat(), through.isoformat()),
+                ):
+                    daily.setdefault(row["day"], {})[row["category"]] = row[
+                        "seconds"
+                    ]
+                rows: List[Tuple[int, str, str, float]] = []
+                while day < through:
+                    day += timedelta(days=1)
+                    for category, seconds in daily.get(
+                        day.isoformat(), {}
+                    ).items():
+                        totals[category] = totals.get(category, 0.0) + seconds
+                    rows.extend(
+                        (user_id, day.isoformat(), category, seconds)
+                        for category, seconds in totals.items()
+                    )
+                conn.executemany(insert_sql, rows)
+                conn.execute(mark_upsert_sql, (user_id, through.isoformat()))
+        except Error as e:
+            raise Exception(f"Error closing daily rollups: {e}")
+
+    def get_cumulative_time_by_category(
+        self, user_id: int, day: date
+    ) -> Dict[str, float]:
+        """Return the time tracked per category up to a closed day.
+
+        Args:
+            user_id (int): The user ID.
+            day (date): A day closed by close_rollup_days.
+
+        Raises:
+            Exception: When an error occurs while reading the index.
+
+        Returns:
+            Dict[str, float]: The time tracked up to and including the day,
+            keyed by category.
+        """
+        select_sql = """
+        SELECT category, seconds FROM cumulative_rollups
+        WHERE user_id = ? AND day = ?
+        """
+        try:
+            if self.conn:
+                return {
+                    row["category"]: row["seconds"]
+                    for row in self.conn.execute(
+                        select_sql, (user_id, day.isoformat())
+                    )
+                }
+        except Error as e:
+            raise Exception(f"Error reading cumulative rollups: {e}")
+        return {}
+
+    def get_closed_through(self, user_id: int) -> Optional[date]:
+        """Return the last day the cumulative index of a user covers.
+
+        Args:
+            user_id (int): The user ID.
+
+        Raises:
+            Exception: When an error occurs while reading the index.
+
+        Returns:
+            Optional[date]: The last closed day, or None before any day was
+            closed.
+        """
+        select_sql = """
+        SELECT closed_through FROM cumulative_rollup_marks WHERE user_id = ?
+        """
+        try:
+            if self.conn:
+                row = self.conn.execute(select_sql, (user_id,)).fetchone()
+                return date.fromisoformat(row[0]) if row else None
+        except Error as e:
+            raise Exception(f"Error reading cumulative rollups: {e}")
+        return None
+
+    def get_window_time_by_category(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[str, float]:
+        """Sum the tracked time of a user per category over a date window.
+
+        Days the cumulative index already closed come from it, as the
+        difference of its values on the last closed day of the window and
+        the day before the window. The later days come from the daily
+        rollups. Nothing is written, so report reads never take the write
+        lock; days are closed when segments stop.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            window. Defaults to None.
+            end_date (Optional[date], optional): The last date of the window.
+            Defaults to None.
+
+        Returns:
+            Dict[str, float]: The total tracked time keyed by category,
+            leaving out categories without any tracked time.
+        """
+        closed = self.get_closed_through(user_id)
+        totals: Dict[str, float] = {}
+        rest_start = start_date
+        if closed is not None and (start_date is None or start_date <= closed):
+            last_day = min(end_date or closed, closed)
+            totals = self.get_cumulative_time_by_category(user_id, last_day)
+            if start_date is not None:
+                before = self.get_cumulative_time_by_category(
+                    user_id, start_date - timedelta(days=1)
+                )
+                for category, seconds in before.items():
+                    totals[category] -= seconds
+            rest_start = closed + timedelta(days=1)
+        if end_date is None or rest_start is None or end_date >= rest_start:
+            rest = self.get_total_time_by_category(
+                user_id, rest_start, end_date
+            )
+            for category, seconds in rest.items():
+                totals[category] = totals.get(category, 0.0) + seconds
+        return {
+            category: seconds
+            for category, seconds in totals.items()
+            if seconds > 1e-9
+        }
+
+    def _iter_records(
+        self, select_sql: str, parameters: Tuple[Any, ...], chunk_size: int
+    ) -> Iterator[TimeTrackerRecord]:
+        """Stream the rows of a time tracker query in chunks.
+
+        Args:
+            select_sql (str): The query selecting time tracker rows.
+            parameters (Tuple[Any, ...]): The query parameters.
+            chunk_size (int): The number of rows fetched at a time.
+
+        Raises:
+            Exception: When an error occurs while retrieving time trackers.
+
+        Yields:
+            Iterator[TimeTrackerRecord]: The time tracker records.
+        """
+        if not self.conn:
+            return
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(select_sql, parameters)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield time_tracker_record_from_row(row)
+        except Error as e:
+            raise Exception(f"Error streaming time trackers: {e}")
+
+    def iter_time_trackers_by_user(
+        self, user_id: int, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[TimeTrackerRecord]:
+        """Stream all time trackers for a given user.
+
+        Args:
+            user_id (int): The user ID.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            Iterator[TimeTrackerRecord]: The time tracker records.
+        """
+        select_sql = """
+        SELECT * FROM time_trackers
+        WHERE user_id = ?
+        """
+        yield from self._iter_records(select_sql, (user_id,), chunk_size)
+
+    def iter_time_trackers_by_user_and_date(
+        self, user_id: int, date: date, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[TimeTrackerRecord]:
+        """Stream time trackers for a given user and date.
+
+        Args:
+            user_id (int): The user ID.
+            date (date): The date to filter by.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            Iterator[TimeTrackerRecord]: The time tracker records.
+        """
+        yield from self.iter_time_trackers_by_user_and_date_range(
+            user_id, date, date, chunk_size
+        )
+
+    def iter_time_trackers_by_user_and_date_range(
+        self,
+        user_id: int,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[TimeTrackerRecord]:
+        """Stream time trackers for a given user and date range.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date]): The first date of the range, or None
+            for no lower bound.
+            end_date (Optional[date]): The last date of the range, or None for
+            no upper bound.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            Iterator[TimeTrackerRecord]: The time tracker records.
+        """
+        select_sql = """
+        SELECT * FROM time_trackers
+        WHERE user_id = ? AND start_time >= ? AND start_time < ?
+        """
+        yield from self._iter_records(
+            select_sql,
+            (user_id, *self._date_bounds(start_date, end_date)),
+            chunk_size,
+        )
+
+    def iter_time_tracker_columns(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Tuple[int, str, Optional[int], float]]:
+        """Stream the columns analytics need from the time trackers of a user.
+
+        Rows are fetched as plain tuples, skipping the row mapping, for bulk
+        loads of large histories.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            Iterator[Tuple[int, str, Optional[int], float]]: The task ID,
+            category, start time in epoch microseconds and total time of
+            each time tracker.
+        """
+        yield from self._iter_tuples(
+            "task_id, category, start_time, total_time",
+            user_id,
+            start_date,
+            end_date,
+            chunk_size,
+        )
+
+    def iter_time_tracker_rows(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[FrameRow]:
+        """Stream the time trackers of a user as rows of a tracker frame.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            Iterator[FrameRow]: The ID, task ID, category, start and stop
+            times in epoch microseconds, status and total time of each time
+            tracker.
+        """
+        yield from self._iter_tuples(
+            "id, task_id, category, start_time, stop_time, status, total_time",
+            user_id,
+            start_date,
+            end_date,
+            chunk_size,
+        )
+
+    def _iter_tuples(
+        self,
+        columns: str,
+        user_id: int,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        chunk_size: int,
+    ) -> Iterator[Any]:
+        """Stream time tracker columns of a user as plain tuples.
+
+        Args:
+            columns (str): The comma separated columns to select.
+            user_id (int): The user ID.
+            start_date (Optional[date]): The first date of the range.
+            end_date (Optional[date]): The last date of the range.
+            chunk_size (int): The number of rows fetched at a time.
+
+        Raises:
+            Exception: When an error occurs while retrieving time trackers.
+
+        Yields:
+            Iterator[Any]: The selected columns of each time tracker.
+        """
+        select_sql = f"""
+        SELECT {columns} FROM time_trackers
+        WHERE user_id = ? AND start_time >= ? AND start_time < ?
+        """
+        unbounded_sql = f"""
+        SELECT {columns} FROM time_trackers
+        WHERE user_id = ?
+        """
+        if not self.conn:
+            return
+        try:
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            if start_date is None and end_date is None:
+                cursor.execute(unbounded_sql, (user_id,))
+            else:
+                cursor.execute(
+                    select_sql,
+                    (user_id, *self._date_bounds(start_date, end_date)),
+                )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        except Error as e:
+            raise Exception(f"Error streaming time tracker columns: {e}")
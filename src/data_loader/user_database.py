@@ -4,13 +4,13 @@ user_database.py module.
 This module handles database operations for the User model.
 """
 
-import sqlite3
-from datetime import datetime
 from sqlite3 import Connection, Error
 from typing import Optional
 
 from pydantic import EmailStr
 
+from src.data_loader.row_mappers import user_from_row
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
 from src.models.user import User
 
 
@@ -20,62 +20,32 @@ class UserDatabase:
     Database class to handle user storage using SQLite3.
     """
 
-    def __init__(self, db_path: str = "src/database/users.db") -> None:
-        """Initialize the database connection and ensures the users table \
-exists.
+    def __init__(self, engine: Optional[StorageEngine] = None) -> None:
+        """Initialize the database connection from the storage engine.
 
         Args:
-            db_path (str): Path to the SQLite database file.
+            engine (Optional[StorageEngine]): The storage engine owning the
+            database. Defaults to the shared storage engine.
         """
-        self.db_path = db_path
+        self.engine = engine if engine is not None else get_storage_engine()
         self.conn: Optional[Connection] = None
         self.connect()
-        self.create_users_table()
 
     def connect(self) -> None:
         """
         Connect to the SQLite database.
 
-        Establish a connection to the SQLite database and handle errors,
-        if any.
+        Acquire the shared connection from the storage engine.
         """
-        try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-        except Error as err:
-            raise Exception(f"Error connecting to database: {err}")
-
-    def create_users_table(self) -> None:
-        """
-        Create users table.
-
-        Create the users table if it does not already exist and handle errors,
-        if any.
-        """
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            hashed_password TEXT NOT NULL,
-            created_at TEXT NOT NULL
-        );
-        """
-        try:
-            if self.conn:
-                with self.conn:
-                    cursor = self.conn.cursor()
-                    cursor.execute(create_table_query)
-                    self.conn.commit()
-        except Error as err:
-            if self.conn:
-                self.conn.rollback()
-            raise Exception(f"Error creating users table: {err}")
+        self.conn = self.engine.connection()
 
     def save_user(self, user: User) -> None:
         """
         Save user data.
 
-        Save a new user to the database and handle errors, if any.
+        Save a new user to the database and handle errors, if any. The user
+        joins the transaction of the storage engine when one is open, and is
+        committed on its own otherwise.
 
         Args:
             user (User): The user object to be saved.
@@ -85,21 +55,16 @@ exists.
         VALUES (?, ?, ?)
         """
         try:
-            if self.conn:
-                with self.conn:
-                    cursor = self.conn.cursor()
-                    cursor.execute(
-                        insert_user_data_query,
-                        (
-                            user.email,
-                            user.hashed_password,
-                            user.created_at.isoformat(),
-                        ),
-                    )
-                    self.conn.commit()
+            with self.engine.transaction() as conn:
+                conn.execute(
+                    insert_user_data_query,
+                    (
+                        user.email,
+                        user.hashed_password,
+                        user.created_at.isoformat(),
+                    ),
+                )
         except Error as err:
-            if self.conn:
-                self.conn.rollback()
             raise Exception(f"Error saving user: {err}")
 
     def get_user_by_email(self, email: EmailStr) -> Optional[User]:
@@ -117,20 +82,12 @@ exists.
         select_user_query = "SELECT * FROM users WHERE email = ?"
         try:
             if self.conn:
-                with self.conn:
-                    cursor = self.conn.cursor()
-                    cursor.execute(select_user_query, (email,))
-                    row = cursor.fetchone()
-                    if row:
-                        return User(
-                            id=row["id"],
-                            email=row["email"],
-                            hashed_password=row["hashed_password"],
-                            created_at=datetime.fromisoformat(
-                                row["created_at"]
-                            ),
-                        )
-                    return None
+                cursor = self.conn.cursor()
+                cursor.execute(select_user_query, (email,))
+                row = cursor.fetchone()
+                if row:
+                    return user_from_row(row)
+                return None
         except Error as err:
             raise Exception(f"Error retrieving user by email: {err}")
         return None
@@ -8,6 +8,10 @@ from src.controllers.authentication_controller import AuthenticationController
 from src.controllers.task_controller import TaskController
 from src.services.category_service import CategoryService
 from src.services.task_service import TaskService
+from src.services.time_tracker_service import TimeTrackerService
+from src.services.timer_journal import TimerJournal
+from src.services.write_behind import WriteBehindQueue
+from src.utils.config import TIMER_JOURNAL_ENABLED, WRITE_BEHIND_ENABLED
 from src.utils.helpers import clear_console
 
 # Create a Rich console instance
@@ -19,6 +23,53 @@ def main() -> None:
     auth_controller = AuthenticationController()
     task_service = TaskService()
     category_service = CategoryService()
+    write_behind = None
+    if WRITE_BEHIND_ENABLED:
+        write_behind = WriteBehindQueue(
+            task_service.task_db.engine,
+            on_commit=task_service.invalidate_task,
+        )
+        write_behind.start()
+    journal = None
+    if TIMER_JOURNAL_ENABLED:
+        # Opening the journal replays the events left by a crash.
+        journal = TimerJournal(
+            engine=task_service.task_db.engine,
+            on_commit=task_service.invalidate_task,
+        )
+    time_tracker_service = TimeTrackerService(
+        task_service=task_service, write_behind=write_behind, journal=journal
+    )
+    try:
+        run(
+            auth_controller,
+            task_service,
+            category_service,
+            time_tracker_service,
+        )
+    finally:
+        if write_behind is not None:
+            write_behind.close()
+        if journal is not None:
+            journal.close()
+
+
+def run(
+    auth_controller: AuthenticationController,
+    task_service: TaskService,
+    category_service: CategoryService,
+    time_tracker_service: TimeTrackerService,
+) -> None:
+    """Run the menu loop until the user exits.
+
+    Args:
+        auth_controller (AuthenticationController): The authentication
+        controller.
+        task_service (TaskService): The task service.
+        category_service (CategoryService): The category service.
+        time_tracker_service (TimeTrackerService): The time tracker
+        service, whose deferred writes are flushed on logout.
+    """
     logged_in_user = None
 
     clear_console()
@@ -71,6 +122,8 @@ def main() -> None:
                 if logged_in_user is None:
                     console.print("[red]Login failed. Please try again.[/red]")
                     continue
+                if logged_in_user.id:
+                    time_tracker_service.load_timers(logged_in_user.id)
             elif action == "Exit":
                 clear_console()
                 console.print(
@@ -88,11 +141,16 @@ def main() -> None:
                     )
                 )
                 task_controller = TaskController(
-                    logged_in_user.id, task_service, category_service
+                    logged_in_user.id,
+                    task_service,
+                    category_service,
+                    time_tracker_service,
                 )
                 task_controller.show_dashboard()  # Show the dashboard once
                 result = task_controller.show_task_menu()  # Show the task menu
                 if result == "logout":  # Handle log out
+                    time_tracker_service.flush()
+                    time_tracker_service.unload_timers()
                     logged_in_user = None  # Reset the logged-in user
                     console.print(
                         "[bold magenta]Logged out successfully.[/bold magenta]"
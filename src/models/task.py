@@ -9,6 +9,10 @@ from typing import Optional
 
 from pydantic import BaseModel, field_validator
 
+TASK_STATUSES = ("Not Started", "In Progress", "Paused", "Completed")
+# The statuses of tasks that still need work.
+OPEN_TASK_STATUSES = ("Not Started", "In Progress", "Paused")
+
 
 class Task(BaseModel):
     """Represent a task model using Pydantic for validation."""
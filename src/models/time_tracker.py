@@ -1,37 +1,104 @@
 """
 Defines the TimeTracker model.
 
-This module represents a time tracker model with id, task_id, category, task,
-status, start_time, pause_time, resume_time, stop_time, and total_time.
+This module represents a time tracker model with id, task_id, user_id,
+category, task, status, start_time, pause_time, resume_time, stop_time, and
+total_time.
+A time tracker is a session covering one run of a task, made of segments
+between each start or resume and the following pause or stop.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from pydantic import BaseModel
 
+from src.utils.timestamps import from_epoch_us
+
 
 class TimeTracker(BaseModel):
     """Represent a time tracker model for tracking task timings."""
 
     id: Optional[int] = None
     task_id: int
+    user_id: Optional[int] = None
     category: str
     start_time: Optional[datetime] = None
     stop_time: Optional[datetime] = None
     status: str
+    # The time of the closed segments, in seconds.
     total_time: float = 0.0
+    # The start of the running segment, None while paused or completed.
+    segment_start: Optional[datetime] = None
+    # The monotonic clock reading taken with segment_start, and the ID of
+    # the process clock it belongs to.
+    segment_start_ns: Optional[int] = None
+    clock_id: Optional[str] = None
+    # The wall clock adjustments detected while the session ran, and the
+    # sum of their sizes in seconds.
+    clock_jumps: int = 0
+    clock_skew: float = 0.0
 
     @classmethod
-    def create(cls, task_id: int, status: str, category: str) -> "TimeTracker":
+    def create(
+        cls,
+        task_id: int,
+        status: str,
+        category: str,
+        user_id: Optional[int] = None,
+    ) -> "TimeTracker":
         """Create a new TimeTracker instance.
 
         Args:
             task_id (int): Task ID.
             status (str): Status of the task.
             category (str): Category of the task.
+            user_id (Optional[int], optional): ID of the user owning the task.
+            Defaults to None.
 
         Returns:
             TimeTracker: A new TimeTracker instance.
         """
-        return cls(task_id=task_id, status=status, category=category)
+        return cls(
+            task_id=task_id, status=status, category=category, user_id=user_id
+        )
+
+
+class TimeTrackerRecord(NamedTuple):
+    """Represent a read-only time tracker row without model validation.
+
+    Timestamps are kept as stored, in epoch microseconds, and converted to
+    datetimes only when accessed.
+    """
+
+    id: int
+    task_id: int
+    user_id: Optional[int]
+    category: str
+    start_us: Optional[int]
+    stop_us: Optional[int]
+    status: str
+    total_time: float
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        """Return the start time as a naive local datetime."""
+        if self.start_us is None:
+            return None
+        return from_epoch_us(self.start_us)
+
+    @property
+    def stop_time(self) -> Optional[datetime]:
+        """Return the stop time as a naive local datetime."""
+        if self.stop_us is None:
+            return None
+        return from_epoch_us(self.stop_us)
+
+
+class TimeTrackerSegment(NamedTuple):
+    """Represent a segment of a time tracker session."""
+
+    id: int
+    tracker_id: int
+    start_time: datetime
+    stop_time: Optional[datetime]
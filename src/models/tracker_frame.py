@@ -0,0 +1,379 @@
+"""
+Defines the TrackerFrame container.
+
+This module represents many time trackers as a struct of arrays: one
+array.array per field, int64 epoch microsecond timestamps, and categories
+and statuses interned as small integer codes. A frame takes tens of bytes
+per time tracker, where a list of TimeTracker models takes hundreds.
+Indexing a frame returns a TrackerView, a lightweight view of one time
+tracker, and slicing or filtering it returns a new frame.
+"""
+
+from array import array
+from datetime import datetime
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+from src.models.time_tracker import TimeTracker, TimeTrackerRecord
+from src.utils.timestamps import from_epoch_us, to_epoch_us
+
+# Stands for a missing timestamp in the int64 timestamp arrays.
+NULL_TIME = -(2**63)
+
+# The ID, task ID, category, start and stop times in epoch microseconds,
+# status and total time of a time tracker row.
+FrameRow = Tuple[
+    int, int, str, Optional[int], Optional[int], str, Optional[float]
+]
+
+
+class TrackerView:
+    """Represent a read-only view of one time tracker of a frame."""
+
+    __slots__ = ("frame", "index")
+
+    def __init__(self, frame: "TrackerFrame", index: int) -> None:
+        """Initialize the view of a time tracker.
+
+        Args:
+            frame (TrackerFrame): The frame holding the time tracker.
+            index (int): The position of the time tracker in the frame.
+        """
+        self.frame = frame
+        self.index = index
+
+    @property
+    def id(self) -> int:
+        """Return the time tracker ID."""
+        return self.frame.ids[self.index]
+
+    @property
+    def task_id(self) -> int:
+        """Return the task ID."""
+        return self.frame.task_ids[self.index]
+
+    @property
+    def category(self) -> str:
+        """Return the category."""
+        return self.frame.categories[self.frame.category_codes[self.index]]
+
+    @property
+    def status(self) -> str:
+        """Return the status."""
+        return self.frame.statuses[self.frame.status_codes[self.index]]
+
+    @property
+    def start_us(self) -> Optional[int]:
+        """Return the start time in epoch microseconds."""
+        value = self.frame.start_us[self.index]
+        return None if value == NULL_TIME else value
+
+    @property
+    def stop_us(self) -> Optional[int]:
+        """Return the stop time in epoch microseconds."""
+        value = self.frame.stop_us[self.index]
+        return None if value == NULL_TIME else value
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        """Return the start time as a naive local datetime."""
+        value = self.start_us
+        return None if value is None else from_epoch_us(value)
+
+    @property
+    def stop_time(self) -> Optional[datetime]:
+        """Return the stop time as a naive local datetime."""
+        value = self.stop_us
+        return None if value is None else from_epoch_us(value)
+
+    @property
+    def total_time(self) -> float:
+        """Return the total time in seconds."""
+        return self.frame.total_times[self.index]
+
+    def __repr__(self) -> str:
+        """Return a readable representation of the view."""
+        return (
+            f"TrackerView(id={self.id}, task_id={self.task_id}, "
+            f"category={self.category!r}, status={self.status!r}, "
+            f"total_time={self.total_time})"
+        )
+
+
+class TrackerFrame:
+    """Compact, column-oriented collection of time trackers."""
+
+    def __init__(self) -> None:
+        """Initialize an empty frame."""
+        self.ids = array("q")
+        self.task_ids = array("q")
+        self.category_codes = array("i")
+        self.start_us = array("q")
+        self.stop_us = array("q")
+        self.status_codes = array("b")
+        self.total_times = array("d")
+        # The interned strings, indexed by code. Frames derived by slicing
+        # or filtering share them, and they are only ever appended to.
+        self.categories: List[str] = []
+        self.statuses: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._status_codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[FrameRow]) -> "TrackerFrame":
+        """Build a frame from time tracker rows.
+
+        Args:
+            rows (Iterable[FrameRow]): The time tracker rows.
+
+        Returns:
+            TrackerFrame: The frame.
+        """
+        frame = cls()
+        for row in rows:
+            frame.append(*row)
+        return frame
+
+    @classmethod
+    def from_trackers(
+        cls, time_trackers: Iterable[Union[TimeTracker, TimeTrackerRecord]]
+    ) -> "TrackerFrame":
+        """Build a frame from time tracker models or records.
+
+        Args:
+            time_trackers (Iterable[Union[TimeTracker, TimeTrackerRecord]]):
+            The time trackers.
+
+        Returns:
+            TrackerFrame: The frame.
+        """
+        return cls.from_rows(
+            (
+                tracker.id or 0,
+                tracker.task_id,
+                tracker.category,
+                to_epoch_us(tracker.start_time)
+                if tracker.start_time
+                else None,
+                to_epoch_us(tracker.stop_time) if tracker.stop_time else None,
+                tracker.status,
+                tracker.total_time,
+            )
+            for tracker in time_trackers
+        )
+
+    def append(
+        self,
+        id: int,
+        task_id: int,
+        category: str,
+        start_us: Optional[int],
+        stop_us: Optional[int],
+        status: str,
+        total_time: Optional[float],
+    ) -> None:
+        """Append a time tracker to the frame.
+
+        Args:
+            id (int): The time tracker ID.
+            task_id (int): The task ID.
+            category (str): The category.
+            start_us (Optional[int]): The start time in epoch microseconds.
+            stop_us (Optional[int]): The stop time in epoch microseconds.
+            status (str): The status.
+            total_time (Optional[float]): The total time in seconds.
+        """
+        category_code = self._category_codes.get(category)
+        if category_code is None:
+            category_code = self._category_codes[category] = len(
+                self.categories
+            )
+            self.categories.append(category)
+        status_code = self._status_codes.get(status)
+        if status_code is None:
+            status_code = self._status_codes[status] = len(self.statuses)
+            self.statuses.append(status)
+        self.ids.append(id)
+        self.task_ids.append(task_id)
+        self.category_codes.append(category_code)
+        self.start_us.append(NULL_TIME if start_us is None else start_us)
+        self.stop_us.append(NULL_TIME if stop_us is None else stop_us)
+        self.status_codes.append(status_code)
+        self.total_times.append(total_time or 0.0)
+
+    def __len__(self) -> int:
+        """Return the number of time trackers."""
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, key: int) -> TrackerView:
+        """Return the view of the time tracker at a position."""
+
+    @overload
+    def __getitem__(self, key: slice) -> "TrackerFrame":
+        """Return a frame of the time trackers in a slice."""
+
+    def __getitem__(
+        self, key: Union[int, slice]
+    ) -> Union[TrackerView, "TrackerFrame"]:
+        """Return the view of a time tracker, or a slice of the frame.
+
+        Args:
+            key (Union[int, slice]): The position or the slice.
+
+        Raises:
+            IndexError: If the position is out of range.
+
+        Returns:
+            Union[TrackerView, TrackerFrame]: The view, or the new frame.
+        """
+        if isinstance(key, slice):
+            frame = self._derive()
+            for name in self._columns():
+                setattr(frame, name, getattr(self, name)[key])
+            return frame
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("TrackerFrame index out of range")
+        return TrackerView(self, key)
+
+    def __iter__(self) -> Iterator[TrackerView]:
+        """Iterate over views of the time trackers."""
+        for index in range(len(self)):
+            yield TrackerView(self, index)
+
+    def take(self, indexes: Iterable[int]) -> "TrackerFrame":
+        """Return a frame of the time trackers at the given positions.
+
+        Args:
+            indexes (Iterable[int]): The positions, in the order to keep.
+
+        Returns:
+            TrackerFrame: The new frame.
+        """
+        positions = list(indexes)
+        frame = self._derive()
+        for name in self._columns():
+            column = getattr(self, name)
+            setattr(
+                frame,
+                name,
+                array(column.typecode, [column[i] for i in positions]),
+            )
+        return frame
+
+    def filter(
+        self, predicate: Callable[[TrackerView], bool]
+    ) -> "TrackerFrame":
+        """Return a frame of the time trackers matching a predicate.
+
+        Args:
+            predicate (Callable[[TrackerView], bool]): Called with the view
+            of each time tracker.
+
+        Returns:
+            TrackerFrame: The new frame.
+        """
+        return self.take(
+            index
+            for index in range(len(self))
+            if predicate(TrackerView(self, index))
+        )
+
+    def where(
+        self,
+        category: Optional[str] = None,
+        task_id: Optional[int] = None,
+        status: Optional[str] = None,
+        start_from: Optional[datetime] = None,
+        start_before: Optional[datetime] = None,
+    ) -> "TrackerFrame":
+        """Return a frame of the time trackers matching every criterion.
+
+        The criteria are compared on the raw columns, without building any
+        view or datetime per time tracker.
+
+        Args:
+            category (Optional[str], optional): The category. Defaults to
+            None.
+            task_id (Optional[int], optional): The task ID. Defaults to None.
+            status (Optional[str], optional): The status. Defaults to None.
+            start_from (Optional[datetime], optional): The earliest start
+            time, inclusive. Defaults to None.
+            start_before (Optional[datetime], optional): The latest start
+            time, exclusive. Defaults to None.
+
+        Returns:
+            TrackerFrame: The new frame.
+        """
+        checks: List[Callable[[int], bool]] = []
+        if category is not None:
+            category_code = self._category_codes.get(category, -1)
+            checks.append(lambda i: self.category_codes[i] == category_code)
+        if task_id is not None:
+            checks.append(lambda i: self.task_ids[i] == task_id)
+        if status is not None:
+            status_code = self._status_codes.get(status, -1)
+            checks.append(lambda i: self.status_codes[i] == status_code)
+        if start_from is not None:
+            lower = to_epoch_us(start_from)
+            checks.append(lambda i: self.start_us[i] >= lower)
+        if start_before is not None:
+            upper = to_epoch_us(start_before)
+            checks.append(lambda i: NULL_TIME < self.start_us[i] < upper)
+        return self.take(
+            index
+            for index in range(len(self))
+            if all(check(index) for check in checks)
+        )
+
+    def nbytes(self) -> int:
+        """Return the memory held by the column arrays, in bytes.
+
+        Returns:
+            int: The size of the column buffers.
+        """
+        return sum(
+            len(column) * column.itemsize
+            for column in (getattr(self, name) for name in self._columns())
+        )
+
+    def _derive(self) -> "TrackerFrame":
+        """Return an empty frame sharing the interned strings of this one.
+
+        Returns:
+            TrackerFrame: The empty frame.
+        """
+        frame = TrackerFrame.__new__(TrackerFrame)
+        frame.categories = self.categories
+        frame.statuses = self.statuses
+        frame._category_codes = self._category_codes
+        frame._status_codes = self._status_codes
+        return frame
+
+    @staticmethod
+    def _columns() -> Tuple[str, ...]:
+        """Return the names of the column arrays.
+
+        Returns:
+            Tuple[str, ...]: The attribute names.
+        """
+        return (
+            "ids",
+            "task_ids",
+            "category_codes",
+            "start_us",
+            "stop_us",
+            "status_codes",
+            "total_times",
+        )
@@ -0,0 +1,332 @@
+"""
+Handle Report Analytics.
+
+This module computes report aggregates of the Time Tracker Console
+Application over columnar time tracker data: one column of task IDs, one of
+category codes, one of start times and one of durations.
+The aggregates are vectorized with NumPy when it is installed, and computed
+in pure Python otherwise, with the same results.
+"""
+
+import importlib
+from types import ModuleType
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from src.models.tracker_frame import NULL_TIME, TrackerFrame
+
+DEFAULT_HISTOGRAM_BIN_SECONDS = 900.0
+DEFAULT_HISTOGRAM_BINS = 16
+
+# The task ID, category, start time in epoch microseconds and total time of
+# a time tracker.
+ColumnRow = Tuple[int, str, Optional[int], Optional[float]]
+
+
+def _load_numpy() -> Optional[ModuleType]:
+    """Import NumPy if it is installed.
+
+    Returns:
+        Optional[ModuleType]: The numpy module, or None.
+    """
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+# Typed as Any, since NumPy may be missing when type checking.
+numpy: Any = _load_numpy()
+
+
+class TrackerColumns(NamedTuple):
+    """Represent time trackers as columns of equal length.
+
+    The columns are NumPy arrays when NumPy is used, and lists otherwise.
+    """
+
+    task_ids: Sequence[int]
+    # The index of each category in categories.
+    category_codes: Sequence[int]
+    # The start time in epoch microseconds, NULL_TIME when not started.
+    start_us: Sequence[int]
+    # The total time in seconds.
+    durations: Sequence[float]
+    categories: Tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        """Return the number of time trackers."""
+        return len(self.task_ids)
+
+    @property
+    def vectorized(self) -> bool:
+        """Return whether the columns are NumPy arrays."""
+        return numpy is not None and isinstance(self.durations, numpy.ndarray)
+
+
+class ReportAnalytics(NamedTuple):
+    """Represent the aggregates of a report."""
+
+    total_time: float
+    category_totals: Dict[str, float]
+    task_totals: Dict[int, float]
+    # The tracked time minus the estimated duration, keyed by task ID.
+    estimate_deltas: Dict[int, float]
+    # The number of time trackers per duration bin.
+    duration_histogram: List[int]
+
+
+def build_columns(
+    rows: Iterable[ColumnRow], use_numpy: bool = True
+) -> TrackerColumns:
+    """Load time tracker rows into columns.
+
+    Args:
+        rows (Iterable[ColumnRow]): The time tracker rows.
+        use_numpy (bool, optional): Whether to build NumPy arrays when NumPy
+        is installed. Defaults to True.
+
+    Returns:
+        TrackerColumns: The columns.
+    """
+    codes: Dict[str, int] = {}
+    task_ids: List[int] = []
+    category_codes: List[int] = []
+    start_us: List[int] = []
+    durations: List[float] = []
+    for task_id, category, start, duration in rows:
+        task_ids.append(task_id)
+        category_codes.append(codes.setdefault(category, len(codes)))
+        start_us.append(NULL_TIME if start is None else start)
+        durations.append(duration or 0.0)
+    categories = tuple(codes)
+    if numpy is None or not use_numpy:
+        return TrackerColumns(
+            task_ids, category_codes, start_us, durations, categories
+        )
+    return TrackerColumns(
+        numpy.asarray(task_ids, dtype=numpy.int64),
+        numpy.asarray(category_codes, dtype=numpy.int64),
+        numpy.asarray(start_us, dtype=numpy.int64),
+        numpy.asarray(durations, dtype=numpy.float64),
+        categories,
+    )
+
+
+def frame_columns(
+    frame: TrackerFrame, use_numpy: bool = True
+) -> TrackerColumns:
+    """Return the columns of a tracker frame.
+
+    The NumPy arrays are copies of the frame arrays: views would export
+    their buffers and keep the frame from growing while they are alive.
+
+    Args:
+        frame (TrackerFrame): The tracker frame.
+        use_numpy (bool, optional): Whether to build NumPy arrays when NumPy
+        is installed. Defaults to True.
+
+    Returns:
+        TrackerColumns: The columns.
+    """
+    categories = tuple(frame.categories)
+    if numpy is None or not use_numpy:
+        return TrackerColumns(
+            frame.task_ids,
+            frame.category_codes,
+            frame.start_us,
+            frame.total_times,
+            categories,
+        )
+    return TrackerColumns(
+        numpy.array(frame.task_ids, dtype=numpy.int64),
+        numpy.array(frame.category_codes, dtype=numpy.int32),
+        numpy.array(frame.start_us, dtype=numpy.int64),
+        numpy.array(frame.total_times, dtype=numpy.float64),
+        categories,
+    )
+
+
+def unique_task_ids(columns: TrackerColumns) -> List[int]:
+    """Return the distinct task IDs of the time trackers.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+
+    Returns:
+        List[int]: The sorted task IDs, as Python integers.
+    """
+    if columns.vectorized:
+        return numpy.unique(columns.task_ids).tolist()
+    return sorted(set(columns.task_ids))
+
+
+def total_time(columns: TrackerColumns) -> float:
+    """Sum the durations of the time trackers.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+
+    Returns:
+        float: The total time in seconds.
+    """
+    if columns.vectorized:
+        return float(numpy.sum(columns.durations))
+    return float(sum(columns.durations))
+
+
+def category_totals(columns: TrackerColumns) -> Dict[str, float]:
+    """Sum the durations per category.
+
+    Categories without any tracked time are left out.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+
+    Returns:
+        Dict[str, float]: The total time keyed by category.
+    """
+    sums: Sequence[Any]
+    if columns.vectorized:
+        sums = numpy.bincount(
+            columns.category_codes,
+            weights=columns.durations,
+            minlength=len(columns.categories),
+        ).tolist()
+    else:
+        sums = [0.0] * len(columns.categories)
+        for code, duration in zip(columns.category_codes, columns.durations):
+            sums[code] += duration
+    return {
+        category: float(seconds)
+        for category, seconds in zip(columns.categories, sums)
+        if seconds > 0
+    }
+
+
+def task_totals(columns: TrackerColumns) -> Dict[int, float]:
+    """Sum the durations per task.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+
+    Returns:
+        Dict[int, float]: The total time keyed by task ID.
+    """
+    if columns.vectorized:
+        task_ids, inverse = numpy.unique(columns.task_ids, return_inverse=True)
+        sums = numpy.bincount(inverse.ravel(), weights=columns.durations)
+        return dict(zip(task_ids.tolist(), sums.tolist()))
+    totals: Dict[int, float] = {}
+    for task_id, duration in zip(columns.task_ids, columns.durations):
+        totals[task_id] = totals.get(task_id, 0.0) + duration
+    return dict(sorted(totals.items()))
+
+
+def estimate_deltas(
+    columns: TrackerColumns, estimates: Mapping[int, float]
+) -> Dict[int, float]:
+    """Compare the time tracked per task with its estimated duration.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+        estimates (Mapping[int, float]): The estimated durations in
+        seconds, keyed by task ID. Tasks without an estimate are left out.
+
+    Returns:
+        Dict[int, float]: The tracked time minus the estimated duration,
+        keyed by task ID. A positive value means the task took longer.
+    """
+    totals = task_totals(columns)
+    task_ids = [task_id for task_id in totals if task_id in estimates]
+    if columns.vectorized:
+        deltas = numpy.fromiter(
+            (totals[task_id] for task_id in task_ids),
+            dtype=numpy.float64,
+            count=len(task_ids),
+        ) - numpy.fromiter(
+            (estimates[task_id] for task_id in task_ids),
+            dtype=numpy.float64,
+            count=len(task_ids),
+        )
+        return dict(zip(task_ids, deltas.tolist()))
+    return {
+        task_id: totals[task_id] - estimates[task_id] for task_id in task_ids
+    }
+
+
+def duration_histogram(
+    columns: TrackerColumns,
+    bin_seconds: float = DEFAULT_HISTOGRAM_BIN_SECONDS,
+    bins: int = DEFAULT_HISTOGRAM_BINS,
+) -> List[int]:
+    """Count the time trackers per duration bin.
+
+    Bin i holds the durations from i * bin_seconds up to, but excluding,
+    (i + 1) * bin_seconds. The last bin also holds every longer duration.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+        bin_seconds (float, optional): The width of a bin in seconds.
+        Defaults to DEFAULT_HISTOGRAM_BIN_SECONDS.
+        bins (int, optional): The number of bins. Defaults to
+        DEFAULT_HISTOGRAM_BINS.
+
+    Raises:
+        ValueError: If the bin width or the number of bins is not positive.
+
+    Returns:
+        List[int]: The number of time trackers in each bin.
+    """
+    if bin_seconds <= 0 or bins <= 0:
+        raise ValueError("Invalid histogram bins.")
+    if columns.vectorized:
+        indexes = numpy.clip(
+            numpy.floor_divide(columns.durations, bin_seconds),
+            0,
+            bins - 1,
+        ).astype(numpy.int64)
+        return numpy.bincount(indexes, minlength=bins).tolist()
+    counts = [0] * bins
+    for duration in columns.durations:
+        counts[min(max(int(duration // bin_seconds), 0), bins - 1)] += 1
+    return counts
+
+
+def analyze(
+    columns: TrackerColumns,
+    estimates: Mapping[int, float],
+    bin_seconds: float = DEFAULT_HISTOGRAM_BIN_SECONDS,
+    bins: int = DEFAULT_HISTOGRAM_BINS,
+) -> ReportAnalytics:
+    """Compute every aggregate of a report.
+
+    Args:
+        columns (TrackerColumns): The time tracker columns.
+        estimates (Mapping[int, float]): The estimated durations in
+        seconds, keyed by task ID.
+        bin_seconds (float, optional): The width of a histogram bin in
+        seconds. Defaults to DEFAULT_HISTOGRAM_BIN_SECONDS.
+        bins (int, optional): The number of histogram bins. Defaults to
+        DEFAULT_HISTOGRAM_BINS.
+
+    Returns:
+        ReportAnalytics: The aggregates.
+    """
+    return ReportAnalytics(
+        total_time=total_time(columns),
+        category_totals=category_totals(columns),
+        task_totals=task_totals(columns),
+        estimate_deltas=estimate_deltas(columns, estimates),
+        duration_histogram=duration_histogram(columns, bin_seconds, bins),
+    )
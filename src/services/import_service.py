@@ -0,0 +1,395 @@
+"""
+Handle Timesheet Import Service.
+
+This module imports historical timesheets from CSV or JSON Lines files into
+the Time Tracker Console Application.
+Rows are streamed through a validation stage, a category resolution stage
+and a task resolution stage, and written in batches of tasks and time
+trackers. Each batch is committed in one transaction together with the
+number of rows imported so far, so an interrupted import resumes after the
+last committed batch and imports every row exactly once.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.import_database import ImportDatabase
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.task import Task
+from src.models.time_tracker import TimeTracker
+
+IMPORT_BATCH_SIZE = 5000
+TASK_CACHE_SIZE = 10000
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+
+class TimesheetEntry(NamedTuple):
+    """Represent a validated timesheet row."""
+
+    line_number: int
+    category: str
+    task_name: str
+    start_time: datetime
+    stop_time: datetime
+    estimated_duration: float
+
+
+class ImportProgress(NamedTuple):
+    """Represent the progress of a timesheet import."""
+
+    rows_read: int
+    rows_imported: int
+    rows_skipped: int
+    elapsed_seconds: float
+    # The rows imported by an earlier, interrupted run.
+    rows_resumed: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the throughput of this run in rows per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.rows_read - self.rows_resumed) / self.elapsed_seconds
+
+
+class TimesheetImportService:
+    """Service class for importing historical timesheets."""
+
+    def __init__(
+        self,
+        task_db: Optional[TaskDatabase] = None,
+        category_db: Optional[CategoryDatabase] = None,
+        time_tracker_db: Optional[TimeTrackerDatabase] = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        import_db: Optional[ImportDatabase] = None,
+    ) -> None:
+        """Initialize the import service with database instances.
+
+        Every database instance must use the same storage engine, since
+        each batch is written in a single transaction.
+
+        Args:
+            task_db (Optional[TaskDatabase], optional): The task database
+            instance. Defaults to None.
+            category_db (Optional[CategoryDatabase], optional): The category
+            database instance. Defaults to None.
+            time_tracker_db (Optional[TimeTrackerDatabase], optional): The
+            time tracker database instance. Defaults to None.
+            batch_size (int, optional): The number of rows written per
+            commit. Defaults to IMPORT_BATCH_SIZE.
+            import_db (Optional[ImportDatabase], optional): The database
+            recording the import progress. Defaults to None.
+        """
+        self.task_db = task_db if task_db is not None else TaskDatabase()
+        self.category_db = (
+            category_db if category_db is not None else CategoryDatabase()
+        )
+        self.time_tracker_db = (
+            time_tracker_db
+            if time_tracker_db is not None
+            else TimeTrackerDatabase()
+        )
+        self.import_db = (
+            import_db
+            if import_db is not None
+            else ImportDatabase(self.time_tracker_db.engine)
+        )
+        self.batch_size = batch_size
+        self._categories: Set[str] = set()
+        self._task_ids: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+
+    @staticmethod
+    def detect_format(path: str) -> str:
+        """Detect the file format from the file extension.
+
+        Args:
+            path (str): The path of the timesheet file.
+
+        Raises:
+            ValueError: If the extension is not a supported format.
+
+        Returns:
+            str: Either "csv" or "jsonl".
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise ValueError(
+            f"Unsupported timesheet format '{extension}'. "
+            "Use a .csv or .jsonl file."
+        )
+
+    def import_timesheets(
+        self,
+        user_id: int,
+        path: str,
+        file_format: Optional[str] = None,
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+    ) -> ImportProgress:
+        """Import a timesheet file for a user.
+
+        Every row needs category, task_name, start_time and stop_time
+        fields, with ISO timestamps in local time, and may carry an
+        estimated_duration for the task. Rows are imported as completed
+        time trackers, and tasks are matched by category and name.
+        Importing the same file again resumes an interrupted import, and
+        starts over once the previous import finished.
+
+        Args:
+            user_id (int): The user ID.
+            path (str): The path of the timesheet file.
+            file_format (Optional[str], optional): Either "csv" or "jsonl".
+            Defaults to the format matching the file extension.
+            progress (Optional[Callable[[ImportProgress], None]], optional):
+            Called after every committed batch. Defaults to None.
+
+        Raises:
+            ValueError: If the file format is not supported.
+
+        Returns:
+            ImportProgress: The totals of the finished import.
+        """
+        file_format = file_format or self.detect_format(path)
+        if file_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported timesheet format '{file_format}'.")
+        source = os.path.abspath(path)
+        rows_done = self.import_db.get_import_progress(user_id, source)
+
+        started = time.monotonic()
+        rows_read = rows_done
+        rows_imported = 0
+        rows_skipped = 0
+        batch: List[TimesheetEntry] = []
+        rows = self._read_rows(path, file_format, skip=rows_done)
+        for line_number, entry in self._validate(rows):
+            rows_read = line_number
+            if entry is None:
+                rows_skipped += 1
+            else:
+                batch.append(entry)
+            if len(batch) >= self.batch_size:
+                rows_imported += self._write_batch(
+                    user_id, batch, source, rows_read
+                )
+                batch = []
+                if progress:
+                    progress(
+                        ImportProgress(
+                            rows_read,
+                            rows_imported,
+                            rows_skipped,
+                            time.monotonic() - started,
+                            rows_done,
+                        )
+                    )
+        rows_imported += self._write_batch(
+            user_id, batch, source, rows_read, finished=True
+        )
+        report = ImportProgress(
+            rows_read,
+            rows_imported,
+            rows_skipped,
+            time.monotonic() - started,
+            rows_done,
+        )
+        if progress:
+            progress(report)
+        return report
+
+    @staticmethod
+    def _read_rows(
+        path: str, file_format: str, skip: int = 0
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Stream the raw rows of a timesheet file.
+
+        Args:
+            path (str): The path of the timesheet file.
+            file_format (str): Either "csv" or "jsonl".
+            skip (int, optional): The number of rows already imported.
+            Defaults to 0.
+
+        Yields:
+            Iterator[Tuple[int, Optional[Dict[str, Any]]]]: The row number and
+            the row fields, or None for a row that cannot be parsed.
+        """
+        with open(path, newline="", encoding="utf-8") as file:
+            if file_format == "csv":
+                for row_number, row in enumerate(csv.DictReader(file), 1):
+                    if row_number > skip:
+                        yield row_number, row
+                return
+            for row_number, line in enumerate(file, 1):
+                if row_number <= skip:
+                    continue
+                try:
+                    fields = json.loads(line)
+                except ValueError:
+                    fields = None
+                yield row_number, fields if isinstance(fields, dict) else None
+
+    @staticmethod
+    def _validate(
+        rows: Iterable[Tuple[int, Optional[Dict[str, Any]]]]
+    ) -> Iterator[Tuple[int, Optional[TimesheetEntry]]]:
+        """Validate raw rows into timesheet entries.
+
+        Args:
+            rows (Iterable[Tuple[int, Optional[Dict[str, Any]]]]): The raw
+            rows with their row numbers.
+
+        Yields:
+            Iterator[Tuple[int, Optional[TimesheetEntry]]]: The row number and
+            the entry, or None for an invalid row.
+        """
+        for row_number, row in rows:
+            try:
+                if row is None:
+                    raise ValueError("Unreadable row.")
+                category = str(row.get("category") or "").strip()
+                task_name = str(row.get("task_name") or "").strip()
+                start_time = datetime.fromisoformat(str(row["start_time"]))
+                stop_time = datetime.fromisoformat(str(row["stop_time"]))
+                estimated_duration = float(
+                    row.get("estimated_duration") or 0.0
+                )
+                if not category or not task_name or stop_time < start_time:
+                    raise ValueError("Invalid timesheet entry.")
+            except (KeyError, TypeError, ValueError):
+                yield row_number, None
+                continue
+            yield row_number, TimesheetEntry(
+                row_number,
+                category,
+                task_name,
+                start_time,
+                stop_time,
+                estimated_duration,
+            )
+
+    def _resolve_tasks(
+        self, user_id: int, batch: List[TimesheetEntry]
+    ) -> Dict[Tuple[str, str], int]:
+        """Find or create the task of every entry of a batch.
+
+        Args:
+            user_id (int): The user ID.
+            batch (List[TimesheetEntry]): The timesheet entries.
+
+        Returns:
+            Dict[Tuple[str, str], int]: The task IDs keyed by category and
+            task name.
+        """
+        task_ids: Dict[Tuple[str, str], int] = {}
+        new_tasks: Dict[Tuple[str, str], Task] = {}
+        for entry in batch:
+            key = (entry.category, entry.task_name)
+            if key in task_ids or key in new_tasks:
+                continue
+            task_id = self._task_ids.get(key)
+            if task_id is None:
+                task = self.task_db.get_task_by_name(user_id, *key)
+                task_id = task.id if task else None
+            if task_id is None:
+                new_tasks[key] = Task.create(
+                    user_id=user_id,
+                    category_name=entry.category,
+                    task_name=entry.task_name,
+                    duration=entry.estimated_duration,
+                    task_status="Completed",
+                )
+            else:
+                task_ids[key] = task_id
+        self.task_db.save_tasks(new_tasks.values())
+        for key, task in new_tasks.items():
+            if task.id is not None:
+                task_ids[key] = task.id
+        return task_ids
+
+    def _remember_tasks(self, task_ids: Dict[Tuple[str, str], int]) -> None:
+        """Cache the task IDs of a committed batch.
+
+        Args:
+            task_ids (Dict[Tuple[str, str], int]): The task IDs keyed by
+            category and task name.
+        """
+        for key, task_id in task_ids.items():
+            self._task_ids[key] = task_id
+            self._task_ids.move_to_end(key)
+        while len(self._task_ids) > TASK_CACHE_SIZE:
+            self._task_ids.popitem(last=False)
+
+    def _write_batch(
+        self,
+        user_id: int,
+        batch: List[TimesheetEntry],
+        source: str,
+        rows_done: int,
+        finished: bool = False,
+    ) -> int:
+        """Write a batch of timesheet entries as completed time trackers.
+
+        The categories, tasks and time trackers of the batch are written in
+        one transaction with the import progress, so a batch is either fully
+        imported and recorded as such, or not at all.
+
+        Args:
+            user_id (int): The user ID.
+            batch (List[TimesheetEntry]): The timesheet entries.
+            source (str): The absolute path of the timesheet file.
+            rows_done (int): The number of rows read, this batch included.
+            finished (bool, optional): Whether this is the last batch, after
+            which the progress is forgotten. Defaults to False.
+
+        Returns:
+            int: The number of time trackers written.
+        """
+        categories = {entry.category for entry in batch} - self._categories
+        with self.time_tracker_db.engine.transaction():
+            for category in sorted(categories):
+                self.category_db.get_or_create_category(category)
+            task_ids = self._resolve_tasks(user_id, batch)
+            trackers = [
+                TimeTracker(
+                    task_id=task_ids[(entry.category, entry.task_name)],
+                    user_id=user_id,
+                    category=entry.category,
+                    start_time=entry.start_time,
+                    stop_time=entry.stop_time,
+                    status="Completed",
+                    total_time=(
+                        entry.stop_time - entry.start_time
+                    ).total_seconds(),
+                )
+                for entry in batch
+            ]
+            written = len(self.time_tracker_db.save_time_trackers(trackers))
+            if finished:
+                self.import_db.delete_import_progress(user_id, source)
+            else:
+                self.import_db.save_import_progress(
+                    user_id, source, rows_done
+                )
+        # Cache only what the commit made durable.
+        self._categories.update(categories)
+        self._remember_tasks(task_ids)
+        return written
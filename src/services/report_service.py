@@ -6,13 +6,49 @@ Application. It includes functions for generating and viewing reports of time
 entries, filtered by various criteria.
 """
 
-from datetime import date
-from typing import Any, Dict, List, Optional
-
-from src.data_loader.time_tracker_database import TimeTrackerDatabase
-from src.models.time_tracker import TimeTracker
+import csv
+import json
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.data_loader.time_tracker_database import (
+    DEFAULT_CHUNK_SIZE,
+    TimeTrackerDatabase,
+)
+from src.models.time_tracker import TimeTracker, TimeTrackerRecord
+from src.models.tracker_frame import TrackerFrame
+from src.services.analytics import (
+    DEFAULT_HISTOGRAM_BIN_SECONDS,
+    DEFAULT_HISTOGRAM_BINS,
+    ReportAnalytics,
+    TrackerColumns,
+    analyze,
+    build_columns,
+    category_totals,
+    frame_columns,
+    total_time,
+    unique_task_ids,
+)
 from src.services.task_service import TaskService
 
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_FIELDS = (
+    "task_id",
+    "task_name",
+    "category",
+    "start_time",
+    "stop_time",
+    "total_time",
+    "estimated_duration",
+    "status",
+)
+# The number of days covered by the reports with a fixed period.
+REPORT_PERIOD_DAYS = {"daily": 0, "weekly": 7, "monthly": 30}
+
+# Time trackers as models, or as a compact tracker frame.
+TimeTrackers = Union[List[TimeTracker], TrackerFrame]
+
 
 class ReportService:
     """Service class for generating time tracking reports."""
@@ -79,17 +115,377 @@ task service.
             user_id, start_date, end_date
         )
 
+    def iter_time_trackers(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[TimeTrackerRecord]:
+        """Stream the time trackers of a user in constant memory.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Returns:
+            Iterator[TimeTrackerRecord]: The time tracker records.
+        """
+        if start_date is None and end_date is None:
+            return self.db.iter_time_trackers_by_user(user_id, chunk_size)
+        return self.db.iter_time_trackers_by_user_and_date_range(
+            user_id, start_date, end_date, chunk_size
+        )
+
+    def load_columns(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> TrackerColumns:
+        """Load the time trackers of a user into columns for analytics.
+
+        The columns are NumPy arrays when NumPy is installed.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Returns:
+            TrackerColumns: The time tracker columns.
+        """
+        return build_columns(
+            self.db.iter_time_tracker_columns(
+                user_id, start_date, end_date, chunk_size
+            )
+        )
+
+    def load_frame(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> TrackerFrame:
+        """Load the time trackers of a user into a compact tracker frame.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows fetched at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Returns:
+            TrackerFrame: The time trackers.
+        """
+        return TrackerFrame.from_rows(
+            self.db.iter_time_tracker_rows(
+                user_id, start_date, end_date, chunk_size
+            )
+        )
+
+    def get_analytics(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        bin_seconds: float = DEFAULT_HISTOGRAM_BIN_SECONDS,
+        bins: int = DEFAULT_HISTOGRAM_BINS,
+        frame: Optional[TrackerFrame] = None,
+    ) -> ReportAnalytics:
+        """Compute the aggregates of a user's time trackers in bulk.
+
+        Totals, category and task sums, estimate deltas and the duration
+        histogram are computed column-wise, vectorized when NumPy is
+        installed, so large histories are analyzed without building a
+        model per time tracker.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            bin_seconds (float, optional): The width of a histogram bin in
+            seconds. Defaults to DEFAULT_HISTOGRAM_BIN_SECONDS.
+            bins (int, optional): The number of histogram bins. Defaults to
+            DEFAULT_HISTOGRAM_BINS.
+            frame (Optional[TrackerFrame], optional): Time trackers already
+            loaded, analyzed instead of the date range. Defaults to None.
+
+        Returns:
+            ReportAnalytics: The aggregates.
+        """
+        columns = (
+            frame_columns(frame)
+            if frame is not None
+            else self.load_columns(user_id, start_date, end_date)
+        )
+        tasks = self.task_service.get_tasks_by_ids(
+            user_id, unique_task_ids(columns)
+        )
+        estimates = {task_id: task.duration for task_id, task in tasks.items()}
+        return analyze(columns, estimates, bin_seconds, bins)
+
+    @staticmethod
+    def get_report_range(
+        report_type: str,
+        duration: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> Tuple[Optional[date], Optional[date]]:
+        """Return the date range covered by a report type.
+
+        Args:
+            report_type (str): One of overall, daily, weekly, monthly or
+            custom.
+            duration (Optional[int], optional): The number of days of a
+            custom report. Defaults to None.
+            today (Optional[date], optional): The last date of the range.
+            Defaults to the current date.
+
+        Raises:
+            ValueError: If the report type or duration is invalid.
+
+        Returns:
+            Tuple[Optional[date], Optional[date]]: The first and last dates
+            of the range, both None for the overall report.
+        """
+        if report_type == "overall":
+            return None, None
+        today = today or datetime.now().date()
+        if report_type in REPORT_PERIOD_DAYS:
+            days = REPORT_PERIOD_DAYS[report_type]
+        elif report_type == "custom":
+            if not duration or duration <= 0:
+                raise ValueError("Invalid duration specified.")
+            days = duration
+        else:
+            raise ValueError(f"Invalid report type '{report_type}'.")
+        return today - timedelta(days=days), today
+
+    def iter_report_rows(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the rows of a report in constant memory.
+
+        The tasks of each chunk of time trackers are fetched in a single
+        batch, and rows whose task no longer exists are left out.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows handled at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            Iterator[Dict[str, Any]]: The report rows, keyed by EXPORT_FIELDS.
+        """
+        records = self.iter_time_trackers(
+            user_id, start_date, end_date, chunk_size
+        )
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return
+            tasks = self.task_service.get_tasks_by_ids(
+                user_id, (record.task_id for record in chunk)
+            )
+            for record in chunk:
+                task = tasks.get(record.task_id)
+                if not task:
+                    continue
+                start_time = record.start_time
+                stop_time = record.stop_time
+                yield {
+                    "task_id": record.task_id,
+                    "task_name": task.task_name,
+                    "category": record.category,
+                    "start_time": start_time.isoformat()
+                    if start_time
+                    else None,
+                    "stop_time": stop_time.isoformat() if stop_time else None,
+                    "total_time": record.total_time,
+                    "estimated_duration": task.duration,
+                    "status": record.status,
+                }
+
+    def export_report(
+        self,
+        user_id: int,
+        path: str,
+        file_format: str = "csv",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Stream a report to a CSV or JSON Lines file.
+
+        Args:
+            user_id (int): The user ID.
+            path (str): The path of the export file.
+            file_format (str, optional): Either "csv" or "jsonl". Defaults to
+            "csv".
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+            chunk_size (int, optional): The number of rows handled at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+        Raises:
+            ValueError: If the file format is not supported.
+
+        Returns:
+            int: The number of rows written.
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{file_format}'.")
+        rows = self.iter_report_rows(
+            user_id, start_date, end_date, chunk_size
+        )
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            if file_format == "csv":
+                writer = csv.DictWriter(file, fieldnames=EXPORT_FIELDS)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            else:
+                for row in rows:
+                    file.write(json.dumps(row) + "\n")
+                    count += 1
+        return count
+
+    def get_total_time_by_user(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> float:
+        """Calculate the total time a user tracked over a window.
+
+        The total is read from the cumulative index of the daily rollups,
+        with two lookups whatever the length of the window.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+
+        Returns:
+            float: The total time spent on tasks.
+        """
+        return sum(
+            self.get_category_totals(user_id, start_date, end_date).values()
+        )
+
+    def get_category_totals(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[str, float]:
+        """Generate category insights for a user over a window.
+
+        The totals are read from the cumulative index of the daily rollups,
+        and from the daily rollups of the days it does not cover yet.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+
+        Returns:
+            Dict[str, float]: A dictionary of category insights.
+        """
+        return self.db.get_window_time_by_category(
+            user_id, start_date, end_date
+        )
+
+    def get_rolling_totals(
+        self, user_id: int, days: int, today: Optional[date] = None
+    ) -> Dict[str, float]:
+        """Calculate the time a user tracked per category in the last days.
+
+        Args:
+            user_id (int): The user ID.
+            days (int): The number of days of the window, today included.
+            today (Optional[date], optional): The last day of the window.
+            Defaults to the current date.
+
+        Raises:
+            ValueError: If the number of days is not positive.
+
+        Returns:
+            Dict[str, float]: The total time keyed by category.
+        """
+        if days <= 0:
+            raise ValueError("Invalid duration specified.")
+        today = today or datetime.now().date()
+        return self.db.get_window_time_by_category(
+            user_id, today - timedelta(days=days - 1), today
+        )
+
+    def get_task_totals(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[int, float]:
+        """Calculate the time a user tracked per task, from the daily rollups.
+
+        Args:
+            user_id (int): The user ID.
+            start_date (Optional[date], optional): The first date of the
+            range. Defaults to None.
+            end_date (Optional[date], optional): The last date of the range.
+            Defaults to None.
+
+        Returns:
+            Dict[int, float]: The total time keyed by task ID.
+        """
+        return self.db.get_total_time_by_task(user_id, start_date, end_date)
+
     def get_category_insights(
-        self, time_trackers: List[TimeTracker]
+        self, time_trackers: TimeTrackers
     ) -> Dict[str, float]:
         """Generate insights based on categories.
 
         Args:
-            time_trackers (List[TimeTracker]): A list of time trackers.
+            time_trackers (TimeTrackers): A list of time trackers, or a
+            tracker frame.
 
         Returns:
             Dict[str, float]: A dictionary of category insights.
         """
+        if isinstance(time_trackers, TrackerFrame):
+            return category_totals(frame_columns(time_trackers))
         categories: Dict[str, float] = {}
         for tracker in time_trackers:
             if tracker.category not in categories:
@@ -101,22 +497,28 @@ task service.
         return frequent_categories
 
     def get_task_insights(
-        self, time_trackers: List[TimeTracker], user_id: int
+        self, time_trackers: TimeTrackers, user_id: int
     ) -> List[Dict[str, Any]]:
         """Generate insights for each task.
 
+        The tasks are fetched in one batch, and the duration insight of
+        each time tracker is derived from the tracker itself, so no query is
+        made per time tracker.
+
         Args:
-            time_trackers (List[TimeTracker]): A list of time trackers.
+            time_trackers (TimeTrackers): A list of time trackers, or a
+            tracker frame.
             user_id (int): The user ID.
 
         Returns:
             List[Dict[str, Any]]: A list of task insights.
         """
+        tasks = self.task_service.get_tasks_by_ids(
+            user_id, (tracker.task_id for tracker in time_trackers)
+        )
         task_insights = []
         for tracker in time_trackers:
-            task = self.task_service.get_task_by_id(
-                user_id, tracker.task_id
-            )  # Pass user_id explicitly
+            task = tasks.get(tracker.task_id)
             if task:
                 task_insights.append(
                     {
@@ -128,6 +530,9 @@ task service.
                         "total_time": tracker.total_time,
                         "estimated_duration": task.duration,
                         "status": tracker.status,
+                        "duration_insight": self.describe_duration(
+                            tracker.status, tracker.total_time, task.duration
+                        ),
                     }
                 )
         return task_insights
@@ -135,6 +540,8 @@ task service.
     def get_task_duration_insights(self, task_id: int, user_id: int) -> str:
         """Generate insights about task duration.
 
+        The time tracked on the task is read from its own daily rollups.
+
         Args:
             task_id (int): The task ID.
             user_id (int): The user ID.
@@ -145,30 +552,50 @@ task service.
         task = self.task_service.get_task_by_id(user_id, task_id)
         if not task:
             return "Task not found."
+        elapsed_time = self.db.get_total_time_of_task(user_id, task_id)
+        return self.describe_duration(
+            task.task_status, elapsed_time, task.duration
+        )
 
-        time_tracker = self.db.get_active_time_tracker(task_id)
-        if not time_tracker or time_tracker.status != "Completed":
-            return "Task not completed."
+    @staticmethod
+    def describe_duration(
+        status: str, elapsed_time: float, estimated_duration: float
+    ) -> str:
+        """Compare the time tracked with the estimated duration.
 
-        elapsed_time = time_tracker.total_time
-        estimated_duration = task.duration
+        Args:
+            status (str): The status of the time tracker or task.
+            elapsed_time (float): The time tracked in seconds.
+            estimated_duration (float): The estimated duration in seconds.
 
+        Returns:
+            str: A message with insights about the duration.
+        """
+        if status != "Completed":
+            return "Task not completed."
         if elapsed_time < estimated_duration:
-            return f"Task completed {estimated_duration - elapsed_time:.2f} \
-                seconds early."
+            return (
+                f"Task completed {estimated_duration - elapsed_time:.2f} "
+                "seconds early."
+            )
         elif elapsed_time > estimated_duration:
-            return f"Task delayed by {elapsed_time - estimated_duration:.2f} \
-                seconds."
+            return (
+                f"Task delayed by {elapsed_time - estimated_duration:.2f} "
+                "seconds."
+            )
         else:
             return "Task completed exactly on time."
 
-    def get_total_time(self, time_trackers: List[TimeTracker]) -> float:
+    def get_total_time(self, time_trackers: TimeTrackers) -> float:
         """Calculate the total time spent on tasks.
 
         Args:
-            time_trackers (List[TimeTracker]): A list of time trackers.
+            time_trackers (TimeTrackers): A list of time trackers, or a
+            tracker frame.
 
         Returns:
             float: The total time spent on tasks.
         """
+        if isinstance(time_trackers, TrackerFrame):
+            return total_time(frame_columns(time_trackers))
         return sum(tracker.total_time for tracker in time_trackers)
@@ -7,11 +7,15 @@ It provides methods for creating, reading, updating, and deleting tasks, as
 well as updating task status.
 """
 
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from src.data_loader.category_database import CategoryDatabase
-from src.data_loader.task_database import TaskDatabase
-from src.models.task import Task
+from src.data_loader.task_database import DEFAULT_PAGE_SIZE, TaskDatabase
+from src.models.task import TASK_STATUSES, Task
+
+TASK_CACHE_SIZE = 256
 
 
 class TaskService:
@@ -21,6 +25,7 @@ class TaskService:
         self,
         task_db: Optional[TaskDatabase] = None,
         category_db: Optional[CategoryDatabase] = None,
+        cache_size: int = TASK_CACHE_SIZE,
     ) -> None:
         """Initialize the task service with database instances.
 
@@ -29,11 +34,18 @@ class TaskService:
             instance. Defaults to None.
             category_db (Optional[CategoryDatabase], optional): The category
             database instance. Defaults to None.
+            cache_size (int, optional): The maximum number of tasks kept in
+            the lookup cache. Defaults to TASK_CACHE_SIZE.
         """
         self.task_db = task_db if task_db is not None else TaskDatabase()
         self.category_db = (
             category_db if category_db is not None else CategoryDatabase()
         )
+        self.cache_size = cache_size
+        self._task_cache: "OrderedDict[int, Task]" = OrderedDict()
+        # Deferred timer writes invalidate the cache from their own thread.
+        self._cache_lock = threading.Lock()
+        self._invalidations = 0
 
     def create_task(
         self,
@@ -72,6 +84,41 @@ class TaskService:
         self.task_db.save_task(new_task)
         return new_task
 
+    def create_tasks(
+        self, user_id: int, tasks: Iterable[Tuple[str, str, float]]
+    ) -> List[Task]:
+        """Create many tasks in one batch, ensuring their categories exist.
+
+        The categories and tasks are committed together, in one
+        transaction, so a failed batch leaves nothing behind.
+
+        Args:
+            user_id (int): The user ID.
+            tasks (Iterable[Tuple[str, str, float]]): The category name, task
+            name and duration of every task to create.
+
+        Returns:
+            List[Task]: The created tasks, with their generated IDs.
+        """
+        known_categories = set()
+        new_tasks = []
+        with self.task_db.engine.transaction():
+            for category_name, task_name, duration in tasks:
+                if category_name not in known_categories:
+                    self.category_db.get_or_create_category(category_name)
+                    known_categories.add(category_name)
+                new_tasks.append(
+                    Task.create(
+                        user_id=user_id,
+                        category_name=category_name,
+                        task_name=task_name,
+                        duration=duration,
+                        task_status="Not Started",
+                    )
+                )
+            self.task_db.save_tasks(new_tasks)
+        return new_tasks
+
     def get_tasks(self, user_id: int) -> List[Task]:
         """Retrieve all tasks for a given user.
 
@@ -83,9 +130,40 @@ class TaskService:
         """
         return self.task_db.get_tasks_by_user(user_id)
 
+    def get_tasks_page(
+        self,
+        user_id: int,
+        after_id: Optional[int] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        statuses: Sequence[str] = TASK_STATUSES,
+        newest_first: bool = True,
+    ) -> List[Task]:
+        """Retrieve one page of tasks for a given user.
+
+        Args:
+            user_id (int): The user ID.
+            after_id (Optional[int], optional): The ID of the last task of the
+            previous page, or None for the first page. Defaults to None.
+            limit (int, optional): The maximum number of tasks returned.
+            Defaults to DEFAULT_PAGE_SIZE.
+            statuses (Sequence[str], optional): The task statuses to include.
+            Defaults to every task status.
+            newest_first (bool, optional): Whether to page from the newest
+            task backwards. Defaults to True.
+
+        Returns:
+            List[Task]: The tasks of the page.
+        """
+        return self.task_db.get_tasks_page(
+            user_id, after_id, limit, statuses, newest_first
+        )
+
     def get_task_by_id(self, user_id: int, task_id: int) -> Optional[Task]:
         """Retrieve a task by its ID for the given user.
 
+        Tasks are served from a bounded LRU cache, which is invalidated
+        whenever the task is written through this service.
+
         Args:
             user_id (int): The user ID.
             task_id (int): The task ID.
@@ -93,11 +171,65 @@ class TaskService:
         Returns:
             Optional[Task]: The task if found, otherwise None.
         """
-        tasks = self.task_db.get_tasks_by_user(user_id)
-        for task in tasks:
-            if task.id == task_id:
+        with self._cache_lock:
+            task = self._task_cache.get(task_id)
+            if task is not None:
+                if task.user_id != user_id:
+                    return None
+                self._task_cache.move_to_end(task_id)
                 return task
-        return None
+            invalidations = self._invalidations
+        task = self.task_db.get_task(user_id, task_id)
+        if task is not None and self.cache_size > 0:
+            with self._cache_lock:
+                # A task invalidated during the read may already be stale.
+                if invalidations != self._invalidations:
+                    return task
+                self._task_cache[task_id] = task
+                if len(self._task_cache) > self.cache_size:
+                    self._task_cache.popitem(last=False)
+        return task
+
+    def get_tasks_by_ids(
+        self, user_id: int, task_ids: Iterable[int]
+    ) -> Dict[int, Task]:
+        """Retrieve several tasks of the given user in one batch.
+
+        Tasks already in the lookup cache are reused, and the rest are
+        fetched with a single query per batch of IDs.
+
+        Args:
+            user_id (int): The user ID.
+            task_ids (Iterable[int]): The task IDs.
+
+        Returns:
+            Dict[int, Task]: The tasks found, keyed by task ID.
+        """
+        tasks: Dict[int, Task] = {}
+        missing: List[int] = []
+        with self._cache_lock:
+            for task_id in dict.fromkeys(task_ids):
+                task = self._task_cache.get(task_id)
+                if task is None:
+                    missing.append(task_id)
+                elif task.user_id == user_id:
+                    tasks[task_id] = task
+        for task in self.task_db.get_tasks_by_ids(user_id, missing):
+            if task.id is not None:
+                tasks[task.id] = task
+        return tasks
+
+    def invalidate_task(self, task_id: int) -> None:
+        """Drop a task from the lookup cache after it has been written.
+
+        It is safe to call from any thread.
+
+        Args:
+            task_id (int): The task ID.
+        """
+        with self._cache_lock:
+            self._task_cache.pop(task_id, None)
+            self._invalidations += 1
 
     def update_task(
         self,
@@ -126,6 +258,7 @@ class TaskService:
                 self.task_db.update_task(
                     user_id, task_id, category_name, task_name, duration
                 )
+                self.invalidate_task(task_id)
         except ValueError as err:
             raise ValueError(err)
 
@@ -137,6 +270,7 @@ class TaskService:
             status (str): The new status.
         """
         self.task_db.update_task_status(task_id, status)
+        self.invalidate_task(task_id)
 
     def delete_task(self, user_id: int, task_id: int) -> None:
         """Delete a task by task ID for the given user.
@@ -146,3 +280,4 @@ class TaskService:
             task_id (int): The task ID.
         """
         self.task_db.delete_task(user_id, task_id)
+        self.invalidate_task(task_id)
@@ -7,24 +7,405 @@ It includes functions for starting, pausing, resuming, stopping timers, and
 recording timestamps for tasks.
 """
 
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Any, ContextManager, Dict, Iterator, Optional, Union
 
 from src.data_loader.time_tracker_database import TimeTrackerDatabase
 from src.models.time_tracker import TimeTracker
+from src.services.task_service import TaskService
+from src.services.timer_journal import TimerJournal
+from src.services.timer_registry import TimerRegistry
+from src.services.unit_of_work import UnitOfWork
+from src.services.write_behind import TimerEvent, WriteBehindQueue
+from src.utils.clock import (
+    ClockReading,
+    advance,
+    measure_elapsed,
+    read_clock,
+)
 
 
 class TimeTrackerService:
     """Service class for handling time tracking operations."""
 
-    def __init__(self, db: Optional[TimeTrackerDatabase] = None) -> None:
+    def __init__(
+        self,
+        db: Optional[TimeTrackerDatabase] = None,
+        task_service: Optional[TaskService] = None,
+        write_behind: Optional[WriteBehindQueue] = None,
+        journal: Optional[TimerJournal] = None,
+        registry: Optional[TimerRegistry] = None,
+    ) -> None:
         """Initialize the time tracker service with a database instance.
 
         Args:
             db (Optional[TimeTrackerDatabase], optional): A TimeTrackerDatabase
             instance. If None, a new instance is created. Defaults to None.
+            task_service (Optional[TaskService], optional): The task service
+            updating the task status along with the timer. It must use the
+            same storage engine as the database. Defaults to None.
+            write_behind (Optional[WriteBehindQueue], optional): The queue
+            timer writes go through instead of being committed right away.
+            Defaults to None, writing synchronously.
+            journal (Optional[TimerJournal], optional): The journal timer
+            writes are appended to instead of being committed right away.
+            It takes precedence over write_behind. Defaults to None.
+            registry (Optional[TimerRegistry], optional): The registry of
+            open time trackers. Defaults to None.
         """
         self.db = db if db is not None else TimeTrackerDatabase()
+        self.task_service = (
+            task_service if task_service is not None else TaskService()
+        )
+        self.write_behind = write_behind
+        self.journal = journal
+        self.registry = registry if registry is not None else TimerRegistry()
+        # The task statuses written since the last flush, which the task
+        # rows may not show yet while writes are deferred.
+        self._task_statuses: Dict[int, str] = {}
+
+    @property
+    def timer_events(self) -> Optional[Union[TimerJournal, WriteBehindQueue]]:
+        """Return where timer writes are deferred to, if anywhere.
+
+        Returns:
+            Optional[Union[TimerJournal, WriteBehindQueue]]: The journal or
+            the write-behind queue, or None when writing synchronously.
+        """
+        if self.journal is not None:
+            return self.journal
+        return self.write_behind
+
+    def unit_of_work(self) -> ContextManager[Any]:
+        """Return a unit of work grouping timer and task status writes.
+
+        When writes are deferred, they are committed together by the journal
+        or the write-behind queue.
+
+        Returns:
+            ContextManager[Any]: The unit of work.
+        """
+        if self.timer_events is not None:
+            return self.timer_events.group()
+        return UnitOfWork(self.db.engine)
+
+    def flush(self) -> int:
+        """Commit the deferred timer writes.
+
+        Returns:
+            int: The number of writes committed.
+        """
+        if self.timer_events is None:
+            return 0
+        committed = self.timer_events.flush()
+        self._task_statuses.clear()
+        return committed
+
+    def pending_task_statuses(self) -> Dict[int, str]:
+        """Return the task statuses written since the last flush.
+
+        While writes are deferred, a task row may still hold the status it
+        had before, so task lists are shown with these statuses instead of
+        flushing the deferred writes first.
+
+        Returns:
+            Dict[int, str]: The latest status of each task, keyed by task ID.
+        """
+        return dict(self._task_statuses)
+
+    def _save_time_tracker(self, time_tracker: TimeTracker) -> None:
+        """Save a new time tracker, or defer the write.
+
+        Args:
+            time_tracker (TimeTracker): The time tracker instance to save.
+        """
+        if self.timer_events is None:
+            self.db.save_time_tracker(time_tracker)
+        else:
+            # Queue a snapshot, the registry keeps mutating the tracker.
+            self.timer_events.put(
+                TimerEvent(
+                    "save", time_tracker.task_id, time_tracker.model_copy()
+                )
+            )
+
+    def _update_time_tracker(self, time_tracker: TimeTracker) -> None:
+        """Update a time tracker, or defer the write.
+
+        Args:
+            time_tracker (TimeTracker): The time tracker instance to update.
+        """
+        if self.timer_events is None:
+            self.db.update_time_tracker(time_tracker)
+        else:
+            self.timer_events.put(
+                TimerEvent(
+                    "update", time_tracker.task_id, time_tracker.model_copy()
+                )
+            )
+
+    @staticmethod
+    def _anchor_segment(
+        time_tracker: TimeTracker, reading: ClockReading
+    ) -> None:
+        """Start the running segment of a time tracker at a clock reading.
+
+        Args:
+            time_tracker (TimeTracker): The time tracker instance.
+            reading (ClockReading): The clock reading the segment starts at.
+        """
+        time_tracker.segment_start = reading.wall
+        time_tracker.segment_start_ns = reading.monotonic_ns
+        time_tracker.clock_id = reading.clock_id
+
+    def _open_segment(
+        self, time_tracker: TimeTracker, reading: ClockReading
+    ) -> None:
+        """Open a segment of a time tracker, or defer the write.
+
+        Args:
+            time_tracker (TimeTracker): The time tracker instance.
+            reading (ClockReading): The clock reading the segment starts at.
+        """
+        self._anchor_segment(time_tracker, reading)
+        if self.timer_events is None:
+            if time_tracker.id is not None:
+                self.db.open_segment(time_tracker.id, reading.wall)
+        else:
+            self.timer_events.put(
+                TimerEvent(
+                    "open_segment",
+                    time_tracker.task_id,
+                    time_tracker.model_copy(),
+                    at=reading.wall,
+                )
+            )
+
+    def _close_segment(
+        self, time_tracker: TimeTracker, reading: ClockReading
+    ) -> datetime:
+        """Close the running segment of a time tracker and add its time.
+
+        The segment time comes from the monotonic clock while the process
+        that opened the segment is running, so wall clock adjustments do
+        not skew it. They are counted on the tracker instead.
+
+        Args:
+            time_tracker (TimeTracker): The time tracker instance.
+            reading (ClockReading): The clock reading the segment ends at.
+
+        Returns:
+            datetime: The end of the segment, its start plus its time.
+        """
+        at = reading.wall
+        if time_tracker.segment_start:
+            elapsed = measure_elapsed(
+                time_tracker.segment_start,
+                time_tracker.segment_start_ns,
+                time_tracker.clock_id,
+                reading,
+            )
+            at = advance(time_tracker.segment_start, elapsed.seconds)
+            time_tracker.total_time += elapsed.seconds
+            if elapsed.clock_jumped:
+                time_tracker.clock_jumps += 1
+                time_tracker.clock_skew += abs(elapsed.skew)
+            time_tracker.segment_start = None
+            time_tracker.segment_start_ns = None
+            time_tracker.clock_id = None
+        if self.timer_events is None:
+            if time_tracker.id is not None:
+                self.db.close_segment(time_tracker.id, at)
+        else:
+            self.timer_events.put(
+                TimerEvent(
+                    "close_segment",
+                    time_tracker.task_id,
+                    time_tracker.model_copy(),
+                    at=at,
+                )
+            )
+        return at
+
+    def _update_task_status(self, task_id: int, status: str) -> None:
+        """Update a task status, or defer the write.
+
+        Args:
+            task_id (int): The task ID.
+            status (str): The new status of the task.
+        """
+        if self.timer_events is None:
+            self.task_service.update_task_status(task_id, status)
+        else:
+            self.timer_events.put(TimerEvent("status", task_id, status=status))
+            self._task_statuses[task_id] = status
+            self.task_service.invalidate_task(task_id)
+
+    def _flush_pending(self) -> None:
+        """Commit deferred writes so that the next read sees them."""
+        if self.timer_events is not None and self.timer_events.pending():
+            self.flush()
+
+    @contextmanager
+    def _atomic(self) -> Iterator[None]:
+        """Run a unit of work, unloading the registry when it fails.
+
+        A failed unit of work may leave the registry ahead of the database,
+        so timer lookups fall back to the database until the next load, and
+        the task statuses it wrote are forgotten.
+
+        Yields:
+            Iterator[None]: Nothing.
+        """
+        task_statuses = dict(self._task_statuses)
+        try:
+            with self.unit_of_work():
+                yield
+        except BaseException:
+            self.registry.clear()
+            self._task_statuses = task_statuses
+            raise
+
+    def load_timers(self, user_id: int) -> int:
+        """Load the open time trackers of a user into the registry.
+
+        Args:
+            user_id (int): The user ID.
+
+        Returns:
+            int: The number of tasks with an open time tracker.
+        """
+        self._flush_pending()
+        self.registry.load(
+            user_id, self.db.get_open_time_trackers_by_user(user_id)
+        )
+        return len(self.registry)
+
+    def unload_timers(self) -> None:
+        """Empty the registry, for instance when the user logs out."""
+        self.registry.clear()
+        self._task_statuses.clear()
+
+    def check_timer(self, task_id: int) -> Optional[TimeTracker]:
+        """Refresh the registry entry of a task from the database.
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Optional[TimeTracker]: The open time tracker of the task.
+        """
+        self._flush_pending()
+        time_tracker = self.db.get_active_time_tracker(task_id)
+        if time_tracker is None:
+            self.registry.remove(task_id)
+        else:
+            self.registry.put(time_tracker)
+        return time_tracker
+
+    def _open_tracker(self, task_id: int) -> Optional[TimeTracker]:
+        """Return the active or paused time tracker of a task.
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Optional[TimeTracker]: The open time tracker, from the registry
+            when it is loaded.
+        """
+        if self.registry.loaded:
+            return self.registry.get(task_id)
+        self._flush_pending()
+        return self.db.get_active_time_tracker(task_id)
+
+    def _paused_tracker(self, task_id: int) -> Optional[TimeTracker]:
+        """Return the paused time tracker of a task.
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Optional[TimeTracker]: The paused time tracker, from the registry
+            when it is loaded.
+        """
+        if self.registry.loaded:
+            time_tracker = self.registry.get(task_id)
+            if time_tracker and time_tracker.status == "Paused":
+                return time_tracker
+            return None
+        self._flush_pending()
+        return self.db.get_last_paused_time_tracker(task_id)
+
+    def start_task(
+        self, task_id: int, category: str, user_id: int
+    ) -> TimeTracker:
+        """Start the timer of a task and mark it in progress atomically.
+
+        Args:
+            task_id (int): The task ID.
+            category (str): The task category.
+            user_id (int): The ID of the user owning the task.
+
+        Returns:
+            TimeTracker: The time tracker instance.
+        """
+        with self._atomic():
+            time_tracker = self.start_timer(task_id, category, user_id)
+            self._update_task_status(task_id, "In Progress")
+        return time_tracker
+
+    def pause_task(self, task_id: int) -> Optional[TimeTracker]:
+        """Pause the timer of a task and mark it paused atomically.
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Optional[TimeTracker]: The time tracker instance, or None when
+            the task has no active timer and nothing was changed.
+        """
+        with self._atomic():
+            time_tracker = self.pause_timer(task_id)
+            if time_tracker:
+                self._update_task_status(task_id, "Paused")
+        return time_tracker
+
+    def resume_task(
+        self, task_id: int, category: str, user_id: int
+    ) -> Optional[TimeTracker]:
+        """Resume the timer of a task and mark it in progress atomically.
+
+        Args:
+            task_id (int): The task ID.
+            category (str): The task category.
+            user_id (int): The ID of the user owning the task.
+
+        Returns:
+            Optional[TimeTracker]: The time tracker instance, or None when
+            the task has no paused timer and nothing was changed.
+        """
+        with self._atomic():
+            time_tracker = self.resume_timer(task_id, category, user_id)
+            if time_tracker:
+                self._update_task_status(task_id, "In Progress")
+        return time_tracker
+
+    def stop_task(self, task_id: int) -> Optional[TimeTracker]:
+        """Stop the timer of a task and mark it completed atomically.
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Optional[TimeTracker]: The time tracker instance, or None when
+            the task has no active timer and nothing was changed.
+        """
+        with self._atomic():
+            time_tracker = self.stop_timer(task_id)
+            if time_tracker:
+                self._update_task_status(task_id, "Completed")
+        return time_tracker
 
     def get_active_time_tracker(self, task_id: int) -> Optional[TimeTracker]:
         """Retrieve the active time tracker for a task.
@@ -35,27 +416,36 @@ class TimeTrackerService:
         Returns:
             Optional[TimeTracker]: The active time tracker instance.
         """
-        return self.db.get_active_time_tracker(task_id)
+        return self._open_tracker(task_id)
 
-    def start_timer(self, task_id: int, category: str) -> TimeTracker:
-        """Start the timer for a task.
+    def start_timer(
+        self, task_id: int, category: str, user_id: int
+    ) -> TimeTracker:
+        """Start a new session for a task with its first segment.
 
         Args:
             task_id (int): The task ID.
             category (str): The task category.
+            user_id (int): The ID of the user owning the task.
 
         Returns:
             TimeTracker: The time tracker instance.
         """
         time_tracker = TimeTracker.create(
-            task_id=task_id, status="In Progress", category=category
+            task_id=task_id,
+            status="In Progress",
+            category=category,
+            user_id=user_id,
         )
-        time_tracker.start_time = datetime.now()
-        self.db.save_time_tracker(time_tracker)
+        reading = read_clock()
+        time_tracker.start_time = reading.wall
+        self._anchor_segment(time_tracker, reading)
+        self._save_time_tracker(time_tracker)
+        self.registry.put(time_tracker)
         return time_tracker
 
     def pause_timer(self, task_id: int) -> Optional[TimeTracker]:
-        """Pause the timer for a task.
+        """Pause the session of a task, closing its running segment.
 
         Args:
             task_id (int): The task ID.
@@ -63,47 +453,49 @@ class TimeTrackerService:
         Returns:
             Optional[TimeTracker]: The time tracker instance.
         """
-        active_tracker = self.db.get_active_time_tracker(task_id)
+        active_tracker = self._open_tracker(task_id)
         if (
             active_tracker
-            and active_tracker.start_time
-            and not active_tracker.stop_time
+            and active_tracker.status == "In Progress"
+            and active_tracker.segment_start
         ):
-            active_tracker.stop_time = datetime.now()
+            active_tracker.stop_time = self._close_segment(
+                active_tracker, read_clock()
+            )
             active_tracker.status = "Paused"
-            # Calculate total time so far
-            elapsed_time = (
-                active_tracker.stop_time - active_tracker.start_time
-            ).total_seconds()
-            active_tracker.total_time = elapsed_time
-            self.db.save_time_tracker(active_tracker)
+            self._update_time_tracker(active_tracker)
+            self.registry.put(active_tracker)
             return active_tracker
         return None
 
     def resume_timer(
-        self, task_id: int, category: str
+        self, task_id: int, category: str, user_id: int
     ) -> Optional[TimeTracker]:
-        """Resume the timer for a task.
+        """Resume the paused session of a task with a new segment.
 
         Args:
             task_id (int): The task ID.
             category (str): The task category.
+            user_id (int): The ID of the user owning the task.
 
         Returns:
             Optional[TimeTracker]: The time tracker instance.
         """
-        paused_tracker = self.db.get_last_paused_time_tracker(task_id)
+        paused_tracker = self._paused_tracker(task_id)
         if paused_tracker:
-            time_tracker = TimeTracker.create(
-                task_id=task_id, status="In Progress", category=category
-            )
-            time_tracker.start_time = datetime.now()
-            self.db.save_time_tracker(time_tracker)
-            return time_tracker
+            paused_tracker.status = "In Progress"
+            paused_tracker.stop_time = None
+            self._open_segment(paused_tracker, read_clock())
+            self._update_time_tracker(paused_tracker)
+            self.registry.put(paused_tracker)
+            return paused_tracker
         return None
 
     def stop_timer(self, task_id: int) -> Optional[TimeTracker]:
-        """Stop the timer for a task and calculate the total time.
+        """Complete the session of a task and return its total time.
+
+        A running segment is closed first. A paused session keeps the
+        time it was paused at as its stop time.
 
         Args:
             task_id (int): The task ID.
@@ -111,15 +503,14 @@ class TimeTrackerService:
         Returns:
             Optional[TimeTracker]: The time tracker instance.
         """
-        active_tracker = self.db.get_active_time_tracker(task_id)
+        active_tracker = self._open_tracker(task_id)
         if active_tracker and active_tracker.start_time:
-            active_tracker.stop_time = datetime.now()
+            if active_tracker.segment_start:
+                active_tracker.stop_time = self._close_segment(
+                    active_tracker, read_clock()
+                )
             active_tracker.status = "Completed"
-            # Calculate total time
-            elapsed_time = (
-                active_tracker.stop_time - active_tracker.start_time
-            ).total_seconds()
-            active_tracker.total_time = elapsed_time
-            self.db.save_time_tracker(active_tracker)
+            self._update_time_tracker(active_tracker)
+            self.registry.remove(task_id)
             return active_tracker
         return None
@@ -0,0 +1,375 @@
+"""
+Handle Timer Journal.
+
+This module contains the TimerJournal class, which appends the timer writes
+of the Time Tracker Console Application to a checksummed, append-only
+journal file instead of updating the database right away.
+Each line holds a CRC-32 checksum and a JSON record of the events written
+together. A torn or corrupt tail left by a crash is cut off when the journal
+is opened, and the events not yet in the database are replayed.
+Appending a record touches the journal file only; task statuses reach the
+database with the rest of the record when the journal is compacted.
+The compactor materializes the journal into the SQLite tables, records every
+event in the timer_events audit trail and empties the journal file.
+"""
+
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from src.data_loader.row_mappers import parse_timestamp
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.time_tracker import TimeTracker
+from src.services.write_behind import TimerEvent, apply_timer_event
+from src.utils.timestamps import to_epoch_us
+
+DEFAULT_JOURNAL_PATH = "src/database/timer_events.journal"
+JOURNAL_COMPACT_THRESHOLD = 64
+
+
+def encode_record(events: List[Dict[str, Any]]) -> bytes:
+    """Encode events as a checksummed journal line.
+
+    Args:
+        events (List[Dict[str, Any]]): The serialized events.
+
+    Returns:
+        bytes: The journal line, ending with a newline.
+    """
+    payload = json.dumps({"events": events}, separators=(",", ":")).encode()
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def decode_record(line: bytes) -> Optional[List[Dict[str, Any]]]:
+    """Decode a journal line, checking its checksum.
+
+    Args:
+        line (bytes): The journal line.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: The serialized events, or None for a
+        torn or corrupt line.
+    """
+    if not line.endswith(b"\n"):
+        return None
+    checksum, _, payload = line.rstrip(b"\n").partition(b" ")
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        events = json.loads(payload)["events"]
+    except (KeyError, TypeError, ValueError):
+        return None
+    return events if isinstance(events, list) else None
+
+
+def serialize_event(
+    event: TimerEvent, sequence: int, recorded_at: int
+) -> Dict[str, Any]:
+    """Serialize a timer event for the journal.
+
+    Args:
+        event (TimerEvent): The timer event.
+        sequence (int): The sequence number of the event.
+        recorded_at (int): The epoch microseconds the event was recorded at.
+
+    Returns:
+        Dict[str, Any]: The serialized event.
+    """
+    tracker = event.time_tracker
+    return {
+        "sequence": sequence,
+        "recorded_at": recorded_at,
+        "kind": event.kind,
+        "task_id": event.task_id,
+        "status": event.status,
+        "at": to_epoch_us(event.at) if event.at else None,
+        "tracker": None
+        if tracker is None
+        else {
+            "id": tracker.id,
+            "task_id": tracker.task_id,
+            "user_id": tracker.user_id,
+            "category": tracker.category,
+            "start_time": to_epoch_us(tracker.start_time)
+            if tracker.start_time
+            else None,
+            "stop_time": to_epoch_us(tracker.stop_time)
+            if tracker.stop_time
+            else None,
+            "status": tracker.status,
+            "total_time": tracker.total_time,
+            "segment_start": to_epoch_us(tracker.segment_start)
+            if tracker.segment_start
+            else None,
+            "segment_start_ns": tracker.segment_start_ns,
+            "clock_id": tracker.clock_id,
+            "clock_jumps": tracker.clock_jumps,
+            "clock_skew": tracker.clock_skew,
+        },
+    }
+
+
+def deserialize_event(fields: Dict[str, Any]) -> TimerEvent:
+    """Rebuild a timer event from its journal fields.
+
+    Args:
+        fields (Dict[str, Any]): The serialized event.
+
+    Returns:
+        TimerEvent: The timer event.
+    """
+    tracker = fields["tracker"]
+    return TimerEvent(
+        kind=fields["kind"],
+        task_id=fields["task_id"],
+        time_tracker=None
+        if tracker is None
+        else TimeTracker.model_construct(
+            **{
+                **tracker,
+                "start_time": parse_timestamp(tracker["start_time"]),
+                "stop_time": parse_timestamp(tracker["stop_time"]),
+                "segment_start": parse_timestamp(
+                    tracker.get("segment_start")
+                ),
+            }
+        ),
+        status=fields["status"],
+        at=parse_timestamp(fields.get("at")),
+    )
+
+
+class TimerJournal:
+    """Append-only journal of timer writes with compaction and replay."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_JOURNAL_PATH,
+        engine: Optional[StorageEngine] = None,
+        sync: bool = True,
+        compact_threshold: int = JOURNAL_COMPACT_THRESHOLD,
+        on_commit: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Open the journal, repair its tail and replay pending events.
+
+        Args:
+            path (str, optional): The path of the journal file. Defaults to
+            DEFAULT_JOURNAL_PATH.
+            engine (Optional[StorageEngine], optional): The storage engine of
+            the database the journal is compacted into. Defaults to the
+            shared storage engine.
+            sync (bool, optional): Whether every append is flushed to disk
+            with fsync. Defaults to True.
+            compact_threshold (int, optional): The number of pending events
+            that triggers a compaction. Defaults to JOURNAL_COMPACT_THRESHOLD.
+            on_commit (Optional[Callable[[int], None]], optional): Called
+            with the ID of every task whose status was materialized, for
+            instance to invalidate a task cache. Defaults to None.
+        """
+        self.path = path
+        self.sync = sync
+        self.compact_threshold = compact_threshold
+        self.on_commit = on_commit
+        self.engine = engine if engine is not None else get_storage_engine()
+        self.time_tracker_db = TimeTrackerDatabase(self.engine)
+        self.task_db = TaskDatabase(self.engine)
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        records, valid_size = self._read_records()
+        with open(path, "ab") as file:
+            file.truncate(valid_size)
+        self._pending = sum(len(events) for events in records)
+        last_sequence = max(
+            [event["sequence"] for events in records for event in events]
+            or [0]
+        )
+        self._sequence = max(
+            last_sequence, self.time_tracker_db.get_last_timer_event_sequence()
+        )
+        self._file = open(path, "ab")
+        self.replay()
+
+    @contextmanager
+    def group(self) -> Iterator[None]:
+        """Append the events put inside the block as a single record.
+
+        A record is either replayed whole or, when torn by a crash, not at
+        all. Groups can be nested, the outermost one appends the record.
+
+        Yields:
+            Iterator[None]: Nothing.
+        """
+        buffer: Optional[List[TimerEvent]] = getattr(
+            self._local, "buffer", None
+        )
+        if buffer is not None:
+            yield
+            return
+        self._local.buffer = []
+        try:
+            yield
+            events = self._local.buffer
+        finally:
+            self._local.buffer = None
+        if events:
+            self._append(events)
+            self._compact_if_due()
+
+    def put(self, *events: TimerEvent) -> None:
+        """Append events to the journal as a single record.
+
+        Inside a group the events are added to the group record instead.
+
+        Args:
+            *events (TimerEvent): The events to append.
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            buffer.extend(events)
+        elif events:
+            self._append(list(events))
+            self._compact_if_due()
+
+    def pending(self) -> int:
+        """Return the number of events not yet compacted.
+
+        Returns:
+            int: The number of events only stored in the journal.
+        """
+        with self._lock:
+            return self._pending
+
+    def flush(self) -> int:
+        """Compact the journal into the database.
+
+        Returns:
+            int: The number of events materialized.
+        """
+        return self.compact()
+
+    def replay(self) -> int:
+        """Recover the events a crash left only in the journal.
+
+        Returns:
+            int: The number of events materialized.
+        """
+        return self.compact()
+
+    def compact(self) -> int:
+        """Materialize the journal into the database and empty it.
+
+        Events already recorded in timer_events are skipped, so a crash
+        between the database commit and the truncation of the journal does
+        not apply any event twice.
+
+        Returns:
+            int: The number of events materialized.
+        """
+        with self._lock:
+            records, _ = self._read_records()
+            applied = self.time_tracker_db.get_last_timer_event_sequence()
+            events = [
+                event
+                for record in records
+                for event in record
+                if event["sequence"] > applied
+            ]
+            if events:
+                with self.engine.transaction():
+                    for fields in events:
+                        apply_timer_event(
+                            deserialize_event(fields),
+                            self.time_tracker_db,
+                            self.task_db,
+                        )
+                    self.time_tracker_db.save_timer_events(
+                        (
+                            fields["sequence"],
+                            fields["task_id"],
+                            fields["kind"],
+                            fields["status"],
+                            fields["recorded_at"],
+                        )
+                        for fields in events
+                    )
+            self._file.truncate(0)
+            self._pending = 0
+        if self.on_commit:
+            for task_id in dict.fromkeys(
+                fields["task_id"]
+                for fields in events
+                if fields["kind"] == "status"
+            ):
+                self.on_commit(task_id)
+        return len(events)
+
+    def close(self) -> None:
+        """Compact the journal and close the journal file."""
+        self.compact()
+        self._file.close()
+
+    def _compact_if_due(self) -> None:
+        """Compact the journal once enough events are pending."""
+        if self.pending() >= self.compact_threshold:
+            self.compact()
+
+    def _append(self, events: List[TimerEvent]) -> None:
+        """Append a record to the journal file.
+
+        Args:
+            events (List[TimerEvent]): The events of the record.
+        """
+        with self._lock:
+            recorded_at = to_epoch_us(datetime.now())
+            serialized = []
+            for event in events:
+                self._sequence += 1
+                serialized.append(
+                    serialize_event(event, self._sequence, recorded_at)
+                )
+            self._file.write(encode_record(serialized))
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._pending += len(events)
+
+    def _read_records(self) -> Tuple[List[List[Dict[str, Any]]], int]:
+        """Read the valid records of the journal file.
+
+        Reading stops at the first torn or corrupt line, since nothing
+        after it can be trusted.
+
+        Returns:
+            Tuple[List[List[Dict[str, Any]]], int]: The serialized events of
+            each record, and the size of the valid part of the file.
+        """
+        records: List[List[Dict[str, Any]]] = []
+        valid_size = 0
+        try:
+            with open(self.path, "rb") as file:
+                for line in file:
+                    events = decode_record(line)
+                    if events is None:
+                        break
+                    records.append(events)
+                    valid_size += len(line)
+        except FileNotFoundError:
+            pass
+        return records, valid_size
@@ -0,0 +1,80 @@
+"""
+Handle Timer Registry.
+
+This module contains the TimerRegistry class, which keeps the active and
+paused time trackers of the logged in user of the Time Tracker Console
+Application in memory, keyed by task ID.
+"""
+
+from typing import Dict, Iterable, Optional
+
+from src.models.time_tracker import TimeTracker
+
+
+class TimerRegistry:
+    """In-memory registry of the open time trackers of a user.
+
+    The registry is loaded from the database once, at login, and is then
+    kept current by the time tracker service's own writes. While loaded it
+    is authoritative: a task without an entry has no open time tracker.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, unloaded registry."""
+        self.user_id: Optional[int] = None
+        self._trackers: Dict[int, TimeTracker] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """Return whether the registry holds the open trackers of a user."""
+        return self.user_id is not None
+
+    def load(self, user_id: int, time_trackers: Iterable[TimeTracker]) -> None:
+        """Replace the registry content with the open trackers of a user.
+
+        Args:
+            user_id (int): The user ID.
+            time_trackers (Iterable[TimeTracker]): The open time trackers of
+            the user, the latest of each task last.
+        """
+        self._trackers = {
+            tracker.task_id: tracker for tracker in time_trackers
+        }
+        self.user_id = user_id
+
+    def clear(self) -> None:
+        """Empty the registry and mark it unloaded."""
+        self._trackers = {}
+        self.user_id = None
+
+    def get(self, task_id: int) -> Optional[TimeTracker]:
+        """Return the open time tracker of a task.
+
+        Args:
+            task_id (int): The task ID.
+
+        Returns:
+            Optional[TimeTracker]: The active or paused time tracker, or None.
+        """
+        return self._trackers.get(task_id)
+
+    def put(self, time_tracker: TimeTracker) -> None:
+        """Record the open time tracker of a task.
+
+        Args:
+            time_tracker (TimeTracker): The active or paused time tracker.
+        """
+        if self.loaded:
+            self._trackers[time_tracker.task_id] = time_tracker
+
+    def remove(self, task_id: int) -> None:
+        """Forget the open time tracker of a task once it is completed.
+
+        Args:
+            task_id (int): The task ID.
+        """
+        self._trackers.pop(task_id, None)
+
+    def __len__(self) -> int:
+        """Return the number of open time trackers."""
+        return len(self._trackers)
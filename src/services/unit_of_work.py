@@ -0,0 +1,64 @@
+"""
+Handle Unit of Work.
+
+This module contains the UnitOfWork class, which groups the writes of several
+services into a single atomic transaction of the Time Tracker Console
+Application.
+"""
+
+from types import TracebackType
+from typing import ContextManager, Optional, Type
+
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
+
+
+class UnitOfWork:
+    """Context manager committing a group of writes at once.
+
+    Every repository built on the same storage engine joins the unit of
+    work, so a timer mutation and a task status change are either both
+    committed with a single commit or both rolled back.
+    Units of work can be nested, the outermost one commits.
+    """
+
+    def __init__(self, engine: Optional[StorageEngine] = None) -> None:
+        """Initialize the unit of work with a storage engine.
+
+        Args:
+            engine (Optional[StorageEngine], optional): The storage engine
+            owning the database. Defaults to the shared storage engine.
+        """
+        self.engine = engine if engine is not None else get_storage_engine()
+        self._transaction: Optional[ContextManager] = None
+
+    def __enter__(self) -> "UnitOfWork":
+        """Begin the transaction.
+
+        Returns:
+            UnitOfWork: The unit of work.
+        """
+        self._transaction = self.engine.transaction()
+        self._transaction.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> Optional[bool]:
+        """Commit the transaction, or roll it back when an error occurred.
+
+        Args:
+            exc_type (Optional[Type[BaseException]]): The exception type.
+            exc_value (Optional[BaseException]): The exception raised.
+            traceback (Optional[TracebackType]): The exception traceback.
+
+        Returns:
+            Optional[bool]: Whether the exception was suppressed.
+        """
+        transaction = self._transaction
+        self._transaction = None
+        if transaction is None:
+            return None
+        return transaction.__exit__(exc_type, exc_value, traceback)
@@ -0,0 +1,324 @@
+"""
+Handle Write-Behind Queue.
+
+This module contains the WriteBehindQueue class, which collects timer writes
+of the Time Tracker Console Application in memory and commits them in groups
+from a background thread.
+A group is committed once it holds max_batch events or once the oldest event
+has waited flush_interval seconds, which bounds the writes lost on a crash.
+A group that keeps failing is written one event at a time, and the events
+that still fail are set aside as dead letters so that they do not block the
+queue.
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+from src.data_loader.storage_engine import StorageEngine, get_storage_engine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.time_tracker import TimeTracker
+
+WRITE_BEHIND_BATCH_SIZE = 100
+WRITE_BEHIND_INTERVAL_SECONDS = 1.0
+WRITE_BEHIND_MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class TimerEvent(NamedTuple):
+    """Represent a queued timer write."""
+
+    # "save", "update", "open_segment", "close_segment" or "status"
+    kind: str
+    task_id: int
+    time_tracker: Optional[TimeTracker] = None
+    status: Optional[str] = None
+    # The start or end of the segment opened or closed.
+    at: Optional[datetime] = None
+
+
+def apply_timer_event(
+    event: TimerEvent,
+    time_tracker_db: TimeTrackerDatabase,
+    task_db: TaskDatabase,
+) -> None:
+    """Write a timer event through the repositories.
+
+    A session started with deferred writes has no ID until its save event
+    is written, so its later events are keyed by task and written to the
+    open session of the task.
+
+    Args:
+        event (TimerEvent): The event to write.
+        time_tracker_db (TimeTrackerDatabase): The time tracker database.
+        task_db (TaskDatabase): The task database.
+    """
+    tracker = event.time_tracker
+    if tracker and tracker.id is None and event.kind != "save":
+        open_tracker = time_tracker_db.get_active_time_tracker(event.task_id)
+        if open_tracker is not None:
+            event = event._replace(
+                time_tracker=tracker.model_copy(
+                    update={"id": open_tracker.id}
+                )
+            )
+    if event.kind == "save" and event.time_tracker:
+        time_tracker_db.save_time_tracker(event.time_tracker)
+    elif event.kind == "update" and event.time_tracker:
+        time_tracker_db.update_time_tracker(event.time_tracker)
+    elif event.kind == "open_segment" and event.time_tracker and event.at:
+        if event.time_tracker.id is not None:
+            time_tracker_db.open_segment(event.time_tracker.id, event.at)
+    elif event.kind == "close_segment" and event.time_tracker and event.at:
+        if event.time_tracker.id is not None:
+            time_tracker_db.close_segment(event.time_tracker.id, event.at)
+    elif event.kind == "status" and event.status:
+        task_db.update_task_status(event.task_id, event.status)
+
+
+class WriteBehindQueue:
+    """Queue committing timer writes in groups from a background thread."""
+
+    def __init__(
+        self,
+        engine: Optional[StorageEngine] = None,
+        max_batch: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_interval: float = WRITE_BEHIND_INTERVAL_SECONDS,
+        on_commit: Optional[Callable[[int], None]] = None,
+        max_attempts: int = WRITE_BEHIND_MAX_ATTEMPTS,
+    ) -> None:
+        """Initialize the queue with its own connection to the database.
+
+        Args:
+            engine (Optional[StorageEngine], optional): The storage engine
+            of the database written to. Defaults to the shared storage
+            engine.
+            max_batch (int, optional): The number of queued events that
+            triggers a flush. Defaults to WRITE_BEHIND_BATCH_SIZE.
+            flush_interval (float, optional): The longest time in seconds an
+            event waits before it is flushed. Defaults to
+            WRITE_BEHIND_INTERVAL_SECONDS.
+            on_commit (Optional[Callable[[int], None]], optional): Called
+            with the ID of every task whose status was committed, for
+            instance to invalidate a task cache. It runs on the thread that
+            flushed the events. Defaults to None.
+            max_attempts (int, optional): The number of times a group is
+            written before its failing events are dead-lettered. Defaults to
+            WRITE_BEHIND_MAX_ATTEMPTS.
+        """
+        db_path = (engine or get_storage_engine()).db_path
+        self.engine = StorageEngine(db_path, check_same_thread=False)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.on_commit = on_commit
+        self.max_attempts = max_attempts
+        self.time_tracker_db = TimeTrackerDatabase(self.engine)
+        self.task_db = TaskDatabase(self.engine)
+        self._events: List[TimerEvent] = []
+        self._condition = threading.Condition()
+        # Held while a group is written, and by callers queueing events that
+        # must be committed together.
+        self._group_lock = threading.RLock()
+        self._failed_attempts = 0
+        self._dead_letters: List[TimerEvent] = []
+        self._reported_dead_letters = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background flusher thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def group(self) -> threading.RLock:
+        """Return the lock keeping queued events in the same group.
+
+        Events queued while the lock is held are committed in the same
+        transaction.
+
+        Returns:
+            threading.RLock: The group lock, to be used as a context manager.
+        """
+        return self._group_lock
+
+    def put(self, *events: TimerEvent) -> None:
+        """Queue events to be committed together.
+
+        Args:
+            *events (TimerEvent): The events to queue.
+        """
+        with self._condition:
+            self._events.extend(events)
+            if len(self._events) >= self.max_batch:
+                self._condition.notify()
+
+    def pending(self) -> int:
+        """Return the number of queued events.
+
+        Returns:
+            int: The number of events not yet committed.
+        """
+        with self._condition:
+            return len(self._events)
+
+    def dead_letters(self) -> List[TimerEvent]:
+        """Return the events that could not be written.
+
+        Returns:
+            List[TimerEvent]: The dead-lettered events, oldest first.
+        """
+        with self._condition:
+            return list(self._dead_letters)
+
+    def flush(self) -> int:
+        """Commit every queued event in a single transaction.
+
+        Raises:
+            Exception: When an error occurs while writing the events, or when
+            events were dead-lettered since the last flush. Events that fail
+            are queued again so that a later flush retries them, until the
+            group has failed max_attempts times.
+
+        Returns:
+            int: The number of events committed.
+        """
+        committed = self._flush()
+        self._report_dead_letters()
+        return committed
+
+    def close(self) -> None:
+        """Stop the background flusher and flush the remaining events.
+
+        Raises:
+            Exception: When the remaining events cannot be written, or when
+            events were dead-lettered since the last flush.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        finally:
+            self.engine.close()
+
+    def _flush(self) -> int:
+        """Commit every queued event, dead-lettering the poison ones.
+
+        Raises:
+            Exception: When an error occurs while writing the events.
+
+        Returns:
+            int: The number of events committed.
+        """
+        with self._group_lock:
+            with self._condition:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+            try:
+                committed = self._write(events)
+            except Exception:
+                with self._condition:
+                    self._events[:0] = events
+                raise
+        if self.on_commit:
+            for task_id in dict.fromkeys(
+                event.task_id for event in committed if event.kind == "status"
+            ):
+                self.on_commit(task_id)
+        return len(committed)
+
+    def _write(self, events: List[TimerEvent]) -> List[TimerEvent]:
+        """Write a group of events in a single transaction.
+
+        Once the group has failed max_attempts times, every event is
+        written under its own savepoint, and the events that fail are
+        dead-lettered while the others are committed.
+
+        Args:
+            events (List[TimerEvent]): The events to write.
+
+        Raises:
+            Exception: When an error occurs while writing the events.
+
+        Returns:
+            List[TimerEvent]: The events committed.
+        """
+        if self._failed_attempts < self.max_attempts:
+            try:
+                with self.engine.transaction():
+                    for event in events:
+                        apply_timer_event(
+                            event, self.time_tracker_db, self.task_db
+                        )
+            except Exception:
+                self._failed_attempts += 1
+                raise
+            self._failed_attempts = 0
+            return events
+        committed = []
+        dead_letters = []
+        with self.engine.transaction() as conn:
+            for event in events:
+                conn.execute("SAVEPOINT timer_event")
+                try:
+                    apply_timer_event(
+                        event, self.time_tracker_db, self.task_db
+                    )
+                except Exception as e:
+                    conn.execute("ROLLBACK TO timer_event")
+                    logger.error("Dead-lettered timer event %r: %s", event, e)
+                    dead_letters.append(event)
+                else:
+                    committed.append(event)
+                conn.execute("RELEASE timer_event")
+        self._failed_attempts = 0
+        with self._condition:
+            self._dead_letters.extend(dead_letters)
+        return committed
+
+    def _report_dead_letters(self) -> None:
+        """Raise once for the events dead-lettered since the last report.
+
+        Raises:
+            Exception: When events were dead-lettered since the last report.
+        """
+        with self._condition:
+            unreported = len(self._dead_letters) - self._reported_dead_letters
+            self._reported_dead_letters = len(self._dead_letters)
+        if unreported:
+            raise Exception(
+                f"Error writing timer events: {unreported} events could not "
+                "be written and were dead-lettered."
+            )
+
+    def _run(self) -> None:
+        """Flush queued events on the size or time threshold until closed.
+
+        Errors are logged, and the events stay queued for the next flush.
+        Dead letters are reported by the next flush of the caller.
+        """
+        while True:
+            with self._condition:
+                if not self._closed and len(self._events) < self.max_batch:
+                    self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(
+                    "Error writing timer events, attempt %d of %d: %s",
+                    self._failed_attempts,
+                    self.max_attempts,
+                    e,
+                )
@@ -0,0 +1,126 @@
+"""
+clock.py module.
+
+This module measures elapsed time for the time trackers of the Time Tracker
+Console Application.
+A clock reading pairs the wall clock with a monotonic clock: elapsed time is
+taken from the monotonic clock when both readings come from the same
+process, and from the wall clock only across restarts.
+The difference between the two clocks reveals wall clock adjustments, such
+as NTP steps or a manually changed system time.
+The monotonic clock is CLOCK_BOOTTIME where the platform has it, which keeps
+counting while the system is suspended. Elsewhere it is
+time.perf_counter_ns(), which may stop during a suspend, so a wall clock
+running ahead of it is counted as elapsed time.
+"""
+
+import time
+import uuid
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from src.utils.timestamps import from_epoch_us, to_epoch_us
+
+# Identifies the monotonic clock of this process, whose origin is undefined
+# and only meaningful within the process.
+PROCESS_CLOCK_ID = uuid.uuid4().hex
+# The difference between the wall clock and the monotonic clock, in seconds,
+# above which the wall clock is considered adjusted.
+CLOCK_JUMP_TOLERANCE_SECONDS = 2.0
+# Whether the monotonic clock keeps counting while the system is suspended.
+MONOTONIC_COUNTS_SUSPEND = hasattr(time, "CLOCK_BOOTTIME")
+
+
+class ClockReading(NamedTuple):
+    """Represent simultaneous readings of the wall and monotonic clocks."""
+
+    wall: datetime
+    monotonic_ns: int
+    clock_id: str = PROCESS_CLOCK_ID
+
+
+class Elapsed(NamedTuple):
+    """Represent the time elapsed between two clock readings."""
+
+    # The elapsed time, in seconds, never negative.
+    seconds: float
+    # How far the wall clock moved beyond the elapsed time, in seconds.
+    skew: float
+
+    @property
+    def clock_jumped(self) -> bool:
+        """Return whether the wall clock was adjusted in between."""
+        return abs(self.skew) > CLOCK_JUMP_TOLERANCE_SECONDS
+
+
+def monotonic_ns() -> int:
+    """Read the monotonic clock.
+
+    Returns:
+        int: The monotonic time in nanoseconds, from an undefined origin.
+    """
+    if MONOTONIC_COUNTS_SUSPEND:
+        return time.clock_gettime_ns(time.CLOCK_BOOTTIME)
+    return time.perf_counter_ns()
+
+
+def read_clock() -> ClockReading:
+    """Read the wall clock and the monotonic clock.
+
+    Returns:
+        ClockReading: The clock reading.
+    """
+    return ClockReading(datetime.now(), monotonic_ns())
+
+
+def measure_elapsed(
+    start: datetime,
+    start_ns: Optional[int],
+    clock_id: Optional[str],
+    end: ClockReading,
+) -> Elapsed:
+    """Measure the time elapsed since a start reading.
+
+    Wall clock times are compared in UTC, so daylight saving time changes
+    do not count as elapsed time. When the monotonic clock stops during a
+    suspend, a wall clock running ahead of it by more than the tolerance is
+    taken as the elapsed time. A wall clock set forward in between is then
+    counted too, since the two cannot be told apart.
+
+    Args:
+        start (datetime): The wall clock time of the start reading.
+        start_ns (Optional[int]): The monotonic time of the start reading.
+        clock_id (Optional[str]): The ID of the clock of the start reading.
+        end (ClockReading): The end reading.
+
+    Returns:
+        Elapsed: The elapsed time and the wall clock skew.
+    """
+    wall_seconds = (to_epoch_us(end.wall) - to_epoch_us(start)) / 1_000_000
+    if start_ns is not None and clock_id == end.clock_id:
+        seconds = max((end.monotonic_ns - start_ns) / 1_000_000_000, 0.0)
+        if (
+            not MONOTONIC_COUNTS_SUSPEND
+            and wall_seconds - seconds > CLOCK_JUMP_TOLERANCE_SECONDS
+        ):
+            # The system was most likely suspended in between.
+            seconds = wall_seconds
+    else:
+        # Another process took the start reading, so only the wall clock is
+        # comparable. It can still have been set back in between.
+        seconds = max(wall_seconds, 0.0)
+    return Elapsed(seconds, wall_seconds - seconds)
+
+
+def advance(start: datetime, seconds: float) -> datetime:
+    """Return the wall clock time a number of seconds after another.
+
+    Args:
+        start (datetime): The naive local start time.
+        seconds (float): The seconds to add.
+
+    Returns:
+        datetime: The naive local time, correct across daylight saving
+        time changes.
+    """
+    return from_epoch_us(to_epoch_us(start) + round(seconds * 1_000_000))
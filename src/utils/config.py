@@ -1,9 +1,23 @@
 """
 config.py module.
 
-This module generates a secret key for JWT token
+This module generates a secret key for JWT token and holds the application
+settings read from the environment.
 """
 
+import os
 import secrets
 
 SECRET_KEY = secrets.token_urlsafe(32)
+
+# Validate every database row with pydantic when mapping it to a model.
+# Rows written by the application are trusted, so this is for debugging only.
+STRICT_ROW_MAPPING = os.getenv("TIME_TRACKER_STRICT_ROWS", "") == "1"
+
+# Queue timer writes in memory and commit them in groups from a background
+# thread. Queued writes are lost if the process dies before they are flushed.
+WRITE_BEHIND_ENABLED = os.getenv("TIME_TRACKER_WRITE_BEHIND", "") == "1"
+
+# Append timer writes to a checksummed journal file that is compacted into
+# the database, instead of writing them to the database right away.
+TIMER_JOURNAL_ENABLED = os.getenv("TIME_TRACKER_JOURNAL", "") == "1"
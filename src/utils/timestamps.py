@@ -0,0 +1,73 @@
+"""
+timestamps.py module.
+
+This module converts between datetimes and the integer epoch microseconds
+(UTC) used to store time tracker timestamps.
+Naive datetimes are treated as local time, matching datetime.now().
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, Tuple
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to epoch microseconds in UTC.
+
+    Args:
+        value (datetime): The datetime, naive values being local time.
+
+    Returns:
+        int: The microseconds elapsed since the Unix epoch.
+    """
+    delta = value.astimezone(timezone.utc) - EPOCH
+    seconds = delta.days * 86400 + delta.seconds
+    return seconds * 1_000_000 + delta.microseconds
+
+
+def from_epoch_us(value: int) -> datetime:
+    """Convert epoch microseconds in UTC to a naive local datetime.
+
+    Args:
+        value (int): The microseconds elapsed since the Unix epoch.
+
+    Returns:
+        datetime: The naive local datetime.
+    """
+    return (
+        (EPOCH + timedelta(microseconds=value))
+        .astimezone()
+        .replace(tzinfo=None)
+    )
+
+
+def day_start_epoch_us(day: date) -> int:
+    """Return the epoch microseconds of local midnight on a date.
+
+    Args:
+        day (date): The date.
+
+    Returns:
+        int: The microseconds elapsed since the Unix epoch.
+    """
+    return to_epoch_us(datetime.combine(day, time.min))
+
+
+def split_by_day(start_us: int, stop_us: int) -> Iterator[Tuple[date, int]]:
+    """Split a span of time at every local midnight it crosses.
+
+    Args:
+        start_us (int): The start of the span, in epoch microseconds.
+        stop_us (int): The end of the span, in epoch microseconds.
+
+    Yields:
+        Iterator[Tuple[date, int]]: Each local date of the span, with the
+        microseconds of the span falling on it.
+    """
+    day = from_epoch_us(start_us).date()
+    while start_us < stop_us:
+        next_day = day + timedelta(days=1)
+        boundary = min(day_start_epoch_us(next_day), stop_us)
+        yield day, boundary - start_us
+        start_us, day = boundary, next_day
@@ -0,0 +1,22 @@
+"""
+conftest.py module.
+
+This module provides the fixtures shared by the unit tests: a storage engine
+on a fresh, migrated database in a temporary directory.
+"""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.data_loader.storage_engine import StorageEngine
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[StorageEngine]:
+    """Provide a storage engine on a fresh database."""
+    storage_engine = StorageEngine(str(tmp_path / "time_tracker.db"))
+    storage_engine.connection()
+    yield storage_engine
+    storage_engine.close()
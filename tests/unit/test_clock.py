@@ -0,0 +1,99 @@
+"""
+test_clock.py module.
+
+This module tests the measurement of elapsed time from wall and monotonic
+clock readings.
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from src.utils import clock
+from src.utils.clock import ClockReading, measure_elapsed
+
+START = datetime(2024, 3, 1, 9, 0)
+SECOND_NS = 1_000_000_000
+
+
+def reading(hour: int, minute: int, seconds: int) -> ClockReading:
+    """Build a reading of this process's clocks.
+
+    Args:
+        hour (int): The hour of the wall clock.
+        minute (int): The minute of the wall clock.
+        seconds (int): The monotonic time in seconds.
+
+    Returns:
+        ClockReading: The clock reading.
+    """
+    return ClockReading(
+        datetime(2024, 3, 1, hour, minute), seconds * SECOND_NS
+    )
+
+
+@pytest.mark.skipif(
+    not hasattr(time, "CLOCK_BOOTTIME"), reason="needs CLOCK_BOOTTIME"
+)
+def test_monotonic_clock_counts_suspend_where_available() -> None:
+    """The monotonic clock is CLOCK_BOOTTIME when the platform has it."""
+    assert clock.MONOTONIC_COUNTS_SUSPEND
+    before = time.clock_gettime_ns(time.CLOCK_BOOTTIME)
+    now = clock.monotonic_ns()
+    assert before <= now <= time.clock_gettime_ns(time.CLOCK_BOOTTIME)
+
+
+@pytest.mark.parametrize("counts_suspend", [True, False])
+def test_monotonic_time_is_used_within_a_process(
+    monkeypatch: pytest.MonkeyPatch, counts_suspend: bool
+) -> None:
+    """Matching clocks measure the monotonic time."""
+    monkeypatch.setattr(clock, "MONOTONIC_COUNTS_SUSPEND", counts_suspend)
+    elapsed = measure_elapsed(
+        START, 0, clock.PROCESS_CLOCK_ID, reading(9, 30, 1800)
+    )
+    assert elapsed.seconds == 1800 and not elapsed.clock_jumped
+
+
+def test_wall_clock_step_is_detected_with_a_boot_clock(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A wall clock set forward is not counted when suspend is counted."""
+    monkeypatch.setattr(clock, "MONOTONIC_COUNTS_SUSPEND", True)
+    elapsed = measure_elapsed(
+        START, 0, clock.PROCESS_CLOCK_ID, reading(10, 10, 600)
+    )
+    assert elapsed.seconds == 600
+    assert elapsed.clock_jumped and elapsed.skew == 3600
+
+
+def test_suspend_is_counted_without_a_boot_clock(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A monotonic clock stopped during a suspend falls back to the wall."""
+    monkeypatch.setattr(clock, "MONOTONIC_COUNTS_SUSPEND", False)
+    elapsed = measure_elapsed(
+        START, 0, clock.PROCESS_CLOCK_ID, reading(10, 0, 600)
+    )
+    assert elapsed.seconds == 3600
+    assert not elapsed.clock_jumped
+
+
+@pytest.mark.parametrize("counts_suspend", [True, False])
+def test_wall_clock_set_back_is_not_counted(
+    monkeypatch: pytest.MonkeyPatch, counts_suspend: bool
+) -> None:
+    """A wall clock set back never shortens the measured time."""
+    monkeypatch.setattr(clock, "MONOTONIC_COUNTS_SUSPEND", counts_suspend)
+    elapsed = measure_elapsed(
+        START, 0, clock.PROCESS_CLOCK_ID, reading(9, 5, 1800)
+    )
+    assert elapsed.seconds == 1800
+    assert elapsed.clock_jumped and elapsed.skew == -1500
+
+
+def test_wall_clock_is_used_across_restarts() -> None:
+    """Readings of another process are compared on the wall clock."""
+    elapsed = measure_elapsed(START, 0, "previous-run", reading(9, 45, 5))
+    assert elapsed.seconds == 2700 and not elapsed.clock_jumped
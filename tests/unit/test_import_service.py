@@ -0,0 +1,155 @@
+"""
+test_import_service.py module.
+
+This module tests the streaming timesheet importer, including resuming an
+interrupted import.
+"""
+
+import csv
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.import_database import ImportDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.time_tracker import TimeTracker
+from src.services.import_service import ImportProgress, TimesheetImportService
+
+FIELDS = ("category", "task_name", "start_time", "stop_time")
+
+
+def write_timesheet(path: Path, rows: int) -> None:
+    """Write a CSV timesheet with one invalid row after every valid one.
+
+    Args:
+        path (Path): The path of the timesheet file.
+        rows (int): The number of valid rows.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        for number in range(rows):
+            writer.writerow(
+                (
+                    "Billable",
+                    f"Task {number % 3}",
+                    f"2024-05-{number + 1:02d}T09:00:00",
+                    f"2024-05-{number + 1:02d}T09:30:00",
+                )
+            )
+            writer.writerow(("Billable", "Broken", "not a date", ""))
+
+
+def make_service(
+    engine: StorageEngine, batch_size: int = 2
+) -> TimesheetImportService:
+    """Return an import service on the test database.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+        batch_size (int, optional): The rows per batch. Defaults to 2.
+
+    Returns:
+        TimesheetImportService: The import service.
+    """
+    return TimesheetImportService(
+        TaskDatabase(engine),
+        CategoryDatabase(engine),
+        TimeTrackerDatabase(engine),
+        batch_size,
+        ImportDatabase(engine),
+    )
+
+
+def count(engine: StorageEngine, table: str) -> int:
+    """Count the rows of a table.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+        table (str): The table.
+
+    Returns:
+        int: The number of rows.
+    """
+    return engine.connection().execute(
+        f"SELECT COUNT(*) FROM {table}"
+    ).fetchone()[0]
+
+
+def test_timesheet_is_imported(engine: StorageEngine, tmp_path: Path) -> None:
+    """Valid rows become time trackers of tasks matched by name."""
+    path = tmp_path / "timesheet.csv"
+    write_timesheet(path, 5)
+    result = make_service(engine).import_timesheets(1, str(path))
+    assert (result.rows_read, result.rows_imported, result.rows_skipped) == (
+        10,
+        5,
+        5,
+    )
+    assert count(engine, "time_trackers") == 5
+    assert count(engine, "tasks") == 3
+    assert count(engine, "import_progress") == 0
+    totals = TimeTrackerDatabase(engine).get_total_time_by_user(1)
+    assert totals == 5 * 1800.0
+
+
+def test_interrupted_import_resumes_exactly_once(
+    engine: StorageEngine, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A batch failing midway is rolled back and imported on resume."""
+    path = tmp_path / "timesheet.csv"
+    write_timesheet(path, 7)
+    service = make_service(engine)
+    save_time_trackers = service.time_tracker_db.save_time_trackers
+    calls: List[int] = []
+
+    def crash_on_third_batch(trackers: List[TimeTracker]) -> Any:
+        calls.append(len(trackers))
+        ids = save_time_trackers(trackers)
+        if len(calls) == 3:
+            raise RuntimeError("power cut")
+        return ids
+
+    monkeypatch.setattr(
+        service.time_tracker_db, "save_time_trackers", crash_on_third_batch
+    )
+    with pytest.raises(RuntimeError):
+        service.import_timesheets(1, str(path))
+    # Two batches of two rows were committed, with their progress.
+    assert count(engine, "time_trackers") == 4
+    progress = ImportDatabase(engine).get_import_progress(
+        1, str(path.resolve())
+    )
+    assert progress == 7
+    monkeypatch.undo()
+
+    reports: List[ImportProgress] = []
+    result = make_service(engine).import_timesheets(
+        1, str(path), progress=reports.append
+    )
+    assert result.rows_resumed == 7
+    assert result.rows_imported == 3
+    assert count(engine, "time_trackers") == 7
+    assert count(engine, "tasks") == 3
+    starts = engine.connection().execute(
+        "SELECT COUNT(DISTINCT start_time) FROM time_trackers"
+    ).fetchone()[0]
+    assert starts == 7
+    assert count(engine, "import_progress") == 0
+
+
+def test_throughput_counts_only_this_run() -> None:
+    """Rows imported by an earlier run do not inflate the throughput."""
+    progress = ImportProgress(
+        rows_read=1000,
+        rows_imported=400,
+        rows_skipped=0,
+        elapsed_seconds=2.0,
+        rows_resumed=600,
+    )
+    assert progress.rows_per_second == 200.0
+    assert ImportProgress(10, 10, 0, 0.0).rows_per_second == 0.0
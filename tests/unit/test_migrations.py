@@ -0,0 +1,164 @@
+"""
+test_migrations.py module.
+
+This module tests the versioned schema migrations of the application
+database.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.data_loader import migrations
+from src.data_loader.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    Migration,
+    get_schema_version,
+)
+from src.data_loader.storage_engine import StorageEngine
+from src.utils.timestamps import to_epoch_us
+
+LEGACY_SCHEMAS = {
+    "users.db": (
+        "CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "email TEXT UNIQUE NOT NULL, hashed_password TEXT NOT NULL, "
+        "created_at TEXT NOT NULL)"
+    ),
+    "categories.db": (
+        "CREATE TABLE categories (name TEXT NOT NULL PRIMARY KEY)"
+    ),
+    "tasks.db": (
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "user_id INTEGER NOT NULL, category_name TEXT NOT NULL, "
+        "task_name TEXT NOT NULL, duration REAL DEFAULT 0, "
+        "task_status TEXT NOT NULL)"
+    ),
+    "timings.db": (
+        "CREATE TABLE time_trackers (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "task_id INTEGER NOT NULL, category TEXT NOT NULL, start_time TEXT, "
+        "stop_time TEXT, status TEXT NOT NULL, total_time REAL DEFAULT 0)"
+    ),
+}
+LEGACY_ROWS = {
+    "users.db": [
+        "INSERT INTO users VALUES (7, 'legacy@example.com', 'hash', "
+        "'2025-03-13T05:21:43+00:00')"
+    ],
+    "categories.db": ["INSERT INTO categories VALUES ('Billable')"],
+    "tasks.db": [
+        "INSERT INTO tasks VALUES (3, 7, 'Billable', 'Develop', 2.0, "
+        "'Completed')"
+    ],
+    "timings.db": [
+        "INSERT INTO time_trackers VALUES (5, 3, 'Billable', "
+        "'2025-03-15T10:27:36', '2025-03-15T10:27:39.5', 'Completed', 3.5)"
+    ],
+}
+
+
+def write_legacy_databases(directory: Path) -> None:
+    """Create the legacy per-table database files with one row each.
+
+    Args:
+        directory (Path): The directory to create the files in.
+    """
+    for file_name, schema in LEGACY_SCHEMAS.items():
+        conn = sqlite3.connect(directory / file_name)
+        conn.execute(schema)
+        for statement in LEGACY_ROWS[file_name]:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+
+
+def test_fresh_database_is_migrated_to_latest_version(
+    engine: StorageEngine,
+) -> None:
+    """A new database is created at the latest schema version."""
+    assert get_schema_version(engine.connection()) == LATEST_VERSION
+
+
+def test_legacy_database_files_are_imported(tmp_path: Path) -> None:
+    """Rows of the legacy per-table files are copied and converted."""
+    write_legacy_databases(tmp_path)
+    engine = StorageEngine(str(tmp_path / "time_tracker.db"))
+    conn = engine.connection()
+    try:
+        user = conn.execute("SELECT * FROM users").fetchone()
+        assert (user["id"], user["email"]) == (7, "legacy@example.com")
+        categories = conn.execute("SELECT name FROM categories").fetchall()
+        assert [row["name"] for row in categories] == ["Billable"]
+        task = conn.execute("SELECT * FROM tasks").fetchone()
+        assert (task["id"], task["user_id"], task["task_name"]) == (
+            3,
+            7,
+            "Develop",
+        )
+        tracker = conn.execute("SELECT * FROM time_trackers").fetchone()
+        assert tracker["id"] == 5
+        assert tracker["user_id"] == 7
+        assert tracker["start_time"] == to_epoch_us(
+            datetime(2025, 3, 15, 10, 27, 36)
+        )
+        assert tracker["total_time"] == 3.5
+        segments = conn.execute(
+            "SELECT COUNT(*) FROM time_tracker_segments"
+        ).fetchone()[0]
+        assert segments == 1
+        # New rows do not reuse the imported IDs.
+        conn.execute(
+            "INSERT INTO users (email, hashed_password, created_at) "
+            "VALUES ('new@example.com', 'hash', '2025-01-01')"
+        )
+        new_id = conn.execute("SELECT MAX(id) FROM users").fetchone()[0]
+        assert new_id == 8
+    finally:
+        engine.close()
+    # The legacy files are left in place.
+    assert (tmp_path / "users.db").exists()
+
+
+def test_legacy_import_runs_once(tmp_path: Path) -> None:
+    """Reopening a migrated database does not copy the rows again."""
+    write_legacy_databases(tmp_path)
+    db_path = str(tmp_path / "time_tracker.db")
+    StorageEngine(db_path).connection().close()
+    engine = StorageEngine(db_path)
+    try:
+        count = engine.connection().execute(
+            "SELECT COUNT(*) FROM time_trackers"
+        ).fetchone()[0]
+        assert count == 1
+    finally:
+        engine.close()
+
+
+def test_failed_migration_step_rolls_back(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A step raising a non-SQLite error leaves the database unmigrated."""
+
+    def failing_step(conn: sqlite3.Connection) -> None:
+        raise ValueError("conversion failed")
+
+    broken = Migration(
+        version=LATEST_VERSION + 1,
+        description="Fail halfway",
+        statements=("CREATE TABLE half_done (id INTEGER)", failing_step),
+    )
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*MIGRATIONS, broken])
+    monkeypatch.setattr(migrations, "LATEST_VERSION", broken.version)
+    conn = sqlite3.connect(tmp_path / "time_tracker.db")
+    try:
+        with pytest.raises(ValueError):
+            migrations.migrate(conn)
+        assert not conn.in_transaction
+        tables = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ).fetchall()
+        assert tables == []
+    finally:
+        conn.close()
@@ -0,0 +1,171 @@
+"""
+test_query_plans.py module.
+
+This module runs EXPLAIN QUERY PLAN against every SQL statement of the
+data_loader repositories on a seeded database, and fails when a lookup falls
+back to a full table scan instead of searching an index.
+"""
+
+import ast
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlite3 import Connection
+from typing import Iterator, List, Optional, Tuple
+
+import pytest
+
+from src.data_loader.storage_engine import StorageEngine
+from src.utils.timestamps import to_epoch_us
+
+DATA_LOADER_DIR = Path(__file__).resolve().parents[2] / "src" / "data_loader"
+REPOSITORY_MODULES = [
+    "task_database.py",
+    "time_tracker_database.py",
+    "user_database.py",
+    "category_database.py",
+    "import_database.py",
+    "rollups.py",
+]
+SQL_PATTERN = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE)\b", re.I)
+SCAN_PATTERN = re.compile(r"\bSCAN (?!CONSTANT ROW)(\w+)")
+
+# Statements that read a whole table on purpose, keyed by
+# "<module>::<function>".
+ALLOWED_SCANS = {
+    "category_database.py::get_all_categories",
+}
+
+
+def render_literal(node: ast.AST) -> Optional[str]:
+    """Return the SQL text of a string literal or f-string node.
+
+    Values interpolated into an f-string, such as generated placeholder
+    lists, are rendered as a single "?" parameter.
+
+    Args:
+        node (ast.AST): The node to render.
+
+    Returns:
+        Optional[str]: The rendered text, or None for other nodes.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return "".join(
+            str(part.value) if isinstance(part, ast.Constant) else "?"
+            for part in node.values
+        )
+    return None
+
+
+def collect_statements() -> Iterator[Tuple[str, str]]:
+    """Yield every SQL statement literal found in the repository modules.
+
+    Yields:
+        Iterator[Tuple[str, str]]: The "<module>::<function>" identifier and
+        the SQL text of each statement.
+    """
+    for module in REPOSITORY_MODULES:
+        tree = ast.parse((DATA_LOADER_DIR / module).read_text())
+        for function in ast.walk(tree):
+            if not isinstance(function, ast.FunctionDef):
+                continue
+            skipped = set()
+            for node in ast.walk(function):
+                if isinstance(node, ast.Expr):
+                    skipped.add(id(node.value))
+                elif isinstance(node, ast.JoinedStr):
+                    skipped.update(id(part) for part in node.values)
+            for node in ast.walk(function):
+                sql = None if id(node) in skipped else render_literal(node)
+                if sql and SQL_PATTERN.match(sql):
+                    yield f"{module}::{function.name}", sql
+
+
+STATEMENTS: List[Tuple[str, str]] = list(collect_statements())
+
+
+def seed(conn: Connection) -> None:
+    """Populate the database with a few users, tasks and time trackers.
+
+    Args:
+        conn (Connection): The connection to the database.
+    """
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    for user_id in range(1, 6):
+        conn.execute(
+            "INSERT INTO users (email, hashed_password, created_at) "
+            "VALUES (?, ?, ?)",
+            (f"user{user_id}@example.com", "hash", start.isoformat()),
+        )
+    for category in ("Billable", "Meeting", "Training"):
+        conn.execute("INSERT INTO categories (name) VALUES (?)", (category,))
+    for task_number in range(50):
+        conn.execute(
+            "INSERT INTO tasks (user_id, category_name, task_name, duration, "
+            "task_status) VALUES (?, ?, ?, ?, ?)",
+            (
+                task_number % 5 + 1,
+                "Billable",
+                f"Task {task_number}",
+                60.0,
+                "Completed",
+            ),
+        )
+    for tracker_number in range(500):
+        started = start + timedelta(hours=tracker_number)
+        conn.execute(
+            "INSERT INTO time_trackers (task_id, user_id, category, "
+            "start_time, stop_time, status, total_time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                tracker_number % 50 + 1,
+                tracker_number % 5 + 1,
+                "Billable",
+                to_epoch_us(started),
+                to_epoch_us(started + timedelta(minutes=30)),
+                "Completed",
+                1800.0,
+            ),
+        )
+    conn.commit()
+
+
+@pytest.fixture(scope="module")
+def seeded_connection(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[Connection]:
+    """Provide a connection to a migrated and seeded database."""
+    db_path = tmp_path_factory.mktemp("query_plans") / "time_tracker.db"
+    engine = StorageEngine(str(db_path))
+    conn = engine.connection()
+    seed(conn)
+    yield conn
+    engine.close()
+
+
+def test_statements_are_collected() -> None:
+    """Every repository module contributes statements to the suite."""
+    modules = {name.split("::")[0] for name, _ in STATEMENTS}
+    assert modules == set(REPOSITORY_MODULES)
+
+
+@pytest.mark.parametrize(
+    "name, sql", STATEMENTS, ids=[name for name, _ in STATEMENTS]
+)
+def test_statement_does_not_scan(
+    seeded_connection: Connection, name: str, sql: str
+) -> None:
+    """Each statement searches an index instead of scanning a table."""
+    if name in ALLOWED_SCANS:
+        pytest.skip(f"{name} reads the whole table on purpose")
+    parameters = (None,) * sql.count("?")
+    plan = [
+        row["detail"]
+        for row in seeded_connection.execute(
+            f"EXPLAIN QUERY PLAN {sql}", parameters
+        )
+    ]
+    scans = [detail for detail in plan if SCAN_PATTERN.search(detail)]
+    assert not scans, f"{name} falls back to a table scan: {plan}"
@@ -0,0 +1,204 @@
+"""
+test_report_service.py module.
+
+This module tests the insights and analytics of the ReportService class.
+"""
+
+import csv
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.time_tracker import TimeTracker
+from src.services import analytics
+from src.services.report_service import ReportService
+from src.services.task_service import TaskService
+
+START = datetime(2024, 5, 6, 9, 0, 0)
+
+
+@pytest.fixture
+def report_service(engine: StorageEngine) -> ReportService:
+    """Provide a report service on the test database."""
+    return ReportService(
+        TimeTrackerDatabase(engine),
+        TaskService(TaskDatabase(engine), CategoryDatabase(engine)),
+    )
+
+
+def add_tracker(
+    service: ReportService,
+    task_id: int,
+    seconds: float,
+    status: str = "Completed",
+    start: datetime = START,
+    category: str = "Billable",
+) -> TimeTracker:
+    """Save a time tracker of a task, stopped unless still running.
+
+    Args:
+        service (ReportService): The report service of the test database.
+        task_id (int): The task ID.
+        seconds (float): The tracked time in seconds.
+        status (str, optional): The status. Defaults to "Completed".
+        start (datetime, optional): The start time. Defaults to START.
+        category (str, optional): The category. Defaults to "Billable".
+
+    Returns:
+        TimeTracker: The saved time tracker.
+    """
+    stop: Optional[datetime] = None
+    if status == "Completed":
+        stop = start + timedelta(seconds=seconds)
+    tracker = TimeTracker(
+        task_id=task_id,
+        user_id=1,
+        category=category,
+        start_time=start,
+        stop_time=stop,
+        status=status,
+        total_time=seconds if stop else 0.0,
+    )
+    service.db.save_time_tracker(tracker)
+    return tracker
+
+
+def test_task_insights_describe_each_duration_without_queries(
+    report_service: ReportService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Duration insights come from the loaded time trackers in one pass."""
+    tasks = report_service.task_service
+    early = tasks.create_task(1, "Billable", "Early", duration=600.0)
+    late = tasks.create_task(1, "Billable", "Late", duration=60.0)
+    running = tasks.create_task(1, "Billable", "Running", duration=60.0)
+    assert early.id and late.id and running.id
+    add_tracker(report_service, early.id, 500.0)
+    add_tracker(report_service, late.id, 90.0)
+    add_tracker(report_service, running.id, 0.0, status="In Progress")
+    frame = report_service.load_frame(1)
+
+    def fail(*args: object) -> None:
+        raise AssertionError("queried per time tracker")
+
+    monkeypatch.setattr(report_service.db, "get_active_time_tracker", fail)
+    monkeypatch.setattr(tasks, "get_task_by_id", fail)
+    insights = {
+        insight["task_name"]: insight["duration_insight"]
+        for insight in report_service.get_task_insights(frame, 1)
+    }
+    assert insights == {
+        "Early": "Task completed 100.00 seconds early.",
+        "Late": "Task delayed by 30.00 seconds.",
+        "Running": "Task not completed.",
+    }
+
+
+def test_task_duration_insights_of_a_completed_task(
+    report_service: ReportService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A completed task is compared with the time tracked on it alone."""
+    tasks = report_service.task_service
+    task = tasks.create_task(1, "Billable", "Review", duration=100.0)
+    other = tasks.create_task(1, "Billable", "Other", duration=100.0)
+    assert task.id is not None and other.id is not None
+    add_tracker(report_service, other.id, 500.0)
+
+    def every_task(*args: object) -> None:
+        raise AssertionError("summed the time of every task")
+
+    monkeypatch.setattr(
+        report_service.db, "get_total_time_by_task", every_task
+    )
+    add_tracker(report_service, task.id, 60.0)
+    add_tracker(
+        report_service, task.id, 60.0, start=START + timedelta(hours=1)
+    )
+    assert (
+        report_service.get_task_duration_insights(task.id, 1)
+        == "Task not completed."
+    )
+    tasks.update_task_status(task.id, "Completed")
+    assert (
+        report_service.get_task_duration_insights(task.id, 1)
+        == "Task delayed by 20.00 seconds."
+    )
+    assert (
+        report_service.get_task_duration_insights(other.id + 1, 1)
+        == "Task not found."
+    )
+
+
+def test_report_is_exported_to_csv_and_json_lines(
+    report_service: ReportService, tmp_path: Path
+) -> None:
+    """Every row is streamed to the export file, in either format."""
+    tasks = report_service.task_service
+    task = tasks.create_task(1, "Billable", "Export", duration=60.0)
+    assert task.id is not None
+    for hour in range(3):
+        add_tracker(
+            report_service, task.id, 30.0, start=START + timedelta(hours=hour)
+        )
+    # A time tracker of a deleted task is left out of the export.
+    add_tracker(report_service, task.id + 1, 30.0)
+    csv_path = tmp_path / "report.csv"
+    rows = report_service.export_report(1, str(csv_path), chunk_size=2)
+    assert rows == 3
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        exported = list(csv.DictReader(file))
+    assert [row["start_time"] for row in exported] == [
+        (START + timedelta(hours=hour)).isoformat() for hour in range(3)
+    ]
+    assert {row["task_name"] for row in exported} == {"Export"}
+    jsonl_path = tmp_path / "report.jsonl"
+    rows = report_service.export_report(
+        1,
+        str(jsonl_path),
+        "jsonl",
+        start_date=START.date(),
+        end_date=START.date(),
+    )
+    lines = jsonl_path.read_text(encoding="utf-8").splitlines()
+    assert rows == len(lines) == 3
+    assert json.loads(lines[0])["total_time"] == 30.0
+    with pytest.raises(ValueError):
+        report_service.export_report(1, str(tmp_path / "report.xml"), "xml")
+
+
+def test_analytics_match_with_and_without_numpy(
+    report_service: ReportService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The vectorized and pure Python aggregates are identical."""
+    pytest.importorskip("numpy")
+    tasks = report_service.task_service
+    for number, category in enumerate(("Billable", "Meeting", "Billable")):
+        task = tasks.create_task(1, category, f"Task {number}", 0.5)
+        assert task.id is not None
+        for run in range(number + 2):
+            add_tracker(
+                report_service,
+                task.id,
+                600.0 * (run + 1) + 300.0 * number,
+                start=START + timedelta(hours=4 * number + run),
+                category=category,
+            )
+    add_tracker(report_service, 1, 0.0, status="In Progress")
+
+    with_numpy = report_service.get_analytics(1, bin_seconds=600.0, bins=6)
+    frame = report_service.load_frame(1)
+    framed = report_service.get_analytics(1, frame=frame, bins=6)
+    monkeypatch.setattr(analytics, "numpy", None)
+    without_numpy = report_service.get_analytics(
+        1, bin_seconds=600.0, bins=6
+    )
+    assert with_numpy == without_numpy
+    assert framed == report_service.get_analytics(1, frame=frame, bins=6)
+    assert with_numpy.task_totals == {1: 1800.0, 2: 4500.0, 3: 8400.0}
+    assert sum(with_numpy.duration_histogram) == 10
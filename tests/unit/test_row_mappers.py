@@ -0,0 +1,72 @@
+"""
+test_row_mappers.py module.
+
+This module tests the mapping of database rows to the application models.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from src.data_loader.row_mappers import (
+    task_from_row,
+    time_tracker_from_row,
+    time_tracker_record_from_row,
+)
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.task import Task
+from src.models.time_tracker import TimeTracker
+
+START = datetime(2024, 5, 6, 9, 0, 0, 250)
+
+
+def test_trusted_rows_map_like_validated_rows(engine: StorageEngine) -> None:
+    """Skipping validation builds the same models as strict mapping."""
+    task = Task.create(
+        user_id=1,
+        category_name="Billable",
+        task_name="Write report",
+        duration=1.5,
+        task_status="Not Started",
+    )
+    TaskDatabase(engine).save_task(task)
+    tracker = TimeTracker(
+        task_id=task.id or 0,
+        user_id=1,
+        category="Billable",
+        start_time=START,
+        stop_time=START + timedelta(minutes=5),
+        status="Completed",
+        total_time=300.0,
+    )
+    TimeTrackerDatabase(engine).save_time_tracker(tracker)
+    conn = engine.connection()
+    task_row = conn.execute("SELECT * FROM tasks").fetchone()
+    tracker_row = conn.execute("SELECT * FROM time_trackers").fetchone()
+    assert task_from_row(task_row) == task_from_row(task_row, strict=True)
+    assert task_from_row(task_row) == task
+    fast = time_tracker_from_row(tracker_row)
+    assert fast == time_tracker_from_row(tracker_row, strict=True)
+    assert fast == tracker
+    record = time_tracker_record_from_row(tracker_row)
+    assert (record.start_time, record.stop_time) == (
+        tracker.start_time,
+        tracker.stop_time,
+    )
+    assert record.total_time == 300.0
+
+
+def test_strict_mapping_rejects_invalid_rows(engine: StorageEngine) -> None:
+    """Strict mode validates rows that the fast path takes as they are."""
+    conn = engine.connection()
+    conn.execute(
+        "INSERT INTO tasks (user_id, category_name, task_name, duration, "
+        "task_status) VALUES (1, 'Billable', 'Broken', 'soon', 'Paused')"
+    )
+    row = conn.execute("SELECT * FROM tasks").fetchone()
+    assert task_from_row(row).duration == "soon"
+    with pytest.raises(ValidationError):
+        task_from_row(row, strict=True)
@@ -0,0 +1,71 @@
+"""
+test_storage_engine.py module.
+
+This module tests the transactions of the StorageEngine class.
+"""
+
+from typing import List
+
+import pytest
+
+from src.data_loader.storage_engine import StorageEngine
+
+
+def category_names(engine: StorageEngine) -> List[str]:
+    """Return the stored category names in insertion order.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+
+    Returns:
+        List[str]: The category names.
+    """
+    return [
+        row["name"]
+        for row in engine.connection().execute(
+            "SELECT name FROM categories ORDER BY rowid"
+        )
+    ]
+
+
+def add_category(engine: StorageEngine, name: str) -> None:
+    """Insert a category through the shared connection.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+        name (str): The category name.
+    """
+    engine.connection().execute(
+        "INSERT INTO categories (name) VALUES (?)", (name,)
+    )
+
+
+def test_caught_nested_failure_rolls_back_only_the_inner_block(
+    engine: StorageEngine,
+) -> None:
+    """An inner block that raises is undone even when the error is caught."""
+    with engine.transaction():
+        add_category(engine, "Billable")
+        try:
+            with engine.transaction():
+                add_category(engine, "Meeting")
+                raise RuntimeError("inner failure")
+        except RuntimeError:
+            pass
+        with engine.transaction():
+            add_category(engine, "Training")
+    assert category_names(engine) == ["Billable", "Training"]
+    assert not engine.connection().in_transaction
+
+
+def test_outer_failure_rolls_back_committed_nested_blocks(
+    engine: StorageEngine,
+) -> None:
+    """Nested blocks are only durable once the outermost block commits."""
+    with pytest.raises(RuntimeError):
+        with engine.transaction():
+            with engine.transaction():
+                add_category(engine, "Billable")
+            raise RuntimeError("outer failure")
+    assert category_names(engine) == []
+    assert not engine.connection().in_transaction
@@ -0,0 +1,147 @@
+"""
+test_task_controller.py module.
+
+This module tests the menus of the TaskController class, answering their
+prompts with scripted answers.
+"""
+
+import io
+from typing import Any, Dict, Iterator, List, Tuple
+
+import inquirer  # type: ignore
+import pytest
+from rich.console import Console
+
+from src.controllers.task_controller import TaskController
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.services.category_service import CategoryService
+from src.services.task_service import TaskService
+from src.services.time_tracker_service import TimeTrackerService
+from src.services.write_behind import WriteBehindQueue
+
+
+class ScriptedPrompt:
+    """Answer inquirer prompts in order, recording the choices offered."""
+
+    def __init__(self, answers: List[Dict[str, Any]]) -> None:
+        """Initialize the prompt with its answers.
+
+        Args:
+            answers (List[Dict[str, Any]]): The answer to each prompt.
+        """
+        self.answers: Iterator[Dict[str, Any]] = iter(answers)
+        self.choices: List[List[Tuple[str, Any]]] = []
+
+    def __call__(self, questions: List[Any]) -> Dict[str, Any]:
+        """Record the choices of the first question and answer it."""
+        self.choices.append(
+            [
+                (
+                    getattr(choice, "tag", choice),
+                    getattr(choice, "value", choice),
+                )
+                for choice in questions[0].choices
+            ]
+        )
+        return next(self.answers)
+
+
+@pytest.fixture
+def controller(engine: StorageEngine) -> TaskController:
+    """Provide a task controller of user 1 on the test database."""
+    task_service = TaskService(TaskDatabase(engine), CategoryDatabase(engine))
+    return TaskController(
+        1,
+        task_service,
+        CategoryService(CategoryDatabase(engine)),
+        TimeTrackerService(TimeTrackerDatabase(engine), task_service),
+    )
+
+
+def script(
+    monkeypatch: pytest.MonkeyPatch, answers: List[Dict[str, Any]]
+) -> ScriptedPrompt:
+    """Answer the next prompts with the given answers.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The monkeypatch fixture.
+        answers (List[Dict[str, Any]]): The answer to each prompt.
+
+    Returns:
+        ScriptedPrompt: The prompt, recording the choices offered.
+    """
+    prompt = ScriptedPrompt(answers)
+    monkeypatch.setattr(inquirer, "prompt", prompt)
+    return prompt
+
+
+def test_task_menu_lists_open_tasks_newest_first(
+    controller: TaskController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Completed tasks are left out until the user asks for them."""
+    tasks = controller.task_service
+    oldest = tasks.create_task(1, "Billable", "Oldest")
+    done = tasks.create_task(1, "Billable", "Done")
+    newest = tasks.create_task(1, "Billable", "Newest")
+    assert done.id is not None
+    tasks.update_task_status(done.id, "Completed")
+    prompt = script(monkeypatch, [{"task": "completed"}, {"task": "logout"}])
+    assert controller.show_task_menu() == "logout"
+    open_menu, completed_menu = (
+        [value for _, value in choices if isinstance(value, int)]
+        for choices in prompt.choices
+    )
+    assert open_menu == [newest.id, oldest.id]
+    assert completed_menu == [done.id]
+    assert ("Show Completed Tasks", "completed") in prompt.choices[0]
+    assert ("Show Open Tasks", "open") in prompt.choices[1]
+
+
+def test_dashboard_shows_deferred_statuses_without_flushing(
+    engine: StorageEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Queued status writes are shown while they stay queued."""
+    task_service = TaskService(TaskDatabase(engine), CategoryDatabase(engine))
+    write_behind = WriteBehindQueue(engine)
+    controller = TaskController(
+        1,
+        task_service,
+        CategoryService(CategoryDatabase(engine)),
+        TimeTrackerService(
+            TimeTrackerDatabase(engine), task_service, write_behind
+        ),
+    )
+    controller.console = Console(file=io.StringIO(), width=200)
+    controller.time_tracker_service.load_timers(1)
+    task = task_service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    script(monkeypatch, [{"action": "Start Task"}])
+    controller.handle_task_options(task.id)
+    assert write_behind.pending() > 0
+    assert task_service.get_tasks_page(1, statuses=["In Progress"]) == []
+    output = controller.console.file.getvalue()
+    current = output.rsplit("Current Tasks", 1)[1].split("Recent Tasks")[0]
+    assert "Status: In Progress | Task: Write report" in current
+    write_behind.close()
+
+
+def test_task_options_follow_the_timer_registry(
+    controller: TaskController, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The actions offered come from the open session, not the task row."""
+    task = controller.task_service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    timers = controller.time_tracker_service
+    timers.load_timers(1)
+    timers.start_task(task.id, "Billable", 1)
+    timers.pause_task(task.id)
+    # A status write still deferred leaves the task row behind.
+    controller.task_service.update_task_status(task.id, "In Progress")
+    monkeypatch.setattr(controller, "show_dashboard", lambda: None)
+    prompt = script(monkeypatch, [{"action": "Back"}])
+    controller.handle_task_options(task.id)
+    offered = [value for _, value in prompt.choices[0]]
+    assert "Resume Task" in offered and "Pause Task" not in offered
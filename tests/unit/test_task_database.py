@@ -0,0 +1,189 @@
+"""
+test_task_database.py module.
+
+This module tests the TaskDatabase repository: keyset pagination, bulk
+inserts and task deletion.
+"""
+
+from datetime import date, datetime
+from typing import List
+
+import pytest
+
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.task import OPEN_TASK_STATUSES, Task
+from src.models.time_tracker import TimeTracker
+
+
+@pytest.fixture
+def task_db(engine: StorageEngine) -> TaskDatabase:
+    """Provide a task repository on the test database."""
+    return TaskDatabase(engine)
+
+
+def add_tasks(
+    task_db: TaskDatabase, count: int, status: str = "Not Started"
+) -> List[int]:
+    """Save tasks of user 1 one at a time.
+
+    Args:
+        task_db (TaskDatabase): The task repository.
+        count (int): The number of tasks.
+        status (str, optional): Their status. Defaults to "Not Started".
+
+    Returns:
+        List[int]: The IDs of the tasks, in creation order.
+    """
+    ids = []
+    for number in range(count):
+        task = Task.create(
+            user_id=1,
+            category_name="Billable",
+            task_name=f"Task {number}",
+            duration=0.0,
+            task_status=status,
+        )
+        task_db.save_task(task)
+        assert task.id is not None
+        ids.append(task.id)
+    return ids
+
+
+def page_ids(tasks: List[Task]) -> List[int]:
+    """Return the IDs of the tasks of a page.
+
+    Args:
+        tasks (List[Task]): The tasks.
+
+    Returns:
+        List[int]: Their IDs.
+    """
+    return [task.id for task in tasks if task.id is not None]
+
+
+def test_pages_start_from_the_newest_task(task_db: TaskDatabase) -> None:
+    """Pages run newest first by default, each after the previous one."""
+    ids = add_tasks(task_db, 5)
+    first = task_db.get_tasks_page(1, limit=2)
+    assert page_ids(first) == [ids[4], ids[3]]
+    second = task_db.get_tasks_page(1, first[-1].id, limit=2)
+    assert page_ids(second) == [ids[2], ids[1]]
+    last = task_db.get_tasks_page(1, second[-1].id, limit=2)
+    assert page_ids(last) == [ids[0]]
+    oldest_first = task_db.get_tasks_page(1, limit=2, newest_first=False)
+    assert page_ids(oldest_first) == [ids[0], ids[1]]
+
+
+def test_pages_filter_by_status(task_db: TaskDatabase) -> None:
+    """Completed tasks are only listed when their status is asked for."""
+    open_ids = add_tasks(task_db, 2)
+    completed_ids = add_tasks(task_db, 2, status="Completed")
+    open_page = task_db.get_tasks_page(1, statuses=OPEN_TASK_STATUSES)
+    assert page_ids(open_page) == open_ids[::-1]
+    completed = task_db.get_tasks_page(1, statuses=["Completed"])
+    assert page_ids(completed) == completed_ids[::-1]
+    assert task_db.get_tasks_page(2) == []
+
+
+def make_tasks(count: int) -> List[Task]:
+    """Build new tasks of user 1.
+
+    Args:
+        count (int): The number of tasks.
+
+    Returns:
+        List[Task]: The tasks, not saved yet.
+    """
+    return [
+        Task.create(
+            user_id=1,
+            category_name="Billable",
+            task_name=f"Bulk {number}",
+            duration=float(number),
+            task_status="Not Started",
+        )
+        for number in range(count)
+    ]
+
+
+def test_bulk_insert_assigns_the_stored_ids(
+    engine: StorageEngine, task_db: TaskDatabase
+) -> None:
+    """Each task gets the ID its row was stored with, after gaps too."""
+    existing = add_tasks(task_db, 3)
+    task_db.delete_task(1, existing[-1])
+    tasks = make_tasks(4)
+    ids = task_db.save_tasks(tasks)
+    assert ids == [task.id for task in tasks]
+    # The deleted task's ID is not reused.
+    assert min(ids) > existing[-1]
+    rows = engine.connection().execute(
+        "SELECT id, task_name FROM tasks WHERE id >= ?", (min(ids),)
+    )
+    stored = {row["id"]: row["task_name"] for row in rows}
+    assert stored == {task.id: task.task_name for task in tasks}
+
+
+def test_bulk_insert_joins_the_open_transaction(
+    engine: StorageEngine, task_db: TaskDatabase
+) -> None:
+    """Tasks saved inside a transaction are rolled back with it."""
+    with pytest.raises(RuntimeError):
+        with engine.transaction():
+            task_db.save_tasks(make_tasks(2))
+            raise RuntimeError("abort")
+    assert task_db.get_tasks_by_user(1) == []
+    assert task_db.save_tasks([]) == []
+
+
+def test_deleting_a_task_removes_its_time_and_reopens_the_index(
+    engine: StorageEngine, task_db: TaskDatabase
+) -> None:
+    """A deleted task no longer counts in the rollups or window totals."""
+    kept, deleted = add_tasks(task_db, 2)
+    trackers = TimeTrackerDatabase(engine)
+    for day, task_id in ((4, kept), (5, deleted), (6, kept)):
+        trackers.save_time_tracker(
+            TimeTracker(
+                task_id=task_id,
+                user_id=1,
+                category="Billable",
+                start_time=datetime(2024, 3, day, 9),
+                stop_time=datetime(2024, 3, day, 10),
+                status="Completed",
+                total_time=3600.0,
+            )
+        )
+    assert trackers.get_window_time_by_category(1) == {
+        "Billable": 3 * 3600.0
+    }
+
+    task_db.delete_task(1, deleted)
+    assert trackers.get_total_time_by_task(1) == {kept: 2 * 3600.0}
+    assert [t.task_id for t in trackers.get_time_trackers_by_user(1)] == [
+        kept,
+        kept,
+    ]
+    mark = engine.connection().execute(
+        "SELECT closed_through FROM cumulative_rollup_marks"
+    ).fetchone()[0]
+    assert mark == "2024-03-04"
+    assert trackers.get_window_time_by_category(1) == {
+        "Billable": 2 * 3600.0
+    }
+    assert trackers.get_window_time_by_category(
+        1, date(2024, 3, 5), date(2024, 3, 6)
+    ) == {"Billable": 3600.0}
+
+
+def test_deleting_a_missing_task_changes_nothing(
+    engine: StorageEngine, task_db: TaskDatabase
+) -> None:
+    """Deleting another user's task fails without touching its time."""
+    (task_id,) = add_tasks(task_db, 1)
+    with pytest.raises(Exception, match="No task found"):
+        task_db.delete_task(2, task_id)
+    assert task_db.get_task(1, task_id) is not None
+    assert not engine.connection().in_transaction
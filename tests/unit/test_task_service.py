@@ -0,0 +1,180 @@
+"""
+test_task_service.py module.
+
+This module tests the TaskService class, and the LRU cache behind its task
+lookups in particular.
+"""
+
+from typing import Any, List, Optional
+
+import pytest
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.models.task import Task
+from src.services.task_service import TaskService
+
+
+@pytest.fixture
+def task_db(engine: StorageEngine) -> TaskDatabase:
+    """Provide a task repository on the test database."""
+    return TaskDatabase(engine)
+
+
+@pytest.fixture
+def lookups(
+    task_db: TaskDatabase, monkeypatch: pytest.MonkeyPatch
+) -> List[int]:
+    """Record the task IDs looked up in the database."""
+    calls: List[int] = []
+    get_task = task_db.get_task
+
+    def counting_get_task(user_id: int, task_id: int) -> Optional[Task]:
+        calls.append(task_id)
+        return get_task(user_id, task_id)
+
+    monkeypatch.setattr(task_db, "get_task", counting_get_task)
+    return calls
+
+
+def make_service(
+    engine: StorageEngine, task_db: TaskDatabase, cache_size: int = 2
+) -> TaskService:
+    """Return a task service on the test database.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+        task_db (TaskDatabase): The task repository.
+        cache_size (int, optional): The size of the lookup cache.
+        Defaults to 2.
+
+    Returns:
+        TaskService: The task service.
+    """
+    return TaskService(task_db, CategoryDatabase(engine), cache_size)
+
+
+def test_cached_task_is_not_read_again(
+    engine: StorageEngine, task_db: TaskDatabase, lookups: List[int]
+) -> None:
+    """A second lookup of the same task is served from the cache."""
+    service = make_service(engine, task_db)
+    task = service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    first = service.get_task_by_id(1, task.id)
+    second = service.get_task_by_id(1, task.id)
+    assert first is second
+    assert lookups == [task.id]
+
+
+def test_cached_task_of_another_user_is_hidden(
+    engine: StorageEngine, task_db: TaskDatabase, lookups: List[int]
+) -> None:
+    """A cached task is only returned to the user owning it."""
+    service = make_service(engine, task_db)
+    task = service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    assert service.get_task_by_id(1, task.id) is not None
+    assert service.get_task_by_id(2, task.id) is None
+
+
+def test_least_recently_used_task_is_evicted(
+    engine: StorageEngine, task_db: TaskDatabase, lookups: List[int]
+) -> None:
+    """The cache drops the least recently used task when it is full."""
+    service = make_service(engine, task_db, cache_size=2)
+    ids = [
+        service.create_task(1, "Billable", f"Task {n}").id for n in range(3)
+    ]
+    first, second, third = (task_id for task_id in ids if task_id)
+    service.get_task_by_id(1, first)
+    service.get_task_by_id(1, second)
+    # Using the first task again makes the second the least recently used.
+    service.get_task_by_id(1, first)
+    service.get_task_by_id(1, third)
+    lookups.clear()
+    service.get_task_by_id(1, first)
+    service.get_task_by_id(1, second)
+    assert lookups == [second]
+
+
+def test_writes_invalidate_the_cached_task(
+    engine: StorageEngine, task_db: TaskDatabase, lookups: List[int]
+) -> None:
+    """Updating, changing the status of or deleting a task evicts it."""
+    service = make_service(engine, task_db)
+    task = service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    service.get_task_by_id(1, task.id)
+    service.update_task_status(task.id, "In Progress")
+    updated = service.get_task_by_id(1, task.id)
+    assert updated is not None and updated.task_status == "In Progress"
+    service.update_task(1, task.id, "Billable", "Write summary", 1.0)
+    renamed = service.get_task_by_id(1, task.id)
+    assert renamed is not None and renamed.task_name == "Write summary"
+    service.delete_task(1, task.id)
+    assert service.get_task_by_id(1, task.id) is None
+    assert lookups == [task.id] * 4
+
+
+def test_disabled_cache_always_reads_the_database(
+    engine: StorageEngine, task_db: TaskDatabase, lookups: List[int]
+) -> None:
+    """A cache size of zero keeps no task in memory."""
+    service = make_service(engine, task_db, cache_size=0)
+    task = service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    service.get_task_by_id(1, task.id)
+    service.get_task_by_id(1, task.id)
+    assert lookups == [task.id, task.id]
+
+
+class CommitCounter:
+    """Connection proxy counting its commits."""
+
+    def __init__(self, conn: Any, commits: List[int]) -> None:
+        """Wrap a connection.
+
+        Args:
+            conn (Any): The connection.
+            commits (List[int]): Receives one entry per commit.
+        """
+        self._conn = conn
+        self._commits = commits
+
+    def commit(self) -> None:
+        """Commit the wrapped connection, counting the commit."""
+        self._commits.append(1)
+        self._conn.commit()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped connection."""
+        return getattr(self._conn, name)
+
+
+def test_create_tasks_commits_categories_and_tasks_together(
+    engine: StorageEngine,
+    task_db: TaskDatabase,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A failed batch leaves no category behind, a good one commits once."""
+    service = TaskService(task_db, CategoryDatabase(engine))
+    batch = [("Billable", "Write report", 1.0), ("Meeting", "Standup", 0.5)]
+
+    def fail(tasks: List[Task]) -> List[int]:
+        raise Exception("Error saving tasks: disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(task_db, "save_tasks", fail)
+        with pytest.raises(Exception, match="Error saving tasks"):
+            service.create_tasks(1, batch)
+    names = engine.connection().execute("SELECT name FROM categories")
+    assert [row["name"] for row in names] == []
+
+    commits: List[int] = []
+    connection = engine.connection()
+    monkeypatch.setattr(engine, "conn", CommitCounter(connection, commits))
+    tasks = service.create_tasks(1, batch)
+    assert len(commits) == 1
+    assert [task.id is not None for task in tasks] == [True, True]
@@ -0,0 +1,411 @@
+"""
+test_time_tracker_database.py module.
+
+This module tests the TimeTrackerDatabase repository: its aggregate
+queries, streaming reads and bulk writes.
+"""
+
+from datetime import date, datetime, timedelta
+import sqlite3
+from sqlite3 import Connection, Cursor
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from src.data_loader.migrations import build_daily_rollups
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.time_tracker import TimeTracker
+
+MONDAY = datetime(2024, 5, 6, 9, 0, 0)
+
+
+@pytest.fixture
+def db(engine: StorageEngine) -> TimeTrackerDatabase:
+    """Provide a time tracker repository on the test database."""
+    return TimeTrackerDatabase(engine)
+
+
+def make_tracker(
+    task_id: int,
+    start: datetime,
+    seconds: float,
+    user_id: int = 1,
+    category: str = "Billable",
+) -> TimeTracker:
+    """Build a completed time tracker.
+
+    Args:
+        task_id (int): The task ID.
+        start (datetime): The start time.
+        seconds (float): The tracked time in seconds.
+        user_id (int, optional): The user ID. Defaults to 1.
+        category (str, optional): The category. Defaults to "Billable".
+
+    Returns:
+        TimeTracker: The time tracker, not saved yet.
+    """
+    return TimeTracker(
+        task_id=task_id,
+        user_id=user_id,
+        category=category,
+        start_time=start,
+        stop_time=start + timedelta(seconds=seconds),
+        status="Completed",
+        total_time=seconds,
+    )
+
+
+def add_tracker(
+    db: TimeTrackerDatabase,
+    task_id: int,
+    start: datetime,
+    seconds: float,
+    user_id: int = 1,
+    category: str = "Billable",
+) -> TimeTracker:
+    """Save a completed time tracker.
+
+    Args:
+        db (TimeTrackerDatabase): The time tracker repository.
+        task_id (int): The task ID.
+        start (datetime): The start time.
+        seconds (float): The tracked time in seconds.
+        user_id (int, optional): The user ID. Defaults to 1.
+        category (str, optional): The category. Defaults to "Billable".
+
+    Returns:
+        TimeTracker: The saved time tracker.
+    """
+    tracker = make_tracker(task_id, start, seconds, user_id, category)
+    db.save_time_tracker(tracker)
+    return tracker
+
+
+def test_totals_are_grouped_in_sql(db: TimeTrackerDatabase) -> None:
+    """Totals are summed per user, category and task over a date range."""
+    add_tracker(db, 1, MONDAY, 600.0)
+    add_tracker(db, 1, MONDAY + timedelta(days=1), 300.0)
+    add_tracker(db, 2, MONDAY + timedelta(days=1), 120.0, category="Meeting")
+    add_tracker(db, 3, MONDAY + timedelta(days=3), 60.0)
+    add_tracker(db, 9, MONDAY, 5000.0, user_id=2)
+    assert db.get_total_time_by_user(1) == 1080.0
+    assert db.get_total_time_by_category(1) == {
+        "Billable": 960.0,
+        "Meeting": 120.0,
+    }
+    assert db.get_total_time_by_task(1) == {1: 900.0, 2: 120.0, 3: 60.0}
+    tuesday = date(2024, 5, 7)
+    assert db.get_total_time_by_user(1, tuesday, tuesday) == 420.0
+    assert db.get_total_time_by_category(1, tuesday, None) == {
+        "Billable": 360.0,
+        "Meeting": 120.0,
+    }
+    assert db.get_total_time_by_task(1, None, tuesday) == {1: 900.0, 2: 120.0}
+    assert db.get_total_time_by_user(3) == 0.0
+
+
+class CountingCursor:
+    """Wrap a cursor to record the number of rows of each fetchmany."""
+
+    def __init__(self, cursor: Cursor, fetched: List[int]) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            cursor (Cursor): The wrapped cursor.
+            fetched (List[int]): Receives the size of each fetch.
+        """
+        self.cursor = cursor
+        self.fetched = fetched
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate every other attribute to the wrapped cursor."""
+        return getattr(self.cursor, name)
+
+    def fetchmany(self, size: int) -> List[Any]:
+        """Fetch the next rows and record how many were returned."""
+        rows = self.cursor.fetchmany(size)
+        self.fetched.append(len(rows))
+        return rows
+
+
+class CountingConnection:
+    """Wrap a connection so that its cursors record their fetches."""
+
+    def __init__(self, conn: Connection) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            conn (Connection): The wrapped connection.
+        """
+        self.conn = conn
+        self.fetched: List[int] = []
+
+    def cursor(self) -> CountingCursor:
+        """Return a counting cursor on the wrapped connection."""
+        return CountingCursor(self.conn.cursor(), self.fetched)
+
+
+def test_streaming_reads_every_tracker_in_chunks(
+    db: TimeTrackerDatabase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Time trackers are streamed lazily, one chunk at a time."""
+    for day in range(5):
+        add_tracker(db, day + 1, MONDAY + timedelta(days=day), 60.0)
+    add_tracker(db, 9, MONDAY, 60.0, user_id=2)
+    assert db.conn is not None
+    conn = CountingConnection(db.conn)
+    monkeypatch.setattr(db, "conn", conn)
+    records = db.iter_time_trackers_by_user(1, chunk_size=2)
+    assert conn.fetched == []
+    assert next(records).task_id == 1
+    assert conn.fetched == [2]
+    assert [record.task_id for record in records] == [2, 3, 4, 5]
+    assert conn.fetched == [2, 2, 1, 0]
+    ranged = db.iter_time_trackers_by_user_and_date_range(
+        1, date(2024, 5, 7), date(2024, 5, 8), chunk_size=2
+    )
+    assert [record.task_id for record in ranged] == [2, 3]
+    only_day = db.iter_time_trackers_by_user_and_date(1, date(2024, 5, 10))
+    assert [record.start_time for record in only_day] == [
+        MONDAY + timedelta(days=4)
+    ]
+
+
+def test_trackers_are_looked_up_by_their_own_user_id(
+    db: TimeTrackerDatabase,
+) -> None:
+    """The denormalized user_id selects trackers without joining tasks."""
+    add_tracker(db, 1, MONDAY, 60.0, user_id=1)
+    add_tracker(db, 2, MONDAY + timedelta(days=1), 60.0, user_id=2)
+    assert db.conn is not None
+    # No tasks rows exist, so a join on tasks would find nothing.
+    assert db.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 0
+    assert [t.task_id for t in db.get_time_trackers_by_user(1)] == [1]
+    assert [
+        t.task_id
+        for t in db.get_time_trackers_by_user_and_date(2, date(2024, 5, 7))
+    ] == [2]
+    assert (
+        db.get_time_trackers_by_user_and_date_range(
+            1, date(2024, 5, 7), date(2024, 5, 8)
+        )
+        == []
+    )
+
+
+def test_bulk_insert_assigns_ids_segments_and_rollups(
+    db: TimeTrackerDatabase,
+) -> None:
+    """Bulk saved trackers get their IDs, first segment and rollups."""
+    add_tracker(db, 1, MONDAY, 60.0)
+    trackers = [
+        make_tracker(task_id, MONDAY + timedelta(hours=task_id), 30.0)
+        for task_id in range(2, 5)
+    ]
+    ids = db.save_time_trackers(trackers)
+    assert ids == [tracker.id for tracker in trackers]
+    for tracker in trackers:
+        assert tracker.id is not None
+        segments = db.get_segments(tracker.id)
+        assert [
+            (segment.start_time, segment.stop_time) for segment in segments
+        ] == [(tracker.start_time, tracker.stop_time)]
+    assert db.get_total_time_by_task(1) == {
+        1: 60.0,
+        2: 30.0,
+        3: 30.0,
+        4: 30.0,
+    }
+
+
+def test_failed_bulk_insert_keeps_the_outer_transaction(
+    engine: StorageEngine, db: TimeTrackerDatabase
+) -> None:
+    """A failing bulk insert rolls back as a whole, leaving no IDs set."""
+    broken = make_tracker(2, MONDAY, 30.0)
+    broken.category = None  # type: ignore[assignment]
+    trackers = [make_tracker(1, MONDAY, 30.0), broken]
+    with pytest.raises(Exception, match="Error saving time trackers"):
+        db.save_time_trackers(trackers)
+    assert [tracker.id for tracker in trackers] == [None, None]
+    assert db.get_time_trackers_by_user(1) == []
+    assert not engine.connection().in_transaction
+
+
+def daily_rollups(
+    engine: StorageEngine,
+) -> Dict[Tuple[str, int], Tuple[float, int]]:
+    """Read the daily rollups of user 1.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+
+    Returns:
+        Dict[Tuple[str, int], Tuple[float, int]]: The seconds and segment
+        count keyed by day and task ID.
+    """
+    return {
+        (row["day"], row["task_id"]): (row["seconds"], row["segments"])
+        for row in engine.connection().execute(
+            "SELECT day, task_id, seconds, segments FROM daily_rollups "
+            "WHERE user_id = 1"
+        )
+    }
+
+
+def test_rollups_split_a_session_crossing_midnight(
+    engine: StorageEngine, db: TimeTrackerDatabase
+) -> None:
+    """A segment crossing midnight is counted on both days."""
+    add_tracker(db, 1, datetime(2024, 3, 4, 23, 0), 2.5 * 3600)
+    assert daily_rollups(engine) == {
+        ("2024-03-04", 1): (3600.0, 1),
+        ("2024-03-05", 1): (5400.0, 1),
+    }
+
+
+def test_closing_segments_upserts_the_day(
+    engine: StorageEngine, db: TimeTrackerDatabase
+) -> None:
+    """Segments closed on the same day add up in one rollup row."""
+    tracker = TimeTracker(
+        task_id=1,
+        user_id=1,
+        category="Billable",
+        start_time=MONDAY,
+        status="In Progress",
+    )
+    db.save_time_tracker(tracker)
+    assert tracker.id is not None
+    assert daily_rollups(engine) == {}
+    db.close_segment(tracker.id, MONDAY + timedelta(minutes=20))
+    db.open_segment(tracker.id, MONDAY + timedelta(hours=1))
+    db.close_segment(tracker.id, MONDAY + timedelta(hours=1, minutes=10))
+    day = MONDAY.date().isoformat()
+    assert daily_rollups(engine) == {(day, 1): (1800.0, 2)}
+
+
+def test_migration_backfills_rollups_from_segments(
+    engine: StorageEngine, db: TimeTrackerDatabase
+) -> None:
+    """The rollups are rebuilt from the closed segments."""
+    add_tracker(db, 1, MONDAY, 600.0)
+    add_tracker(db, 2, datetime(2024, 3, 4, 23, 30), 3600.0)
+    expected = daily_rollups(engine)
+    conn = engine.connection()
+    conn.execute("DELETE FROM daily_rollups")
+    build_daily_rollups(conn)
+    assert daily_rollups(engine) == expected
+    assert len(expected) == 3
+
+
+def add_day(
+    db: TimeTrackerDatabase, day: int, hours: float, category: str
+) -> None:
+    """Save a completed session starting at 9:00 on a day of March 2024.
+
+    Args:
+        db (TimeTrackerDatabase): The time tracker repository.
+        day (int): The day of the month.
+        hours (float): The tracked time in hours.
+        category (str): The category.
+    """
+    add_tracker(db, 1, datetime(2024, 3, day, 9), hours * 3600, 1, category)
+
+
+def test_window_totals_come_from_the_cumulative_index(
+    db: TimeTrackerDatabase,
+) -> None:
+    """A window of closed days is the difference of two index entries."""
+    for day in range(1, 8):
+        add_day(db, day, 1, "Billable")
+    add_day(db, 3, 2, "Meeting")
+    assert db.get_closed_through(1) == date(2024, 3, 6)
+    assert db.get_window_time_by_category(
+        1, date(2024, 3, 2), date(2024, 3, 4)
+    ) == {"Billable": 3 * 3600.0, "Meeting": 2 * 3600.0}
+    assert db.get_window_time_by_category(
+        1, date(2024, 3, 5), date(2024, 3, 7)
+    ) == {"Billable": 3 * 3600.0}
+    assert db.get_cumulative_time_by_category(1, date(2024, 3, 6)) == {
+        "Billable": 6 * 3600.0,
+        "Meeting": 2 * 3600.0,
+    }
+
+
+def test_window_ending_today_adds_the_open_day(
+    db: TimeTrackerDatabase,
+) -> None:
+    """Today is read from the daily rollups, not the closed index."""
+    add_day(db, 8, 1, "Billable")
+    add_day(db, 9, 1, "Billable")
+    add_day(db, 10, 2, "Billable")
+    today = date(2024, 3, 10)
+    assert db.get_window_time_by_category(1, date(2024, 3, 9), today) == {
+        "Billable": 3 * 3600.0
+    }
+    assert db.get_cumulative_time_by_category(1, today) == {}
+
+
+def test_window_read_writes_nothing(
+    engine: StorageEngine, db: TimeTrackerDatabase
+) -> None:
+    """Days not closed yet are summed from the rollups without a write."""
+    add_day(db, 4, 1, "Billable")
+    conn = engine.connection()
+    conn.execute("DELETE FROM cumulative_rollups")
+    conn.execute("DELETE FROM cumulative_rollup_marks")
+    conn.commit()
+    assert db.get_window_time_by_category(1) == {"Billable": 3600.0}
+    assert db.get_window_time_by_category(
+        1, date(2024, 3, 1), date(2024, 3, 4)
+    ) == {"Billable": 3600.0}
+    assert not conn.in_transaction
+    assert db.get_closed_through(1) is None
+
+
+def test_time_added_to_a_closed_day_reopens_the_index(
+    engine: StorageEngine, db: TimeTrackerDatabase
+) -> None:
+    """A back-filled session counts in windows over days already closed."""
+    add_day(db, 4, 1, "Billable")
+    add_day(db, 6, 1, "Billable")
+    window = (date(2024, 3, 4), date(2024, 3, 6))
+    assert db.get_window_time_by_category(1, *window) == {
+        "Billable": 2 * 3600.0
+    }
+
+    add_day(db, 5, 3, "Meeting")
+    mark = engine.connection().execute(
+        "SELECT closed_through FROM cumulative_rollup_marks"
+    ).fetchone()[0]
+    assert mark == "2024-03-05"
+    assert db.get_window_time_by_category(1, *window) == {
+        "Billable": 2 * 3600.0,
+        "Meeting": 3 * 3600.0,
+    }
+
+
+def test_failed_save_leaves_no_partial_writes(
+    engine: StorageEngine,
+    db: TimeTrackerDatabase,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A save failing after its first insert is rolled back on its own."""
+
+    def fail(segments: Any) -> None:
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(db, "_add_to_daily_rollups", fail)
+    tracker = make_tracker(1, MONDAY, 60.0)
+    with pytest.raises(Exception, match="Error saving time tracker"):
+        db.save_time_tracker(tracker)
+    assert tracker.id is None
+    assert not engine.connection().in_transaction
+    engine.commit()
+    assert db.get_time_trackers_by_user(1) == []
+    count = engine.connection().execute(
+        "SELECT COUNT(*) FROM time_tracker_segments"
+    ).fetchone()[0]
+    assert count == 0
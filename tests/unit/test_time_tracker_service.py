@@ -0,0 +1,245 @@
+"""
+test_time_tracker_service.py module.
+
+This module tests the TimeTrackerService class: its units of work, timer
+registry and session model.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.services.task_service import TaskService
+from src.services.time_tracker_service import TimeTrackerService
+from src.services.write_behind import WriteBehindQueue
+from src.utils.clock import ClockReading
+
+
+class FakeClock:
+    """Clock moving only when told to, with matching monotonic readings."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the clock at a wall clock time.
+
+        Args:
+            start (datetime): The wall clock time of the first reading.
+        """
+        self.wall = start
+        self.monotonic_ns = 1_000_000_000
+
+    def advance(self, minutes: float) -> None:
+        """Move both clocks forward.
+
+        Args:
+            minutes (float): The minutes to move forward.
+        """
+        self.wall += timedelta(minutes=minutes)
+        self.monotonic_ns += int(minutes * 60 * 1_000_000_000)
+
+    def __call__(self) -> ClockReading:
+        """Read the clock."""
+        return ClockReading(self.wall, self.monotonic_ns)
+
+
+@pytest.fixture
+def service(engine: StorageEngine) -> TimeTrackerService:
+    """Provide a synchronous time tracker service on the test database."""
+    return TimeTrackerService(
+        TimeTrackerDatabase(engine),
+        TaskService(TaskDatabase(engine), CategoryDatabase(engine)),
+    )
+
+
+def new_task(service: TimeTrackerService, name: str = "Write report") -> int:
+    """Create a task of user 1.
+
+    Args:
+        service (TimeTrackerService): The time tracker service.
+        name (str, optional): The task name. Defaults to "Write report".
+
+    Returns:
+        int: The task ID.
+    """
+    task = service.task_service.create_task(1, "Billable", name)
+    assert task.id is not None
+    return task.id
+
+
+def task_status(service: TimeTrackerService, task_id: int) -> Optional[str]:
+    """Read the stored status of a task.
+
+    Args:
+        service (TimeTrackerService): The time tracker service.
+        task_id (int): The task ID.
+
+    Returns:
+        Optional[str]: The status, or None for an unknown task.
+    """
+    task = service.task_service.task_db.get_task(1, task_id)
+    return task.task_status if task else None
+
+
+def test_unit_of_work_commits_timer_and_status_together(
+    service: TimeTrackerService,
+) -> None:
+    """Starting a task stores its session and its status."""
+    task_id = new_task(service)
+    service.start_task(task_id, "Billable", 1)
+    assert task_status(service, task_id) == "In Progress"
+    tracker = service.db.get_active_time_tracker(task_id)
+    assert tracker is not None and tracker.status == "In Progress"
+
+
+def test_unit_of_work_rolls_back_the_timer_with_the_status(
+    service: TimeTrackerService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failing status update also discards the session it came with."""
+    task_id = new_task(service)
+
+    def fail(task_id: int, status: str) -> None:
+        raise RuntimeError("status update failed")
+
+    monkeypatch.setattr(service.task_service, "update_task_status", fail)
+    with pytest.raises(RuntimeError):
+        service.start_task(task_id, "Billable", 1)
+    assert service.db.get_active_time_tracker(task_id) is None
+    assert service.db.get_time_trackers_by_user(1) == []
+    assert task_status(service, task_id) == "Not Started"
+    assert not service.db.engine.connection().in_transaction
+
+
+def test_deferred_statuses_are_pending_until_flushed(
+    engine: StorageEngine, service: TimeTrackerService
+) -> None:
+    """A queued status is reported as pending without being committed."""
+    service.write_behind = WriteBehindQueue(engine)
+    task_id = new_task(service)
+    service.start_task(task_id, "Billable", 1)
+    assert service.pending_task_statuses() == {task_id: "In Progress"}
+    assert task_status(service, task_id) == "Not Started"
+    service.flush()
+    assert service.pending_task_statuses() == {}
+    assert task_status(service, task_id) == "In Progress"
+    service.write_behind.close()
+
+
+def test_new_session_is_paused_without_flushing(
+    engine: StorageEngine, service: TimeTrackerService
+) -> None:
+    """Events of a session not saved yet are written to it by task."""
+    service.write_behind = WriteBehindQueue(engine)
+    task_id = new_task(service)
+    service.load_timers(1)
+    service.start_task(task_id, "Billable", 1)
+    service.pause_task(task_id)
+    service.stop_task(task_id)
+    assert service.write_behind.pending() == 7
+    assert service.db.get_time_trackers_by_user(1) == []
+    service.flush()
+    (session,) = service.db.get_time_trackers_by_user(1)
+    assert session.status == "Completed"
+    assert session.id is not None
+    assert len(service.db.get_segments(session.id)) == 1
+    assert task_status(service, task_id) == "Completed"
+    service.write_behind.close()
+
+
+def test_load_timers_reads_the_open_sessions(
+    service: TimeTrackerService,
+) -> None:
+    """Loading the registry finds the running and paused sessions only."""
+    running = new_task(service, "Running")
+    paused = new_task(service, "Paused")
+    stopped = new_task(service, "Stopped")
+    for task_id in (running, paused, stopped):
+        service.start_task(task_id, "Billable", 1)
+    service.pause_task(paused)
+    service.stop_task(stopped)
+
+    assert service.load_timers(1) == 2
+    assert service.registry.loaded
+    tracker = service.registry.get(paused)
+    assert tracker is not None and tracker.status == "Paused"
+    assert service.registry.get(stopped) is None
+    service.unload_timers()
+    assert not service.registry.loaded and len(service.registry) == 0
+
+
+def test_registry_follows_every_transition(
+    service: TimeTrackerService,
+) -> None:
+    """Each transition updates the registry entry of the task."""
+    task_id = new_task(service)
+    service.load_timers(1)
+
+    def registry_status() -> Optional[str]:
+        tracker = service.registry.get(task_id)
+        return tracker.status if tracker else None
+
+    service.start_task(task_id, "Billable", 1)
+    assert registry_status() == "In Progress"
+    service.pause_task(task_id)
+    assert registry_status() == "Paused"
+    service.resume_task(task_id, "Billable", 1)
+    assert registry_status() == "In Progress"
+    service.stop_task(task_id)
+    assert registry_status() is None
+    assert task_status(service, task_id) == "Completed"
+
+
+def test_failed_unit_of_work_unloads_the_registry(
+    service: TimeTrackerService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failed transition falls back to the database until reloaded."""
+    task_id = new_task(service)
+    service.load_timers(1)
+    service.start_task(task_id, "Billable", 1)
+
+    def fail(task_id: int, status: str) -> None:
+        raise RuntimeError("status update failed")
+
+    monkeypatch.setattr(service.task_service, "update_task_status", fail)
+    with pytest.raises(RuntimeError):
+        service.pause_task(task_id)
+    assert not service.registry.loaded
+    tracker = service.get_active_time_tracker(task_id)
+    assert tracker is not None and tracker.status == "In Progress"
+
+
+def test_segments_accumulate_into_one_session(
+    service: TimeTrackerService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Pausing and resuming adds segments to a single session row."""
+    clock = FakeClock(datetime(2024, 3, 1, 9, 0))
+    monkeypatch.setattr(
+        "src.services.time_tracker_service.read_clock", clock
+    )
+    task_id = new_task(service)
+    service.start_task(task_id, "Billable", 1)
+    clock.advance(30)
+    service.pause_task(task_id)
+    clock.advance(30)
+    service.resume_task(task_id, "Billable", 1)
+    clock.advance(15)
+    tracker = service.stop_task(task_id)
+
+    assert tracker is not None and tracker.id is not None
+    sessions = service.db.get_time_trackers_by_user(1)
+    assert [session.id for session in sessions] == [tracker.id]
+    assert sessions[0].status == "Completed"
+    assert sessions[0].total_time == pytest.approx(45 * 60)
+    segments = service.db.get_segments(tracker.id)
+    assert [
+        (segment.start_time, segment.stop_time) for segment in segments
+    ] == [
+        (datetime(2024, 3, 1, 9, 0), datetime(2024, 3, 1, 9, 30)),
+        (datetime(2024, 3, 1, 10, 0), datetime(2024, 3, 1, 10, 15)),
+    ]
+    assert service.db.get_total_time_by_task(1) == {
+        task_id: pytest.approx(45 * 60)
+    }
@@ -0,0 +1,210 @@
+"""
+test_timer_journal.py module.
+
+This module tests the TimerJournal class: replay after a crash, repair of a
+torn tail, idempotent compaction and the task statuses it materializes.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ContextManager, List
+
+import pytest
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.data_loader.time_tracker_database import TimeTrackerDatabase
+from src.models.time_tracker import TimeTracker
+from src.services.task_service import TaskService
+from src.services.time_tracker_service import TimeTrackerService
+from src.services.timer_journal import TimerJournal
+from src.services.write_behind import TimerEvent
+
+
+def open_journal(engine: StorageEngine, path: Path) -> TimerJournal:
+    """Open a journal that is only compacted on request.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+        path (Path): The path of the journal file.
+
+    Returns:
+        TimerJournal: The journal, after its replay.
+    """
+    return TimerJournal(
+        str(path), engine, sync=False, compact_threshold=1000
+    )
+
+
+def crash(journal: TimerJournal) -> None:
+    """Close the journal file without compacting it.
+
+    Args:
+        journal (TimerJournal): The journal.
+    """
+    journal._file.close()
+
+
+def completed(task_id: int, hour: int) -> TimerEvent:
+    """Build the event saving a completed one-hour session.
+
+    Args:
+        task_id (int): The task ID.
+        hour (int): The hour the session starts at.
+
+    Returns:
+        TimerEvent: The save event.
+    """
+    return TimerEvent(
+        "save",
+        task_id,
+        time_tracker=TimeTracker(
+            task_id=task_id,
+            user_id=1,
+            category="Billable",
+            start_time=datetime(2024, 3, 1, hour),
+            stop_time=datetime(2024, 3, 1, hour + 1),
+            status="Completed",
+            total_time=3600.0,
+        ),
+    )
+
+
+def stored_sessions(engine: StorageEngine) -> int:
+    """Count the stored time trackers of user 1.
+
+    Args:
+        engine (StorageEngine): The storage engine of the test database.
+
+    Returns:
+        int: The number of time trackers.
+    """
+    return len(TimeTrackerDatabase(engine).get_time_trackers_by_user(1))
+
+
+def test_journal_is_replayed_when_opened(
+    engine: StorageEngine, tmp_path: Path
+) -> None:
+    """Events left in the journal by a crash are materialized."""
+    path = tmp_path / "timer.journal"
+    journal = open_journal(engine, path)
+    journal.put(completed(1, 9))
+    with journal.group():
+        journal.put(completed(1, 11))
+        journal.put(completed(2, 13))
+    assert journal.pending() == 3
+    assert stored_sessions(engine) == 0
+    crash(journal)
+
+    journal = open_journal(engine, path)
+    assert journal.pending() == 0
+    assert stored_sessions(engine) == 3
+    assert path.read_bytes() == b""
+    journal.close()
+
+
+def test_torn_tail_is_cut_off(engine: StorageEngine, tmp_path: Path) -> None:
+    """A partly written record is dropped and the records before it kept."""
+    path = tmp_path / "timer.journal"
+    journal = open_journal(engine, path)
+    journal.put(completed(1, 9))
+    crash(journal)
+    with open(path, "ab") as file:
+        file.write(b'0000abcd {"events":[{"sequence":2')
+
+    journal = open_journal(engine, path)
+    assert stored_sessions(engine) == 1
+    journal.put(completed(1, 11))
+    assert path.read_bytes().count(b"\n") == 1
+    journal.close()
+    assert stored_sessions(engine) == 2
+
+
+def test_events_already_in_timer_events_are_skipped(
+    engine: StorageEngine, tmp_path: Path
+) -> None:
+    """A journal compacted but not yet emptied is not applied twice."""
+    path = tmp_path / "timer.journal"
+    journal = open_journal(engine, path)
+    journal.put(completed(1, 9), completed(1, 11))
+    uncompacted = path.read_bytes()
+    assert journal.compact() == 2
+    crash(journal)
+    # A crash between the commit and the truncation of the journal.
+    path.write_bytes(uncompacted)
+
+    journal = open_journal(engine, path)
+    assert stored_sessions(engine) == 2
+    assert journal.replay() == 0
+    journal.put(completed(1, 13))
+    assert journal.compact() == 1
+    journal.close()
+    assert stored_sessions(engine) == 3
+
+
+def test_timer_actions_only_append_until_compaction(
+    engine: StorageEngine, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A new session is paused and resumed without touching the database."""
+    task_service = TaskService(TaskDatabase(engine), CategoryDatabase(engine))
+    journal = TimerJournal(
+        str(tmp_path / "timer.journal"),
+        engine,
+        sync=False,
+        compact_threshold=1000,
+        on_commit=task_service.invalidate_task,
+    )
+    service = TimeTrackerService(
+        TimeTrackerDatabase(engine), task_service, journal=journal
+    )
+    task = task_service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    service.load_timers(1)
+    transaction = engine.transaction
+    transactions: List[None] = []
+
+    def counted_transaction() -> ContextManager[Any]:
+        transactions.append(None)
+        return transaction()
+
+    monkeypatch.setattr(engine, "transaction", counted_transaction)
+    service.start_task(task.id, "Billable", 1)
+    service.pause_task(task.id)
+    service.resume_task(task.id, "Billable", 1)
+    service.pause_task(task.id)
+    assert transactions == []
+    assert journal.pending() > 0
+    stored = task_service.task_db.get_task(1, task.id)
+    assert stored is not None and stored.task_status == "Not Started"
+    assert service.pending_task_statuses() == {task.id: "Paused"}
+
+    monkeypatch.setattr(engine, "transaction", transaction)
+    journal.close()
+    session = TimeTrackerDatabase(engine).get_active_time_tracker(task.id)
+    assert session is not None and session.status == "Paused"
+    assert session.id is not None
+    assert len(TimeTrackerDatabase(engine).get_segments(session.id)) == 2
+    cached = task_service.get_task_by_id(1, task.id)
+    assert cached is not None and cached.task_status == "Paused"
+
+
+def test_replay_writes_the_last_status(
+    engine: StorageEngine, tmp_path: Path
+) -> None:
+    """Replaying status events leaves the last status of the task."""
+    task_db = TaskDatabase(engine)
+    task_service = TaskService(task_db, CategoryDatabase(engine))
+    task = task_service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    path = tmp_path / "timer.journal"
+    journal = open_journal(engine, path)
+    for status in ("In Progress", "Completed"):
+        journal.put(TimerEvent("status", task.id, status=status))
+    crash(journal)
+    task_db.update_task_status(task.id, "Not Started")
+
+    journal = open_journal(engine, path)
+    stored = task_db.get_task(1, task.id)
+    assert stored is not None and stored.task_status == "Completed"
+    journal.close()
@@ -0,0 +1,64 @@
+"""
+test_timestamps.py module.
+
+This module tests the conversions between datetimes and epoch microseconds.
+"""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+
+from src.utils.timestamps import (
+    day_start_epoch_us,
+    from_epoch_us,
+    split_by_day,
+    to_epoch_us,
+)
+
+HOUR_US = 3600 * 1_000_000
+
+
+@pytest.fixture
+def berlin_time(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Run the test in a local time zone with daylight saving time."""
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_aware_datetimes_convert_to_utc_epoch() -> None:
+    """Aware datetimes are stored as microseconds since the epoch."""
+    assert to_epoch_us(datetime(1970, 1, 1, tzinfo=timezone.utc)) == 0
+    value = datetime(2024, 5, 6, 12, 0, 0, 7, tzinfo=timezone.utc)
+    assert to_epoch_us(value) == 1_714_996_800_000_007
+    plus_two = timezone(timedelta(hours=2))
+    assert to_epoch_us(value.astimezone(plus_two)) == to_epoch_us(value)
+
+
+def test_naive_datetimes_are_local_time(berlin_time: None) -> None:
+    """Naive datetimes are local time and round trip exactly."""
+    summer = datetime(2024, 7, 1, 14, 0, 0, 123456)
+    assert to_epoch_us(summer) == to_epoch_us(
+        datetime(2024, 7, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    )
+    assert from_epoch_us(to_epoch_us(summer)) == summer
+
+
+def test_days_are_split_at_local_midnight(berlin_time: None) -> None:
+    """A span is split at each local midnight, DST days included."""
+    # Daylight saving time starts on 31 March 2024, a 23 hour day.
+    start = to_epoch_us(datetime(2024, 3, 30, 22, 0))
+    stop = to_epoch_us(datetime(2024, 4, 1, 1, 0))
+    assert list(split_by_day(start, stop)) == [
+        (date(2024, 3, 30), 2 * HOUR_US),
+        (date(2024, 3, 31), 23 * HOUR_US),
+        (date(2024, 4, 1), 1 * HOUR_US),
+    ]
+    assert day_start_epoch_us(date(2024, 4, 1)) - day_start_epoch_us(
+        date(2024, 3, 31)
+    ) == (23 * HOUR_US)
+    assert list(split_by_day(stop, stop)) == []
@@ -0,0 +1,123 @@
+"""
+test_tracker_frame.py module.
+
+This module tests the TrackerFrame container: views, slicing, filtering
+and taking time trackers by position.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from src.models.time_tracker import TimeTracker
+from src.models.tracker_frame import TrackerFrame
+from src.services.analytics import frame_columns
+
+START = datetime(2024, 3, 4, 9, 0)
+
+
+def make_frame() -> TrackerFrame:
+    """Build a frame of six time trackers, the last one not started.
+
+    Returns:
+        TrackerFrame: The frame, with IDs 1 to 6 in order.
+    """
+    categories = ["Billable", "Meeting", "Billable", "Training", "Billable"]
+    trackers = [
+        TimeTracker(
+            id=number + 1,
+            task_id=number % 2 + 1,
+            category=category,
+            start_time=START + timedelta(hours=number),
+            stop_time=START + timedelta(hours=number, minutes=30),
+            status="Completed",
+            total_time=1800.0 + number,
+        )
+        for number, category in enumerate(categories)
+    ]
+    trackers.append(
+        TimeTracker(id=6, task_id=3, category="Meeting", status="Not Started")
+    )
+    return TrackerFrame.from_trackers(trackers)
+
+
+def ids(frame: TrackerFrame) -> List[int]:
+    """Return the time tracker IDs of a frame, in order.
+
+    Args:
+        frame (TrackerFrame): The frame.
+
+    Returns:
+        List[int]: The IDs.
+    """
+    return [view.id for view in frame]
+
+
+def test_views_read_the_columns() -> None:
+    """Indexing returns a view converting the stored values back."""
+    frame = make_frame()
+    view = frame[1]
+    assert (view.id, view.task_id, view.category) == (2, 2, "Meeting")
+    assert view.start_time == START + timedelta(hours=1)
+    assert view.stop_time == START + timedelta(hours=1, minutes=30)
+    assert view.total_time == 1801.0
+    assert frame[-1].start_time is None and frame[-1].total_time == 0.0
+    with pytest.raises(IndexError):
+        frame[len(frame)]
+
+
+def test_slices_copy_the_columns_and_share_the_strings() -> None:
+    """A slice is an independent frame over the same interned strings."""
+    frame = make_frame()
+    assert ids(frame[1:4]) == [2, 3, 4]
+    assert ids(frame[::-2]) == [6, 4, 2]
+    assert ids(frame[10:]) == []
+    sliced = frame[:2]
+    assert sliced.categories is frame.categories
+    sliced.append(7, 1, "Support", None, None, "Not Started", None)
+    assert len(sliced) == 3 and len(frame) == 6
+    assert frame.categories[-1] == "Support"
+
+
+def test_where_matches_every_criterion() -> None:
+    """Criteria are combined, and unknown values match nothing."""
+    frame = make_frame()
+    assert ids(frame.where(category="Billable")) == [1, 3, 5]
+    assert ids(frame.where(category="Billable", task_id=1)) == [1, 3, 5]
+    assert ids(frame.where(category="Meeting", task_id=2)) == [2]
+    assert ids(frame.where(status="Not Started")) == [6]
+    assert ids(frame.where(category="Unknown")) == []
+    assert ids(
+        frame.where(
+            start_from=START + timedelta(hours=1),
+            start_before=START + timedelta(hours=3),
+        )
+    ) == [2, 3]
+    # A time tracker that never started has no start time to compare.
+    assert 6 not in ids(frame.where(start_before=START + timedelta(days=1)))
+
+
+def test_take_and_filter_keep_the_requested_order() -> None:
+    """Positions are taken in the order given, repeats included."""
+    frame = make_frame()
+    assert ids(frame.take([4, 0, 4])) == [5, 1, 5]
+    assert ids(frame.take([])) == []
+    assert ids(frame.filter(lambda view: view.total_time > 1802.0)) == [4, 5]
+
+
+def test_frame_stays_compact() -> None:
+    """Each time tracker takes tens of bytes of column storage."""
+    frame = make_frame()
+    assert frame.nbytes() // len(frame) < 64
+
+
+def test_frame_grows_after_its_columns_are_read() -> None:
+    """The NumPy columns are copies, so the frame can still be appended."""
+    pytest.importorskip("numpy")
+    frame = make_frame()
+    columns = frame_columns(frame)
+    frame.append(7, 4, "Billable", None, None, "Not Started", None)
+    assert len(frame) == 7
+    assert len(columns.task_ids) == 6
+    assert columns.task_ids.tolist() == [1, 2, 1, 2, 1, 3]
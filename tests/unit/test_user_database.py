@@ -0,0 +1,54 @@
+"""
+test_user_database.py module.
+
+This module tests the UserDatabase repository.
+"""
+
+import pytest
+
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.user_database import UserDatabase
+from src.models.user import User
+
+
+def make_user(email: str) -> User:
+    """Build a new user.
+
+    Args:
+        email (str): The email of the user.
+
+    Returns:
+        User: The user, not saved yet.
+    """
+    return User.create(email=email, hashed_password="hash")
+
+
+def test_user_is_saved_and_found_by_email(engine: StorageEngine) -> None:
+    """A saved user is found by its email."""
+    users = UserDatabase(engine)
+    users.save_user(make_user("ada@example.com"))
+    user = users.get_user_by_email("ada@example.com")
+    assert user is not None and user.email == "ada@example.com"
+    assert users.get_user_by_email("bob@example.com") is None
+
+
+def test_user_writes_join_the_engine_transaction(
+    engine: StorageEngine,
+) -> None:
+    """Saving a user inside a transaction is rolled back with it."""
+    users = UserDatabase(engine)
+    with pytest.raises(RuntimeError):
+        with engine.transaction():
+            users.save_user(make_user("ada@example.com"))
+            assert users.get_user_by_email("ada@example.com") is not None
+            raise RuntimeError("abort")
+    assert users.get_user_by_email("ada@example.com") is None
+
+
+def test_duplicate_email_is_rejected(engine: StorageEngine) -> None:
+    """A second user with the same email is not saved."""
+    users = UserDatabase(engine)
+    users.save_user(make_user("ada@example.com"))
+    with pytest.raises(Exception, match="Error saving user"):
+        users.save_user(make_user("ada@example.com"))
+    assert not engine.connection().in_transaction
@@ -0,0 +1,84 @@
+"""
+test_write_behind.py module.
+
+This module tests the WriteBehindQueue class: group commits, dead letters
+and the invalidation of the task cache.
+"""
+
+from typing import Iterator
+
+import pytest
+
+from src.data_loader.category_database import CategoryDatabase
+from src.data_loader.storage_engine import StorageEngine
+from src.data_loader.task_database import TaskDatabase
+from src.services.task_service import TaskService
+from src.services.write_behind import TimerEvent, WriteBehindQueue
+
+
+@pytest.fixture
+def task_service(engine: StorageEngine) -> TaskService:
+    """Provide a task service on the test database."""
+    return TaskService(TaskDatabase(engine), CategoryDatabase(engine))
+
+
+@pytest.fixture
+def queue(
+    engine: StorageEngine, task_service: TaskService
+) -> Iterator[WriteBehindQueue]:
+    """Provide a write-behind queue on the test database, not started."""
+    write_behind = WriteBehindQueue(
+        engine, max_attempts=2, on_commit=task_service.invalidate_task
+    )
+    yield write_behind
+    write_behind.engine.close()
+
+
+def poison(task_id: int) -> TimerEvent:
+    """Build a status event that can never be written.
+
+    Args:
+        task_id (int): The task ID.
+
+    Returns:
+        TimerEvent: The event, whose status SQLite cannot bind.
+    """
+    return TimerEvent("status", task_id, status=["Paused"])  # type: ignore
+
+
+def test_poison_event_is_dead_lettered_after_max_attempts(
+    queue: WriteBehindQueue, task_service: TaskService
+) -> None:
+    """A failing event is set aside and the rest of its group commits."""
+    task = task_service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    queue.put(
+        TimerEvent("status", task.id, status="In Progress"), poison(task.id)
+    )
+    for _ in range(queue.max_attempts):
+        with pytest.raises(Exception, match="Error updating task status"):
+            queue.flush()
+        assert queue.pending() == 2
+    with pytest.raises(Exception, match="1 events could not be written"):
+        queue.flush()
+    assert queue.pending() == 0
+    assert queue.dead_letters() == [poison(task.id)]
+    assert task_service.task_db.get_task(1, task.id).task_status == (
+        "In Progress"
+    )
+    queue.put(TimerEvent("status", task.id, status="Paused"))
+    assert queue.flush() == 1
+
+
+def test_background_commit_invalidates_the_task_cache(
+    queue: WriteBehindQueue, task_service: TaskService
+) -> None:
+    """Tasks cached before a background commit are read again after it."""
+    task = task_service.create_task(1, "Billable", "Write report")
+    assert task.id is not None
+    assert task_service.get_task_by_id(1, task.id) is not None
+    queue.start()
+    queue.put(TimerEvent("status", task.id, status="In Progress"))
+    queue.close()
+    cached = task_service.get_task_by_id(1, task.id)
+    assert cached is not None and cached.task_status == "In Progress"